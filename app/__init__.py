@@ -1,5 +1,8 @@
 """Initialize API."""
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -10,15 +13,46 @@ from app import (
     donations,
     github,
     images,
+    jobs,
+    metrics,
     newsletter,
     posts,
     tags,
 )
+from app.analytics.suggest import search_suggestions
+from app.jobs.runner import job_runner
+from app.jobs.schedule import scheduler
+from clients import get_mixpanel_buffer, get_sms_queue, get_welcome_queue
+from clients.transport import close_async_clients
 from config import settings
-from database import Base, engine
+from database import create_tables
 from log import LOGGER
+from metrics import MetricsMiddleware
+
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(api: FastAPI):
+    """
+    Run one-off startup work once the server is ready to boot, rather than at import.
+
+    :param FastAPI api: API application being started.
+    """
+    if settings.DATABASE_CREATE_TABLES:
+        create_tables()
+    # Warm search suggestions from the latest snapshot
+    search_suggestions.load(settings.SEARCH_SUGGESTIONS_SNAPSHOT_PATH)
+    scheduler.start()
+    LOGGER.success("API successfully started.")
+    yield
+    await scheduler.stop()
+    await get_sms_queue().stop()
+    await get_welcome_queue().stop()
+    if get_mixpanel_buffer.cache_info().currsize:
+        await asyncio.to_thread(get_mixpanel_buffer().close)
+    await close_async_clients()
+    job_runner.shutdown()
+    # Flush queued log records before exiting
+    await LOGGER.complete()
 
 
 def create_app() -> FastAPI:
@@ -34,6 +68,7 @@ def create_app() -> FastAPI:
         debug=True,
         docs_url="/",
         openapi_url="/api.json",
+        lifespan=lifespan,
     )
 
     # Define Middleware
@@ -44,6 +79,7 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    api.add_middleware(MetricsMiddleware)
 
     # Include routers
     api.include_router(analytics.router)
@@ -55,9 +91,7 @@ def create_app() -> FastAPI:
     api.include_router(images.router)
     api.include_router(tags.router)
     api.include_router(github.router)
-    LOGGER.success("API successfully started.")
+    api.include_router(jobs.router)
+    api.include_router(metrics.router)
 
     return api
-
-
-api = create_app()
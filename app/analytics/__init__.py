@@ -1,25 +1,43 @@
 """Fetch site traffic & search query analytics."""
 
-from fastapi import APIRouter
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
-from app.analytics.plausible import top_visited_pages_by_timeframe
-from database.schemas import AnalyticsResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.analytics.algolia import persist_algolia_searches
+from app.analytics.plausible import build_page_filter, top_visited_pages_by_timeframe
+from app.analytics.suggest import rebuild_search_suggestions, suggest_searches
+from app.analytics.sync import get_rolling_page_views, sync_daily_page_views
+from app.jobs.runner import JobContext, job_runner
+from config import settings
+from database import get_db
+from database.schemas import JobStatus, PageViews, PageViewsSync
 from log import LOGGER
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
-@router.get(
-    "/",
-    summary="Import site analytics.",
-    description="Import site performance analytics from a data warehouse to a SQL database.",
-    response_model=AnalyticsResponse,
-    status_code=200,
-)
-async def migrate_site_analytics():
-    """Fetch top searches for weekly & monthly time periods."""
-    weekly_traffic = top_visited_pages_by_timeframe("7d", limit=50)
-    monthly_traffic = top_visited_pages_by_timeframe("30d", limit=100)
+@job_runner.task("analytics.migrate")
+def import_site_analytics(job: JobContext) -> dict:
+    """
+    Fetch top pages for weekly & monthly time periods concurrently, sharing a single compiled page filter.
+
+    :param JobContext job: Handle for reporting progress.
+
+    :returns: dict
+    """
+    job.progress(0, 2, "Building page filter")
+    page_filter = build_page_filter()
+    job.progress(1, 2, "Importing weekly & monthly top pages")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        weekly = executor.submit(top_visited_pages_by_timeframe, "7d", 50, page_filter)
+        monthly = executor.submit(top_visited_pages_by_timeframe, "30d", 100, page_filter)
+        weekly_traffic, monthly_traffic = weekly.result(), monthly.result()
+    job.progress(2, 2)
     LOGGER.success(
         f"Inserted {len(weekly_traffic)} rows into `weekly_stats`,  {len(monthly_traffic)}  into `monthly_stats`."
     )
@@ -35,7 +53,63 @@ async def migrate_site_analytics():
     }
 
 
-'''@router.get(
+@router.get(
+    "/",
+    summary="Import site analytics.",
+    description="Queue a job importing site performance analytics from a data warehouse to a SQL database; \
+                poll `/jobs/{id}/` for results.",
+    response_model=JobStatus,
+    status_code=202,
+)
+async def migrate_site_analytics():
+    """Queue job to import top pages for weekly & monthly time periods."""
+    return await asyncio.to_thread(job_runner.submit, "analytics.migrate")
+
+
+@router.get(
+    "/pages/sync/",
+    summary="Sync daily page analytics.",
+    description="Store daily Plausible page analytics for days since the last sync & refresh rolling windows.",
+    response_model=PageViewsSync,
+    status_code=200,
+)
+async def sync_page_analytics(db: Session = Depends(get_db)):
+    """
+    Incrementally sync daily Plausible page analytics into the features database.
+
+    :param Session db: ORM Database session.
+    """
+    return await asyncio.to_thread(sync_daily_page_views, db)
+
+
+@router.get(
+    "/pages/",
+    summary="Get top pages for a rolling window.",
+    description="Read pre-aggregated page analytics for a rolling window of days from the features database.",
+    response_model=List[PageViews],
+    status_code=200,
+)
+async def get_top_pages(
+    days: int = Query(default=7, description="Size of rolling window in days."),
+    limit: int = Query(default=50, ge=1, le=1000, description="Maximum number of pages to return."),
+    db: Session = Depends(get_db),
+):
+    """
+    Fetch top pages from pre-aggregated rolling windows.
+
+    :param int days: Size of rolling window in days.
+    :param int limit: Maximum number of pages to return.
+    :param Session db: ORM Database session.
+    """
+    if days not in settings.PLAUSIBLE_ROLLING_WINDOWS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Rolling window must be one of {settings.PLAUSIBLE_ROLLING_WINDOWS} days.",
+        )
+    return get_rolling_page_views(db, days, limit)
+
+
+@router.get(
     "/searches/",
     summary="Import user search queries.",
     description="Store user search queries to a SQL database for analysis and suggestive search.",
@@ -43,27 +117,43 @@ async def migrate_site_analytics():
 )
 async def save_user_search_queries() -> JSONResponse:
     """
-    Save top search analytics for the current week.
+    Save top search analytics for each reporting period.
 
     :returns: JSONResponse
     """
-    weekly_searches = persist_algolia_searches(settings.ALGOLIA_TABLE_WEEKLY, "7d")
-    monthly_searches = persist_algolia_searches(settings.ALGOLIA_TABLE_MONTHLY, "month")
-    if weekly_searches is None or monthly_searches is None:
-        HTTPException(500, "Unexpected error when saving search query data.")
+    saved_searches = {}
+    for period, days in settings.ALGOLIA_SEARCH_PERIODS.items():
+        saved_searches[period] = await asyncio.to_thread(persist_algolia_searches, period, days)
+    if any(count is None for count in saved_searches.values()):
+        raise HTTPException(status_code=500, detail="Unexpected error when saving search query data.")
     LOGGER.success(
-        f"Inserted {len(weekly_searches)} rows into `{settings.ALGOLIA_TABLE_WEEKLY}`, \
-            {len(monthly_searches)} into `{settings.ALGOLIA_TABLE_MONTHLY}`"
+        f"Saved Algolia search queries: {', '.join(f'{count} ({period})' for period, count in saved_searches.items())}"
     )
+    suggestions = await asyncio.to_thread(rebuild_search_suggestions)
     return JSONResponse(
         {
-            "7-Day": {
-                "count": len(weekly_searches),
-                "rows": weekly_searches,
-            },
-            "90-Day": {
-                "count": len(monthly_searches),
-                "rows": monthly_searches,
-            },
+            **{period: {"count": count} for period, count in saved_searches.items()},
+            "suggestions": {"count": suggestions},
         }
-    )'''
+    )
+
+
+@router.get(
+    "/searches/suggest",
+    summary="Suggest search queries.",
+    description="Suggest previously searched queries beginning with a prefix, weighted by search count.",
+    status_code=200,
+)
+async def suggest_search_queries(
+    q: str = Query(default="", max_length=100, description="Search prefix typed by the user."),
+    limit: int = Query(default=settings.SEARCH_SUGGESTIONS_LIMIT, ge=1, le=settings.SEARCH_SUGGESTIONS_LIMIT),
+) -> List[dict]:
+    """
+    Suggest search queries from the in-process prefix index.
+
+    :param str q: Search prefix typed by the user.
+    :param int limit: Maximum number of suggestions to return.
+
+    :returns: List[dict]
+    """
+    return suggest_searches(q, limit)
@@ -1,84 +1,81 @@
 """Helper functions to fetch search query activity from Algolia."""
 
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
 
-import requests
-from fastapi import HTTPException
 from requests.exceptions import HTTPError
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
 
-from app.moment import get_start_date_range
+from app.moment import get_current_datetime, get_start_date_range
+from clients.transport import get_session
 from config import settings
 from database import feature_db
+from database.models import AlgoliaSearch
 from log import LOGGER
 
 
-def persist_algolia_searches(time_period: str) -> List[Optional[dict]]:
+def persist_algolia_searches(period: str, days: int) -> Optional[int]:
     """
-    Fetch single week of searches from Algolia API.
+    Stream search queries for a reporting period from Algolia into the features database.
 
-    :param str time_period: Period of time for which to fetch search queries (7d, 30d, month, 12mo).
-    :param str db_table: DB table name
+    Each page of results is filtered & upserted as it arrives. Searches which no longer appear in the
+    period are pruned only after every page is written, so the table is never empty mid-refresh.
 
-    :returns: List[Optional[dict]]
+    :param str period: Name of reporting period (ie: week, month).
+    :param int days: Number of days the reporting period spans.
+
+    :returns: Optional[int]
     """
+    refreshed_at = get_current_datetime().replace(microsecond=0)
+    saved_queries = 0
     try:
-        headers = {
-            "x-algolia-application-id": settings.ALGOLIA_APP_ID,
-            "x-algolia-api-key": settings.ALGOLIA_API_KEY,
-        }
-        params = {
-            "index": "hackers_posts",
-            "limit": 999999,
-            "orderBy": "searchCount",
-            "direction": "desc",
-            "startDate": get_start_date_range(time_period),
-        }
-        resp = requests.get(settings.ALGOLIA_SEARCHES_ENDPOINT, headers=headers, params=params, timeout=30)
-        if resp.status_code == 200 and resp.json().get("searches") is not None:
-            search_queries = resp.json().get("searches")
+        for search_queries in fetch_algolia_searches(days):
             search_queries = filter_search_queries(search_queries)
-            if search_queries is not None:
-                import_algolia_search_queries(search_queries, time_period)
-                return search_queries
-            return []
-        return []
+            saved = upsert_algolia_search_queries(search_queries, period, refreshed_at)
+            if saved is None:
+                return None
+            saved_queries += saved
+        prune_algolia_search_queries(period, refreshed_at)
+        LOGGER.success(f"Saved {saved_queries} Algolia search queries for `{period}`.")
+        return saved_queries
     except HTTPError as e:
-        LOGGER.error(f"HTTPError while fetching Algolia searches for `{time_period}`: {e}")
+        LOGGER.error(f"HTTPError while fetching Algolia searches for `{period}`: {e}")
     except Exception as e:
-        LOGGER.error(f"Unexpected error while fetching Algolia searches for `{time_period}`: {e}")
+        LOGGER.error(f"Unexpected error while fetching Algolia searches for `{period}`: {e}")
 
 
-def fetch_algolia_searches(time_period: str) -> List[Optional[dict]]:
+def fetch_algolia_searches(days: int) -> Iterator[List[dict]]:
     """
-    Fetch analytics from Algolia API for a given time period.
+    Fetch pages of search analytics from Algolia API, most searched first.
 
-    :param str time_period: Period of time for which to fetch search queries (7d, 30d, month, 12mo).
+    :param int days: Number of days to fetch search queries for.
 
-    :returns: List[Optional[dict]]
+    :returns: Iterator[List[dict]]
     """
-    try:
-        headers = {
-            "x-algolia-application-id": settings.ALGOLIA_APP_ID,
-            "x-algolia-api-key": settings.ALGOLIA_API_KEY,
-        }
-        params = {
-            "index": "hackers_posts",
-            "limit": 999999,
-            "orderBy": "searchCount",
-            "direction": "desc",
-            "startDate": get_start_date_range(time_period),
-        }
-        resp = requests.get(settings.ALGOLIA_SEARCHES_ENDPOINT, headers=headers, params=params, timeout=20)
-        if resp.status_code != 200:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Failed to fetch Algolia results for `{time_period}` time period: {resp.text}.",
-            )
-        resp.json().get("searches")
-    except HTTPError as e:
-        LOGGER.error(f"HTTPError while fetching Algolia searches for `{time_period}`: {e}")
-    except Exception as e:
-        LOGGER.error(f"Unexpected error while fetching Algolia searches for `{time_period}`: {e}")
+    headers = {
+        "x-algolia-application-id": settings.ALGOLIA_APP_ID,
+        "x-algolia-api-key": settings.ALGOLIA_API_KEY,
+    }
+    params = {
+        "index": settings.ALGOLIA_INDEX_NAME,
+        "limit": settings.ALGOLIA_PAGE_SIZE,
+        "offset": 0,
+        "orderBy": "searchCount",
+        "direction": "desc",
+        "startDate": get_start_date_range(days),
+    }
+    while True:
+        resp = get_session("algolia").get(
+            settings.ALGOLIA_SEARCHES_ENDPOINT, headers=headers, params=params, timeout=30
+        )
+        resp.raise_for_status()
+        search_queries = resp.json().get("searches") or []
+        if search_queries:
+            yield search_queries
+        if len(search_queries) < settings.ALGOLIA_PAGE_SIZE:
+            return
+        params["offset"] += settings.ALGOLIA_PAGE_SIZE
 
 
 def filter_search_queries(search_queries: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
@@ -93,17 +90,49 @@ def filter_search_queries(search_queries: List[Dict[str, Any]]) -> List[Optional
     return [query for query in search_queries if len(query["search"]) > 3]
 
 
-def import_algolia_search_queries(records: List[dict], table_name: str) -> Optional[List[dict]]:
+def upsert_algolia_search_queries(records: List[dict], period: str, refreshed_at: datetime) -> Optional[int]:
     """
-    Save history of search queries executed on the site.
+    Save search queries executed on the site, keyed on reporting period & search string.
 
     :param List[dict] records: JSON of search queries submitted by users.
-    :param str table_name: Name of SQL table to save data to.
+    :param str period: Name of reporting period.
+    :param datetime refreshed_at: Time the current refresh started.
 
-    :returns: Optional[List[dict]]
+    :returns: Optional[int]
     """
-    return feature_db.insert_records(
-        records,
-        table_name,
-        replace=True,
+    rows = [
+        {
+            "period": period,
+            "search": record["search"][:255],
+            "count": record.get("count"),
+            "nb_hits": record.get("nbHits"),
+            "updated_at": refreshed_at,
+        }
+        for record in records
+    ]
+    return feature_db.upsert_records(
+        rows,
+        AlgoliaSearch.__table__,
+        key_columns=["period", "search"],
+        update_columns=["count", "nb_hits", "updated_at"],
     )
+
+
+def prune_algolia_search_queries(period: str, refreshed_at: datetime) -> None:
+    """
+    Delete search queries which weren't seen during the latest refresh of a reporting period.
+
+    :param str period: Name of reporting period.
+    :param datetime refreshed_at: Time the latest refresh started.
+    """
+    try:
+        with feature_db.db.begin() as conn:
+            result = conn.execute(
+                delete(AlgoliaSearch).where(
+                    AlgoliaSearch.period == period,
+                    AlgoliaSearch.updated_at < refreshed_at,
+                )
+            )
+        LOGGER.info(f"Pruned {result.rowcount} stale Algolia search queries for `{period}`.")
+    except SQLAlchemyError as e:
+        LOGGER.error(f"SQLAlchemyError while pruning Algolia search queries for `{period}`: {e}")
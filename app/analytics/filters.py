@@ -0,0 +1,58 @@
+"""Filter Plausible results down to pages which represent posts."""
+
+import re
+from typing import Iterable, List, Optional
+
+
+class PageFilter:
+    """Precompiled filter for Plausible page results, built once per analytics run."""
+
+    def __init__(self, excluded_pages: Iterable[str], excluded_prefixes: Iterable[str], min_pageviews: int):
+        """
+        Page filter constructor.
+
+        :param Iterable[str] excluded_pages: Exact page paths to exclude (ie: Ghost pages, `/`).
+        :param Iterable[str] excluded_prefixes: Path prefixes to exclude (ie: `/tag/`, `/author/`).
+        :param int min_pageviews: Pages must have more than this many pageviews to be kept.
+        """
+        self.excluded_pages = frozenset(excluded_pages)
+        self.excluded_prefixes = tuple(sorted(set(excluded_prefixes), key=len, reverse=True))
+        self.min_pageviews = min_pageviews
+        self._excluded_prefix_pattern = (
+            re.compile("|".join(re.escape(prefix) for prefix in self.excluded_prefixes))
+            if self.excluded_prefixes
+            else None
+        )
+
+    def is_excluded(self, page: str) -> bool:
+        """
+        Determine whether a page path should be excluded.
+
+        :param str page: Relative page path reported by Plausible.
+
+        :returns: bool
+        """
+        if page in self.excluded_pages:
+            return True
+        return self._excluded_prefix_pattern is not None and self._excluded_prefix_pattern.match(page) is not None
+
+    def __call__(self, results: Iterable[Optional[dict]]) -> List[dict]:
+        """
+        Filter Plausible results.
+
+        :param Iterable[Optional[dict]] results: Top visited pages returned by Plausible.
+
+        :returns: List[dict]
+        """
+        excluded_pages = self.excluded_pages
+        min_pageviews = self.min_pageviews
+        match_prefix = self._excluded_prefix_pattern.match if self._excluded_prefix_pattern is not None else None
+        return [
+            result
+            for result in results
+            if result is not None
+            and result.get("pageviews") is not None
+            and result["pageviews"] > min_pageviews
+            and result["page"] not in excluded_pages
+            and (match_prefix is None or match_prefix(result["page"]) is None)
+        ]
@@ -1,24 +1,31 @@
 """Import site analytics from data warehouse to application."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional
 
-from clients import gbq
+from clients import get_gbq, get_gbq_storage
 from config import settings
 from database import feature_db
 
 
-def import_site_analytics(timeframe: str) -> Dict[str, List[Any]]:
+def import_site_analytics(timeframe: str) -> Optional[Dict[str, Any]]:
     """
-    Migrate raw analytics data from Google BigQuery to application db.
+    Stream raw analytics data from Google BigQuery to application db as Arrow record batches.
+
+    Large results are read via the BigQuery Storage Read API; results fitting in the first page are served as-is.
 
     :param str timeframe: Time frame to fetch data for (weekly, monthly, yearly).
 
-    :returns: Dict[str, List[Any]]
+    :returns: Optional[Dict[str, Any]]
     """
-    sql_query = open(f"{settings.BASE_DIR}/database/queries/analytics/{timeframe}.sql", encoding="utf-8").read()
+    with open(f"{settings.BASE_DIR}/database/queries/analytics/{timeframe}.sql", encoding="utf-8") as f:
+        sql_query = f.read()
     sql_table = f"{timeframe}_stats"
-    query_job = gbq.query(sql_query)
-    result = query_job.result()
-    df = result.to_dataframe()
-    result = feature_db.insert_dataframe(df, sql_table, action="replace")
-    return {"posts": result["slug"].to_list(), "views": result["views"].to_list()}
+    query_job = get_gbq().query(sql_query)
+    rows = query_job.result(page_size=settings.GCP_BIGQUERY_BATCH_SIZE)
+    batches = rows.to_arrow_iterable(bqstorage_client=get_gbq_storage())
+    return feature_db.insert_arrow_batches(
+        batches,
+        sql_table,
+        replace=True,
+        chunk_size=settings.GCP_BIGQUERY_BATCH_SIZE,
+    )
@@ -1,28 +1,45 @@
 """Fetch site analytics via Plausible API."""
 
-from typing import List, Optional
+import re
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional, Set, Tuple
 
-import requests
 from fastapi import HTTPException
 from requests.exceptions import RequestException
 
-from clients import ghost
+from app.analytics.filters import PageFilter
+from app.analytics.slugs import slug_resolver
+from clients import get_ghost
+from clients.transport import get_session
 from config import settings
 from log import LOGGER
 
+# Ghost slugs only contain lowercase alphanumerics & hyphens; anything else can't match a post.
+GHOST_SLUG_PATTERN = re.compile(r"^[a-z0-9-]+$")
 
-def top_visited_pages_by_timeframe(time_period: str, limit=100) -> Optional[List[dict]]:
+# Recent Plausible responses keyed by (time_period, limit).
+_plausible_cache: Dict[Tuple[str, int], Tuple[float, List[dict]]] = {}
+_plausible_cache_lock = Lock()
+
+
+def top_visited_pages_by_timeframe(
+    time_period: str,
+    limit=100,
+    page_filter: Optional[PageFilter] = None,
+) -> Optional[List[dict]]:
     """
     Get top visited URLs & enrich with post metadata.
 
     :param str time_period: Period of time to fetch results for (12mo, 6mo, month, 30d, 7d, or day).
     :param int limit: Maximum number of results to be returned.
+    :param Optional[PageFilter] page_filter: Filter to exclude non-post pages; built if not provided.
 
     :returns: List[Optional[dict]]
     """
     results = fetch_top_visited_pages(time_period, limit=limit)
     if results:
-        results = filter_results(results)
+        results = filter_results(results, page_filter)
         results = enrich_results(results)
         return results
     return []
@@ -30,26 +47,32 @@ def top_visited_pages_by_timeframe(time_period: str, limit=100) -> Optional[List
 
 def fetch_top_visited_pages(time_period: str, limit=30) -> List[Optional[dict]]:
     """
-    Fetch top visited URLs from Plausible.
+    Fetch top visited URLs from Plausible, serving recent responses from cache.
 
     :param str time_period: Period of time to fetch results for (12mo, 6mo, month, 30d, 7d, or day).
     :param int limit: Maximum number of results to be returned.
 
     :returns: Optional[List[dict]]
     """
+    cache_key = (time_period, limit)
+    with _plausible_cache_lock:
+        cached = _plausible_cache.get(cache_key)
+    if cached is not None and monotonic() - cached[0] < settings.PLAUSIBLE_CACHE_TTL:
+        LOGGER.info(f"Serving cached Plausible top URLs for `{time_period}`.")
+        return [dict(result) for result in cached[1]]
     try:
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {settings.PLAUSIBLE_API_TOKEN}",
         }
         params = {
-            "site_id": "hackersandslackers.com",
+            "site_id": settings.PLAUSIBLE_SITE_ID,
             "period": time_period,
             "property": "event:page",
             "limit": limit,
             "metrics": "visitors,visits,bounce_rate,pageviews,visit_duration",
         }
-        resp = requests.get(
+        resp = get_session("plausible").get(
             settings.PLAUSIBLE_STATS_ENDPOINT,
             params=params,
             headers=headers,
@@ -60,59 +83,71 @@ def fetch_top_visited_pages(time_period: str, limit=30) -> List[Optional[dict]]:
                 status_code=resp.status_code,
                 detail=f"Failed to fetch Plausible results for time period of `{time_period}` : {resp.text}.",
             )
-        return resp.json().get("results")
+        results = resp.json().get("results")
+        if results is not None:
+            with _plausible_cache_lock:
+                _plausible_cache[cache_key] = (monotonic(), results)
+            return [dict(result) for result in results]
+        return results
     except RequestException as e:
         LOGGER.error(f"RequestException when fetching Plausible top URLs: {e}")
     except Exception as e:
         LOGGER.error(f"Unexpected Exception when fetching Plausible top URLs: {e}")
 
 
-def fetch_all_ghost_urls() -> List[dict]:
+def fetch_all_ghost_urls() -> Set[str]:
     """
     List all slugs for Ghost posts & pages.
 
-    :returns: List[dict]
+    :returns: Set[str]
+    """
+    ghost_pages = get_ghost().get_pages() or []
+    return {f"/{page.get('slug')}/" for page in ghost_pages if page is not None and page.get("slug") is not None}
+
+
+def build_page_filter(ghost_page_urls: Optional[Set[str]] = None) -> PageFilter:
+    """
+    Compile filter excluding Ghost pages & configured non-post paths.
+
+    :param Optional[Set[str]] ghost_page_urls: Relative URLs of Ghost pages to exclude; fetched if not provided.
+
+    :returns: PageFilter
     """
-    ghost_pages = ghost.get_pages()
-    return [f"/{page.get('slug')}/" for page in ghost_pages if page.get("slug") is not None and page is not None]
+    if ghost_page_urls is None:
+        ghost_page_urls = fetch_all_ghost_urls()
+    return PageFilter(
+        excluded_pages=ghost_page_urls.union(settings.PLAUSIBLE_EXCLUDED_PAGES),
+        excluded_prefixes=settings.PLAUSIBLE_EXCLUDED_PATH_PREFIXES,
+        min_pageviews=settings.PLAUSIBLE_MIN_PAGEVIEWS,
+    )
 
 
-def filter_results(results_list: List[dict]) -> List[dict]:
+def filter_results(results_list: List[dict], page_filter: Optional[PageFilter] = None) -> List[dict]:
     """
-    Fetch all Ghost posts & filter unimportant pages.
+    Filter unimportant pages from Plausible results.
 
     :param List[dict] results_list: List of top visited URLs.
+    :param Optional[PageFilter] page_filter: Filter to exclude non-post pages; built if not provided.
 
     :returns: List[dict]
     """
-    ghost_page_urls = fetch_all_ghost_urls()
-    return [
-        result
-        for result in results_list
-        if result is not None
-        and result.get("pageviews") is not None
-        and result["pageviews"] > 4
-        and "/tag" not in result["page"]
-        and "/page" not in result["page"]
-        and "/author" not in result["page"]
-        and "/series" not in result["page"]
-        and result["page"] != "about"
-        and result["page"] != "/"
-        and result["page"] != ""
-        and result["page"] not in ghost_page_urls
-    ]
-
-
-def enrich_url_with_post_data(page_result: dict) -> Optional[dict]:
+    if page_filter is None:
+        page_filter = build_page_filter()
+    return page_filter(results_list)
+
+
+def enrich_url_with_post_data(page_result: dict, post: Optional[dict] = None) -> Optional[dict]:
     """
     Backwards lookup to determine post slug from URL; associated Ghost post title.
 
     :param dict page_result: Top visited URL result returned by Plausible.
+    :param Optional[dict] post: Ghost post matching the URL's slug; fetched if not provided.
 
     :returns: Optional[dict]
     """
     slug = page_result["page"].replace("/", "")
-    post = ghost.get_post_by_slug(slug)
+    if post is None:
+        post = get_ghost().get_post_by_slug(slug)
     if post and page_result["pageviews"] and page_result["pageviews"] > 2:
         page_result["slug"] = slug
         page_result["title"] = post["title"]
@@ -121,12 +156,24 @@ def enrich_url_with_post_data(page_result: dict) -> Optional[dict]:
     return None
 
 
-def enrich_results(results: List[dict]):
+def enrich_results(results: List[dict]) -> List[dict]:
     """
-    Add additional Ghost page metadata to Plausible results.
+    Add additional Ghost page metadata to Plausible results via batched, cached slug lookups.
 
-    :param List[dict] results:
+    :param List[dict] results: Filtered top visited URLs returned by Plausible.
 
     :returns: List[dict]
     """
-    return [enrich_url_with_post_data(result) for result in results if result is not None]
+    results = [result for result in results if result is not None]
+    slugs = {result["page"].replace("/", "") for result in results}
+    slugs = sorted(slug for slug in slugs if GHOST_SLUG_PATTERN.match(slug))
+    posts_by_slug = slug_resolver.resolve(slugs)
+    enriched_results = []
+    for result in results:
+        post = posts_by_slug.get(result["page"].replace("/", ""))
+        if post is None:
+            continue
+        enriched_result = enrich_url_with_post_data(result, post)
+        if enriched_result is not None:
+            enriched_results.append(enriched_result)
+    return enriched_results
@@ -0,0 +1,117 @@
+"""Resolve post slugs to Ghost post summaries in bulk."""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional
+
+from clients import get_ghost
+from clients.ghost import Ghost
+from config import settings
+from log import LOGGER
+
+
+class PostSlugResolver:
+    """Batch slug -> post lookups against Ghost, backed by a process-wide LRU cache."""
+
+    fields = "slug,title,url"
+
+    def __init__(self, ghost_provider: Callable[[], Ghost], maxsize: int, chunk_size: int):
+        """
+        Post slug resolver constructor.
+
+        :param Callable[[], Ghost] ghost_provider: Returns the Ghost admin client used to look up posts.
+        :param int maxsize: Maximum number of slugs to keep cached.
+        :param int chunk_size: Maximum number of slugs per Ghost request.
+        """
+        self.ghost_provider = ghost_provider
+        self.maxsize = maxsize
+        self.chunk_size = chunk_size
+        self._cache: OrderedDict[str, Optional[dict]] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def ghost_client(self) -> Ghost:
+        """
+        Ghost admin client, created on first use.
+
+        :returns: Ghost
+        """
+        return self.ghost_provider()
+
+    def resolve(self, slugs: Iterable[str]) -> Dict[str, dict]:
+        """
+        Map slugs to Ghost posts, fetching uncached slugs in chunks.
+
+        Slugs which don't belong to a post are cached as misses so they aren't requested again until invalidated.
+
+        :param Iterable[str] slugs: Post slugs to resolve.
+
+        :returns: Dict[str, dict]
+        """
+        resolved = {}
+        missing = []
+        with self._lock:
+            for slug in dict.fromkeys(slugs):
+                if slug in self._cache:
+                    self._cache.move_to_end(slug)
+                    if self._cache[slug] is not None:
+                        resolved[slug] = self._cache[slug]
+                else:
+                    missing.append(slug)
+        for chunk in self._chunks(missing):
+            posts = self.ghost_client.get_posts_by_slugs(chunk, fields=self.fields)
+            if posts is None:
+                continue
+            fetched = {post["slug"]: post for post in posts}
+            with self._lock:
+                for slug in chunk:
+                    self._store(slug, fetched.get(slug))
+            resolved.update(fetched)
+        LOGGER.info(f"Resolved {len(resolved)} post slugs ({len(missing)} fetched from Ghost).")
+        return resolved
+
+    def invalidate(self, *slugs: Optional[str]) -> None:
+        """
+        Evict slugs from cache, ie: when a post is created, renamed or updated.
+
+        :param Optional[str] slugs: Post slugs to evict.
+        """
+        with self._lock:
+            for slug in slugs:
+                if slug is not None:
+                    self._cache.pop(slug, None)
+
+    def clear(self) -> None:
+        """Evict all cached slugs."""
+        with self._lock:
+            self._cache.clear()
+
+    def _store(self, slug: str, post: Optional[dict]) -> None:
+        """
+        Cache resolved post (or miss), evicting the least recently used slug when full.
+
+        :param str slug: Post slug.
+        :param Optional[dict] post: Resolved post summary, or `None` if no post has this slug.
+        """
+        self._cache[slug] = post
+        self._cache.move_to_end(slug)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def _chunks(self, slugs: List[str]) -> Iterable[List[str]]:
+        """
+        Split slugs into request-sized chunks.
+
+        :param List[str] slugs: Post slugs to split.
+
+        :returns: Iterable[List[str]]
+        """
+        for offset in range(0, len(slugs), self.chunk_size):
+            yield slugs[offset : offset + self.chunk_size]
+
+
+slug_resolver = PostSlugResolver(
+    get_ghost,
+    maxsize=settings.GHOST_SLUG_CACHE_SIZE,
+    chunk_size=settings.GHOST_SLUG_BATCH_SIZE,
+)
@@ -0,0 +1,197 @@
+"""Suggest search queries from the history of searches submitted via Algolia."""
+
+import heapq
+import json
+import os
+from bisect import bisect_left
+from threading import Lock
+from time import monotonic
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from config import settings
+from database import feature_db
+from database.models import AlgoliaSearch
+from log import LOGGER
+
+
+def normalize_search(search: str) -> str:
+    """
+    Normalize search string for prefix matching.
+
+    :param str search: Raw search string.
+
+    :returns: str
+    """
+    return " ".join(search.lower().split())
+
+
+class SearchSuggestionIndex:
+    """In-process prefix index of past search queries, weighted by search count."""
+
+    def __init__(self, max_suggestions=10, precomputed_prefix_length=2):
+        """
+        Search suggestion index constructor.
+
+        :param int max_suggestions: Maximum number of suggestions returned per query.
+        :param int precomputed_prefix_length: Prefixes up to this length have suggestions computed at build time.
+        """
+        self.max_suggestions = max_suggestions
+        self.precomputed_prefix_length = precomputed_prefix_length
+        # (sorted normalized keys, entries aligned with keys, precomputed suggestions by short prefix)
+        self._state: Tuple[List[str], List[dict], Dict[str, List[dict]]] = ([], [], {})
+        self._snapshot_mtime: Optional[float] = None
+        self._snapshot_checked_at = 0.0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+    def build(self, searches: Iterable[Tuple[str, int]]) -> None:
+        """
+        Replace index contents with weighted searches.
+
+        Searches which normalize to the same key are merged; counts are summed & the most searched variant is kept.
+
+        :param Iterable[Tuple[str, int]] searches: Pairs of search string & number of times it was searched.
+        """
+        merged: Dict[str, list] = {}
+        for search, count in searches:
+            key = normalize_search(search)
+            count = count or 0
+            if not key:
+                continue
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = [search.strip(), count, count]
+                continue
+            entry[1] += count
+            if count > entry[2]:
+                entry[0], entry[2] = search.strip(), count
+        keys = sorted(merged)
+        entries = [{"search": merged[key][0], "count": merged[key][1]} for key in keys]
+        top: Dict[str, List[dict]] = {}
+        for key, entry in sorted(zip(keys, entries), key=lambda item: item[1]["count"], reverse=True):
+            for length in range(1, min(len(key), self.precomputed_prefix_length) + 1):
+                suggestions = top.setdefault(key[:length], [])
+                if len(suggestions) < self.max_suggestions:
+                    suggestions.append(entry)
+        self._state = (keys, entries, top)
+
+    def suggest(self, query: str, limit: Optional[int] = None) -> List[dict]:
+        """
+        Fetch most searched queries beginning with a prefix.
+
+        :param str query: Prefix typed by the user.
+        :param Optional[int] limit: Maximum number of suggestions to return.
+
+        :returns: List[dict]
+        """
+        limit = min(limit or self.max_suggestions, self.max_suggestions)
+        keys, entries, top = self._state
+        prefix = normalize_search(query)
+        if not prefix:
+            return []
+        if len(prefix) <= self.precomputed_prefix_length:
+            return top.get(prefix, [])[:limit]
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + "\uffff", lo=start)
+        if end - start <= limit:
+            return sorted(entries[start:end], key=lambda entry: entry["count"], reverse=True)
+        return heapq.nlargest(limit, entries[start:end], key=lambda entry: entry["count"])
+
+    def save(self, snapshot_path: str) -> None:
+        """
+        Atomically write index contents to disk so other workers can load it without querying the database.
+
+        :param str snapshot_path: Filepath of JSON snapshot.
+        """
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"searches": [[entry["search"], entry["count"]] for entry in self._state[1]]}, f)
+        os.replace(temp_path, snapshot_path)
+        self._snapshot_mtime = os.stat(snapshot_path).st_mtime
+
+    def load(self, snapshot_path: str) -> bool:
+        """
+        Load index contents from a snapshot on disk.
+
+        :param str snapshot_path: Filepath of JSON snapshot.
+
+        :returns: bool
+        """
+        try:
+            mtime = os.stat(snapshot_path).st_mtime
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self.build((search, count) for search, count in snapshot["searches"])
+            self._snapshot_mtime = mtime
+            LOGGER.info(f"Loaded {len(self)} search suggestions from `{snapshot_path}`.")
+            return True
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError) as e:
+            LOGGER.warning(f"Failed to load search suggestions snapshot `{snapshot_path}`: {e}")
+            return False
+
+    def reload_if_changed(self, snapshot_path: str, interval: float) -> None:
+        """
+        Reload index when another worker has written a newer snapshot, checking at most once per interval.
+
+        :param str snapshot_path: Filepath of JSON snapshot.
+        :param float interval: Minimum number of seconds between checks.
+        """
+        now = monotonic()
+        if now - self._snapshot_checked_at < interval or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._snapshot_checked_at = now
+            try:
+                mtime = os.stat(snapshot_path).st_mtime
+            except OSError:
+                return
+            if mtime != self._snapshot_mtime:
+                self.load(snapshot_path)
+        finally:
+            self._lock.release()
+
+
+search_suggestions = SearchSuggestionIndex(max_suggestions=settings.SEARCH_SUGGESTIONS_LIMIT)
+
+
+def rebuild_search_suggestions() -> Optional[int]:
+    """
+    Rebuild search suggestions from searches stored in the features database & snapshot them to disk.
+
+    :returns: Optional[int]
+    """
+    try:
+        query = select(AlgoliaSearch.search, func.max(AlgoliaSearch.count)).group_by(AlgoliaSearch.search)
+        with feature_db.db.connect() as conn:
+            search_suggestions.build(conn.execute(query).all())
+        search_suggestions.save(settings.SEARCH_SUGGESTIONS_SNAPSHOT_PATH)
+        LOGGER.success(f"Rebuilt search suggestions index with {len(search_suggestions)} queries.")
+        return len(search_suggestions)
+    except SQLAlchemyError as e:
+        LOGGER.error(f"SQLAlchemyError while rebuilding search suggestions: {e}")
+    except OSError as e:
+        LOGGER.error(f"OSError while saving search suggestions snapshot: {e}")
+
+
+def suggest_searches(query: str, limit: Optional[int] = None) -> List[dict]:
+    """
+    Suggest most searched queries beginning with a prefix, picking up snapshots written by other workers.
+
+    :param str query: Prefix typed by the user.
+    :param Optional[int] limit: Maximum number of suggestions to return.
+
+    :returns: List[dict]
+    """
+    search_suggestions.reload_if_changed(
+        settings.SEARCH_SUGGESTIONS_SNAPSHOT_PATH,
+        settings.SEARCH_SUGGESTIONS_RELOAD_INTERVAL,
+    )
+    return search_suggestions.suggest(query, limit)
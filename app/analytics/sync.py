@@ -0,0 +1,189 @@
+"""Incrementally sync daily Plausible page analytics into the features database."""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from requests.exceptions import RequestException
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.moment import get_current_datetime
+from clients.transport import get_session
+from config import settings
+from database.models import PageViewsDaily, PageViewsRolling
+from log import LOGGER
+
+PAGE_METRICS = ("visitors", "visits", "pageviews", "bounce_rate", "visit_duration")
+
+
+def fetch_daily_page_views(day: date) -> Optional[List[dict]]:
+    """
+    Fetch Plausible page breakdown for a single day.
+
+    :param date day: Day to fetch page analytics for.
+
+    :returns: Optional[List[dict]]
+    """
+    try:
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {settings.PLAUSIBLE_API_TOKEN}",
+        }
+        params = {
+            "site_id": settings.PLAUSIBLE_SITE_ID,
+            "period": "day",
+            "date": day.isoformat(),
+            "property": "event:page",
+            "limit": settings.PLAUSIBLE_DAILY_LIMIT,
+            "metrics": "visitors,visits,bounce_rate,pageviews,visit_duration",
+        }
+        resp = get_session("plausible").get(
+            settings.PLAUSIBLE_STATS_ENDPOINT, params=params, headers=headers, timeout=20
+        )
+        if resp.status_code != 200:
+            LOGGER.error(f"Failed to fetch Plausible results for `{day}`: {resp.text}")
+            return None
+        return resp.json().get("results", [])
+    except RequestException as e:
+        LOGGER.error(f"RequestException when fetching Plausible results for `{day}`: {e}")
+    except Exception as e:
+        LOGGER.error(f"Unexpected Exception when fetching Plausible results for `{day}`: {e}")
+
+
+def merge_page_results(results: List[dict]) -> List[dict]:
+    """
+    Key Plausible results by page truncated to the column length, merging long paths which share a prefix.
+
+    Counts are summed, while bounce rate & visit duration are averaged weighted by visits.
+
+    :param List[dict] results: Plausible page breakdown for a single day.
+
+    :returns: List[dict]
+    """
+    pages = {}
+    for result in results:
+        if not result.get("page"):
+            continue
+        page = result["page"][: PageViewsDaily.page.type.length]
+        row = pages.get(page)
+        if row is None:
+            pages[page] = {"page": page, **{metric: result.get(metric) for metric in PAGE_METRICS}}
+            continue
+        visits, added_visits = row["visits"] or 0, result.get("visits") or 0
+        if visits + added_visits:
+            for metric in ("bounce_rate", "visit_duration"):
+                row[metric] = ((row[metric] or 0) * visits + (result.get(metric) or 0) * added_visits) / (
+                    visits + added_visits
+                )
+        for metric in ("visitors", "visits", "pageviews"):
+            row[metric] = (row[metric] or 0) + (result.get(metric) or 0)
+    return list(pages.values())
+
+
+def days_to_sync(db: Session, today: date) -> List[date]:
+    """
+    List complete days which haven't been synced yet, bounded by the backfill horizon.
+
+    :param Session db: ORM database session.
+    :param date today: Current day; excluded as its analytics are incomplete.
+
+    :returns: List[date]
+    """
+    start = today - timedelta(days=settings.PLAUSIBLE_BACKFILL_DAYS)
+    last_synced = db.query(func.max(PageViewsDaily.date)).scalar()
+    if last_synced is not None:
+        start = max(start, last_synced + timedelta(days=1))
+    return [start + timedelta(days=offset) for offset in range((today - start).days)]
+
+
+def sync_daily_page_views(db: Session) -> Dict[str, Any]:
+    """
+    Store daily Plausible page analytics for every day after the last synced date, then refresh rolling windows.
+
+    Each day is committed on its own, so a failed request leaves a contiguous history to resume from.
+
+    :param Session db: ORM database session.
+
+    :returns: Dict[str, Any]
+    """
+    today = get_current_datetime().date()
+    synced_days = {}
+    for day in days_to_sync(db, today):
+        results = fetch_daily_page_views(day)
+        if results is None:
+            LOGGER.warning(f"Stopped Plausible sync at `{day}`; remaining days will be retried on the next sync.")
+            break
+        rows = [{"date": day, **row} for row in merge_page_results(results)]
+        try:
+            db.execute(delete(PageViewsDaily).where(PageViewsDaily.date == day))
+            if rows:
+                db.execute(insert(PageViewsDaily), rows)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            LOGGER.error(f"SQLAlchemyError while saving Plausible results for `{day}`: {e}")
+            break
+        synced_days[day.isoformat()] = len(rows)
+    windows = refresh_rolling_page_views(db, today)
+    LOGGER.success(f"Synced {sum(synced_days.values())} Plausible rows across {len(synced_days)} days.")
+    return {"days": synced_days, "rows": sum(synced_days.values()), "windows": windows}
+
+
+def refresh_rolling_page_views(db: Session, today: date) -> Dict[int, int]:
+    """
+    Rebuild pre-aggregated rolling windows of page analytics from daily totals.
+
+    :param Session db: ORM database session.
+    :param date today: Current day from which windows are counted back.
+
+    :returns: Dict[int, int]
+    """
+    window_rows = {}
+    try:
+        for window_days in settings.PLAUSIBLE_ROLLING_WINDOWS:
+            aggregate = (
+                select(
+                    literal(window_days),
+                    PageViewsDaily.page,
+                    func.sum(PageViewsDaily.visitors),
+                    func.sum(PageViewsDaily.visits),
+                    func.sum(PageViewsDaily.pageviews),
+                    func.sum(PageViewsDaily.visit_duration * PageViewsDaily.visits)
+                    / func.nullif(func.sum(PageViewsDaily.visits), 0),
+                )
+                .where(PageViewsDaily.date >= today - timedelta(days=window_days))
+                .group_by(PageViewsDaily.page)
+            )
+            db.execute(delete(PageViewsRolling).where(PageViewsRolling.window_days == window_days))
+            result = db.execute(
+                insert(PageViewsRolling).from_select(
+                    ["window_days", "page", "visitors", "visits", "pageviews", "visit_duration"],
+                    aggregate,
+                )
+            )
+            window_rows[window_days] = result.rowcount
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        LOGGER.error(f"SQLAlchemyError while refreshing rolling page analytics: {e}")
+    return window_rows
+
+
+def get_rolling_page_views(db: Session, window_days: int, limit: int) -> List[PageViewsRolling]:
+    """
+    Fetch top pages for a pre-aggregated rolling window.
+
+    :param Session db: ORM database session.
+    :param int window_days: Size of rolling window in days.
+    :param int limit: Maximum number of pages to return.
+
+    :returns: List[PageViewsRolling]
+    """
+    return (
+        db.query(PageViewsRolling)
+        .filter(PageViewsRolling.window_days == window_days)
+        .order_by(PageViewsRolling.pageviews.desc())
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,26 @@
+"""Test precompiled filtering of Plausible page results."""
+
+from app.analytics.filters import PageFilter
+
+
+def test_page_filter():
+    """Test excluded pages, path prefixes & low-traffic pages are filtered."""
+    page_filter = PageFilter(
+        excluded_pages={"/", "/about/"},
+        excluded_prefixes=["/tag/", "/author/"],
+        min_pageviews=4,
+    )
+    results = page_filter(
+        [
+            {"page": "/flask-routes/", "pageviews": 2932},
+            {"page": "/tagging-images/", "pageviews": 100},
+            {"page": "/tag/python/", "pageviews": 500},
+            {"page": "/author/todd/", "pageviews": 50},
+            {"page": "/about/", "pageviews": 50},
+            {"page": "/", "pageviews": 9000},
+            {"page": "/quiet-post/", "pageviews": 4},
+            {"page": "/unknown/", "pageviews": None},
+            None,
+        ]
+    )
+    assert [result["page"] for result in results] == ["/flask-routes/", "/tagging-images/"]
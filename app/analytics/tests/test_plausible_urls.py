@@ -1,6 +1,8 @@
 """Test Plausible API's integration to associate views per page"""
 
+from app.analytics import plausible
 from app.analytics.plausible import enrich_url_with_post_data, fetch_top_visited_pages
+from app.analytics.slugs import slug_resolver
 
 
 def test_fetch_top_visited_urls():
@@ -27,3 +29,32 @@ def test_enrich_url_with_post_data():
     assert post_dict["slug"] is not None
     assert post_dict["slug"] == "flask-routes"
     assert post_dict["title"] == "The Art of Routing in Flask"
+
+
+def test_enrich_results_bulk_lookup(monkeypatch):
+    """Test Plausible results are enriched via a single bulk Ghost lookup, cached for subsequent runs."""
+    requested_slugs = []
+
+    def get_posts_by_slugs(slugs, fields=None):
+        requested_slugs.append(slugs)
+        return [
+            {"slug": "flask-routes", "title": "The Art of Routing in Flask", "url": "https://example.com/flask-routes/"}
+        ]
+
+    monkeypatch.setattr(slug_resolver.ghost_client, "get_posts_by_slugs", get_posts_by_slugs)
+    slug_resolver.clear()
+    page_results = [
+        {"page": "/flask-routes/", "pageviews": 2932},
+        {"page": "/deleted-post/", "pageviews": 100},
+        {"page": "/search?q=flask", "pageviews": 50},
+    ]
+    results = plausible.enrich_results([dict(result) for result in page_results])
+    assert requested_slugs == [["deleted-post", "flask-routes"]]
+    assert len(results) == 1
+    assert results[0]["title"] == "The Art of Routing in Flask"
+
+    plausible.enrich_results([dict(result) for result in page_results])
+    assert len(requested_slugs) == 1
+    slug_resolver.invalidate("flask-routes")
+    plausible.enrich_results([dict(result) for result in page_results])
+    assert requested_slugs[-1] == ["flask-routes"]
@@ -0,0 +1,33 @@
+"""Test search query suggestions built from Algolia search history."""
+
+from app.analytics.suggest import SearchSuggestionIndex
+
+
+def test_search_suggestions(tmp_path):
+    """Test suggestions are matched by prefix, ranked by count & survive a snapshot round-trip."""
+    index = SearchSuggestionIndex(max_suggestions=3)
+    index.build(
+        [
+            ("Flask Routes", 10),
+            ("flask  routes", 5),
+            ("flask blueprints", 12),
+            ("flask", 3),
+            ("pandas dataframe", 40),
+            ("plotly", 2),
+        ]
+    )
+    assert index.suggest("fl") == [
+        {"search": "Flask Routes", "count": 15},
+        {"search": "flask blueprints", "count": 12},
+        {"search": "flask", "count": 3},
+    ]
+    assert index.suggest("FLASK R") == [{"search": "Flask Routes", "count": 15}]
+    assert index.suggest("flask", limit=1) == [{"search": "Flask Routes", "count": 15}]
+    assert index.suggest("django") == []
+    assert index.suggest("  ") == []
+
+    snapshot_path = str(tmp_path / "search_suggestions.json")
+    index.save(snapshot_path)
+    restored = SearchSuggestionIndex(max_suggestions=3)
+    assert restored.load(snapshot_path) is True
+    assert restored.suggest("p") == index.suggest("p")
@@ -0,0 +1,75 @@
+"""Test incremental sync of daily Plausible page analytics."""
+
+from datetime import date, datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.analytics import sync
+from database import Base
+from database.models import PageViewsDaily
+
+
+def test_sync_daily_page_views(monkeypatch):
+    """Test only unsynced days are fetched & rolling windows are aggregated from daily totals."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[PageViewsDaily.__table__, sync.PageViewsRolling.__table__])
+    db = sessionmaker(bind=engine)()
+    fetched_days = []
+
+    def fetch_daily_page_views(day: date):
+        fetched_days.append(day)
+        return [{"page": "/flask-routes/", "visitors": 10, "visits": 12, "pageviews": 20, "visit_duration": 30}]
+
+    monkeypatch.setattr(sync, "fetch_daily_page_views", fetch_daily_page_views)
+    monkeypatch.setattr(sync, "get_current_datetime", lambda: datetime(2024, 8, 10, 12))
+    monkeypatch.setattr(sync.settings, "PLAUSIBLE_BACKFILL_DAYS", 5)
+    monkeypatch.setattr(sync.settings, "PLAUSIBLE_ROLLING_WINDOWS", [3, 7])
+
+    result = sync.sync_daily_page_views(db)
+    assert fetched_days == [date(2024, 8, day) for day in range(5, 10)]
+    assert result["rows"] == 5
+    assert sync.get_rolling_page_views(db, 3, 10)[0].pageviews == 60
+    assert sync.get_rolling_page_views(db, 7, 10)[0].pageviews == 100
+
+    fetched_days.clear()
+    monkeypatch.setattr(sync, "get_current_datetime", lambda: datetime(2024, 8, 12, 12))
+    sync.sync_daily_page_views(db)
+    assert fetched_days == [date(2024, 8, 10), date(2024, 8, 11)]
+
+
+def test_merge_page_results():
+    """Long paths sharing a truncated prefix are merged into one row instead of colliding on the primary key."""
+    prefix = "/" + "a" * 260
+    rows = sync.merge_page_results(
+        [
+            {
+                "page": f"{prefix}/1/",
+                "visitors": 1,
+                "visits": 1,
+                "pageviews": 2,
+                "bounce_rate": 100,
+                "visit_duration": 0,
+            },
+            {
+                "page": f"{prefix}/2/",
+                "visitors": 2,
+                "visits": 3,
+                "pageviews": 4,
+                "bounce_rate": 0,
+                "visit_duration": 40,
+            },
+            {"page": "/flask-routes/", "visitors": 5, "visits": 5, "pageviews": 9},
+            {"page": None, "visitors": 7},
+        ]
+    )
+    assert len(rows) == 2
+    assert rows[0] == {
+        "page": prefix[:255],
+        "visitors": 3,
+        "visits": 4,
+        "pageviews": 6,
+        "bounce_rate": 25,
+        "visit_duration": 30,
+    }
+    assert rows[1]["page"] == "/flask-routes/"
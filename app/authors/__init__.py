@@ -1,50 +1,67 @@
 """Author management."""
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import JSONResponse
 
-from clients import sms
+from app.analytics.slugs import slug_resolver
+from app.images.cdn_urls import canonicalize_cdn_urls
+from app.jobs.runner import JobContext, job_runner
+from app.routing import WebhookRoute
+from clients import get_sms_queue
+from clients.sms_queue import SMSQueue
 from config import settings
-from database import ghost_db
-from database.read_sql import collect_sql_queries
-from database.schemas import PostUpdate
+from database.schemas import JobStatus, LeanPostAuthorsUpdate
 from log import LOGGER
 
-router = APIRouter(prefix="/authors", tags=["authors"])
+router = APIRouter(prefix="/authors", tags=["authors"], route_class=WebhookRoute)
 
 
-@router.get(
-    "/",
-    summary="Sanitize author profile metadata.",
-    description="Update all authors to have correct CDN urls & sanitized metadata.",
-)
-async def authors_bulk_update_metadata() -> JSONResponse:
+@job_runner.task("authors.metadata")
+def sanitize_authors_metadata(job: JobContext) -> dict:
     """
     Bulk update author images to use CDN URLs.
 
-    :returns: JSONResponse
+    :param JobContext job: Handle for reporting progress.
+
+    :returns: dict
     """
-    update_author_queries = collect_sql_queries("users")
-    update_author_results = ghost_db.execute_queries(update_author_queries)
+    update_author_results = canonicalize_cdn_urls(["users"], progress=job.progress)["users"]
     if update_author_results is None:
-        raise HTTPException(status_code=204, detail="Post update ignored as post was just updated.")
-    LOGGER.success(f"Updated author metadata for {len(update_author_results)} authors.")
-    return JSONResponse(
-        content={"authors": update_author_results},
-        status_code=200,
-    )
+        raise RuntimeError("Failed to update author metadata.")
+    job.progress(1, 1)
+    LOGGER.success(f"Updated author image URLs: {update_author_results}.")
+    return {"authors": update_author_results}
+
+
+@router.get(
+    "/",
+    summary="Sanitize author profile metadata.",
+    description="Queue a job updating all authors to have correct CDN urls & sanitized metadata; \
+                poll `/jobs/{id}/` for results.",
+    response_model=JobStatus,
+    status_code=202,
+)
+async def authors_bulk_update_metadata():
+    """Queue job to bulk update author images to use CDN URLs."""
+    return await asyncio.to_thread(job_runner.submit, "authors.metadata")
 
 
 @router.post("/post/created/")
-async def author_post_created(post_update: PostUpdate) -> JSONResponse:
+async def author_post_created(
+    post_update: LeanPostAuthorsUpdate, sms_queue: SMSQueue = Depends(get_sms_queue)
+) -> JSONResponse:
     """
     Notify admin when new authors create a new post.
 
-    :param PostUpdate post_update: Post object generated upon update.
+    :param LeanPostAuthorsUpdate post_update: Post object generated upon update.
+    :param SMSQueue sms_queue: Outbound SMS queue.
 
     :returns: JSONResponse
     """
     data = post_update.post.current
+    slug_resolver.invalidate(data.slug)
     title = data.title
     author_name = data.primary_author.name
     primary_author_id = data.primary_author.id
@@ -54,32 +71,36 @@ async def author_post_created(post_update: PostUpdate) -> JSONResponse:
         settings.GHOST_ADMIN_USER_ID,
     ):
         msg = f"{author_name} just created a post: `{title}`."
-        sms.send_message(msg)
+        sms_queue.enqueue(msg)
         return JSONResponse(content=msg, status_code=200)
     if primary_author_id == settings.GHOST_ADMIN_USER_ID and len(authors) > 1:
         msg = f"{author_name} just updated one of your posts: `{title}`."
-        sms.send_message(msg)
+        sms_queue.enqueue(msg)
         return JSONResponse(content=msg, status_code=200)
     return JSONResponse(content=f"Author is {author_name}, carry on.", status_code=204)
 
 
 @router.post("/post/updated/")
-async def author_post_tampered(post_update: PostUpdate) -> JSONResponse:
+async def author_post_tampered(
+    post_update: LeanPostAuthorsUpdate, sms_queue: SMSQueue = Depends(get_sms_queue)
+) -> JSONResponse:
     """
     Notify admin when new authors edit an admin post.
 
-    :param PostUpdate post_update: Post object generated upon update.
+    :param LeanPostAuthorsUpdate post_update: Post object generated upon update.
+    :param SMSQueue sms_queue: Outbound SMS queue.
 
     :returns: JSONResponse
     """
     data = post_update.post.current
+    slug_resolver.invalidate(data.slug)
     title = data.title
     primary_author_id = data.primary_author.id
     authors = data.authors
     if primary_author_id == settings.GHOST_ADMIN_USER_ID and len(authors) > 1:
         other_authors = [author.name for author in authors if author.id != settings.GHOST_ADMIN_USER_ID]
         msg = f"{', '.join(other_authors)} updated you post: `{title}`."
-        sms.send_message(msg)
+        sms_queue.enqueue(msg)
         return JSONResponse(content=msg, status_code=200)
     return JSONResponse(
         content=f"{data.primary_author.name} edited one of their own posts, carry on.",
@@ -1,39 +1,84 @@
 """Accept and persist `BuyMeACoffee` donations."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.donations.parse import parse_donation_json
+from app.donations.parse import decode_cursor, encode_cursor, parse_donation_json
+from config import settings
 from database import get_db
-from database.crud import create_donation, get_donation
-from database.models import Donation
-from database.schemas import CoffeeDonation, AllCoffeeDonations
+from database.crud import (
+    get_donation_totals,
+    get_donations_by_month,
+    get_donations_page,
+    get_top_supporters,
+    import_donations,
+    remove_donation,
+    upsert_donation,
+)
+from database.schemas import (
+    CoffeeDonation,
+    DonationImport,
+    DonationMonth,
+    DonationPage,
+    DonationReceipt,
+    DonationSupporter,
+    DonationTotals,
+)
 
 router = APIRouter(prefix="/donation", tags=["donations"])
 
 
+def require_coffee_ids(donations: List[CoffeeDonation]):
+    """
+    Reject donations without a BuyMeACoffee ID, which duplicates can't be detected by.
+
+    :param List[CoffeeDonation] donations: Incoming donations.
+    """
+    if any(donation.coffee_id is None for donation in donations):
+        raise HTTPException(status_code=422, detail="Donations require a `coffee_id`.")
+
+
 @router.post(
     "/",
     summary="New BuyMeACoffee donation",
-    description="Save record of new donation to persistent ledger.",
-    response_model=CoffeeDonation,
+    description="Save record of new donation to persistent ledger; donations which already exist are skipped.",
+    response_model=DonationReceipt,
 )
-async def accept_donation(donation: CoffeeDonation, db: Session = Depends(get_db)) -> CoffeeDonation:
+async def accept_donation(donation: CoffeeDonation, db: Session = Depends(get_db)) -> dict:
     """
     Save BuyMeACoffee donation to database.
 
-    :param NewDonation donation: Incoming new donation.
+    :param CoffeeDonation donation: Incoming new donation.
     :param Session db: ORM Database session.
 
-    :returns: NewDonation
+    :returns: dict
     """
-    existing_donation = get_donation(db, donation)
-    if existing_donation:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Donation `{donation.coffee_id}` from `{donation.email}` already exists; skipping.",
-        )
-    return create_donation(db, donation)
+    require_coffee_ids([donation])
+    created = upsert_donation(db, donation)
+    if created is None:
+        raise HTTPException(status_code=500, detail=f"Failed to save donation `{donation.coffee_id}`.")
+    return {"created": created, "donation": donation}
+
+
+@router.post(
+    "/import/",
+    summary="Import historical BuyMeACoffee donations",
+    description="Backfill ledger with historical donations in chunks, skipping donations which already exist.",
+    response_model=DonationImport,
+)
+async def import_historical_donations(donations: List[CoffeeDonation], db: Session = Depends(get_db)) -> dict:
+    """
+    Save historical BuyMeACoffee donations in chunks of `DONATIONS_IMPORT_CHUNK_SIZE`.
+
+    :param List[CoffeeDonation] donations: Historical donations.
+    :param Session db: ORM Database session.
+
+    :returns: dict
+    """
+    require_coffee_ids(donations)
+    return import_donations(db, donations, settings.DONATIONS_IMPORT_CHUNK_SIZE)
 
 
 @router.delete(
@@ -46,29 +91,96 @@ async def delete_donation(donation: CoffeeDonation, db: Session = Depends(get_db
     """
     Delete BuyMeACoffee donation from database.
 
-    :param NewDonation donation: Incoming new donation.
+    :param CoffeeDonation donation: Donation to delete.
     :param Session db: ORM Database session.
 
-    :returns: NewDonation
+    :returns: CoffeeDonation
     """
-    existing_donation = get_donation(db, donation)
-    if existing_donation:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Donation `{donation.coffee_id}` from `{donation.email}` already exists; skipping.",
-        )
-    return create_donation(db, donation)
+    require_coffee_ids([donation])
+    deleted = remove_donation(db, donation.coffee_id)
+    if deleted is None:
+        raise HTTPException(status_code=500, detail=f"Failed to delete donation `{donation.coffee_id}`.")
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Donation `{donation.coffee_id}` does not exist.")
+    return donation
 
 
-@router.get("/", summary="Get all existing donations.", response_model=AllCoffeeDonations)
-async def get_donations(db: Session = Depends(get_db)):
+@router.get(
+    "/",
+    summary="Get page of existing donations.",
+    description="List donations oldest first; pass `next_cursor` of a page as `after` to fetch the following page.",
+    response_model=DonationPage,
+)
+async def get_donations(
+    after: Optional[str] = None,
+    limit: int = Query(settings.DONATIONS_PAGE_SIZE, ge=1, le=settings.DONATIONS_MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+) -> dict:
     """
-    Test endpoint for fetching comments joined with user info.
+    Fetch page of donations ordered by `created_at`.
 
+    :param Optional[str] after: Cursor of the previous page; fetches the first page if unset.
+    :param int limit: Maximum number of donations per page.
     :param Session db: ORM Database session.
+
+    :returns: dict
+    """
+    try:
+        cursor = decode_cursor(after) if after else None
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid donation cursor `{after}`.")
+    donations = get_donations_page(db, limit, after=cursor)
+    next_cursor = encode_cursor(donations[limit - 1]) if len(donations) > limit else None
+    return {"donations": [parse_donation_json(donation) for donation in donations[:limit]], "next_cursor": next_cursor}
+
+
+@router.get(
+    "/totals/",
+    summary="Get donation totals.",
+    description="Count donations, coffees & distinct supporters across the ledger.",
+    response_model=DonationTotals,
+)
+async def donation_totals(db: Session = Depends(get_db)) -> dict:
+    """
+    Fetch cached donation totals.
+
+    :param Session db: ORM Database session.
+
+    :returns: dict
+    """
+    return get_donation_totals(db)
+
+
+@router.get(
+    "/months/",
+    summary="Get donations by month.",
+    description="Count donations & coffees received per calendar month.",
+    response_model=List[DonationMonth],
+)
+async def donations_by_month(db: Session = Depends(get_db)) -> List[dict]:
+    """
+    Fetch cached donation counts per month.
+
+    :param Session db: ORM Database session.
+
+    :returns: List[dict]
+    """
+    return get_donations_by_month(db)
+
+
+@router.get(
+    "/supporters/",
+    summary="Get top supporters.",
+    description="Rank supporters by coffees donated.",
+    response_model=List[DonationSupporter],
+)
+async def top_supporters(limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)) -> List[dict]:
+    """
+    Fetch cached ranking of supporters.
+
+    :param int limit: Maximum number of supporters to return.
+    :param Session db: ORM Database session.
+
+    :returns: List[dict]
     """
-    response = []
-    all_donations = db.query(Donation).order_by(Donation.created_at).all()
-    for donation in all_donations:
-        response.append(parse_donation_json(donation))
-    return response
+    return get_top_supporters(db, limit)
@@ -1,5 +1,8 @@
 """Parse Donation into JSON response."""
 
+from datetime import datetime
+from typing import Tuple
+
 from database.models import Donation
 
 
@@ -21,3 +24,26 @@ def parse_donation_json(donation: Donation) -> dict:
         "url": donation.url,
         "created_at": donation.created_at,
     }
+
+
+def encode_cursor(donation: Donation) -> str:
+    """
+    Encode position of `donation` as a cursor for the following page of donations.
+
+    :param Donation donation: Last donation of a page.
+
+    :returns: str
+    """
+    return f"{donation.created_at.isoformat()}_{donation.id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode cursor into the `created_at` & `id` of the last donation of the previous page.
+
+    :param str cursor: Cursor returned with a page of donations.
+
+    :returns: Tuple[datetime, int]
+    """
+    created_at, _, donation_id = cursor.rpartition("_")
+    return datetime.fromisoformat(created_at), int(donation_id)
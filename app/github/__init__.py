@@ -1,11 +1,14 @@
 """Notify upon Github activity."""
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
 
+from app.github.ingest import is_ignored_sender, parse_event
 from app.moment import get_current_time
-from clients import sms
+from clients import get_sms_queue
+from clients.sms_queue import SMSQueue
 from config import settings
+from database.schemas import GithubIssueEvent, GithubPrEvent
 from log import LOGGER
 
 router = APIRouter(prefix="/github", tags=["github"])
@@ -16,61 +19,65 @@ router = APIRouter(prefix="/github", tags=["github"])
     summary="Notify upon Github PR creation.",
     description="Send SMS and Discord notifications upon PR creation in HackersAndSlackers Github projects.",
 )
-async def github_pr(request: Request) -> JSONResponse:
+async def github_pr(request: Request, sms_queue: SMSQueue = Depends(get_sms_queue)) -> JSONResponse:
     """
     Send SMS and Discord notifications upon PR creation in HackersAndSlackers Github projects.
 
     :param Request request: Incoming Github payload for newly opened PR.
+    :param SMSQueue sms_queue: Outbound SMS queue.
 
     :returns: JSONResponse
     """
-    payload = await request.json()
-    action = payload.get("action")
-    user = payload["sender"].get("login")
-    pull_request = payload["pull_request"]
-    repo = payload["repository"]
-    if user in (settings.GH_USERNAME, "dependabot-preview[bot]", "renovate[bot]"):
+    payload = await parse_event(request, GithubPrEvent, ("pull_request",))
+    if payload is None:
+        return JSONResponse(
+            {"pr": {"time": get_current_time(), "status": "ignored", "event": request.headers.get("X-GitHub-Event")}}
+        )
+    action = payload.action
+    user = payload.sender.login
+    pull_request = payload.pull_request
+    repo = payload.repository
+    if is_ignored_sender(user):
         return JSONResponse(
             {
                 "pr": {
-                    "id": pull_request["number"],
+                    "id": pull_request.number,
                     "time": get_current_time(),
                     "status": "ignored",
                     "trigger": {
                         "type": "github",
-                        "repo": repo["full_name"],
-                        "title": pull_request["title"],
+                        "repo": repo.full_name,
+                        "title": pull_request.title,
                         "user": user,
                         "action": action,
                     },
                 }
             }
         )
-    message = f'PR {action} for `{repo["name"]}`: \n \
-     {pull_request["title"]}  \
-     {pull_request["body"]} \
-     {pull_request["url"]}'
-    sms_message = sms.send_message(message)
-    LOGGER.info(f"Github PR {action} for {repo['name']} generated SMS message")
+    message = f"PR {action} for `{repo.name}`: \n \
+     {pull_request.title}  \
+     {pull_request.body} \
+     {pull_request.url}"
+    sms_queue.enqueue(message)
+    LOGGER.info(f"Github PR {action} for {repo.name} queued SMS message")
     return JSONResponse(
         {
             "pr": {
-                "id": pull_request["number"],
+                "id": pull_request.number,
                 "time": get_current_time(),
-                "status": sms_message.status,
+                "status": "queued",
                 "trigger": {
                     "type": "github",
-                    "repo": repo["full_name"],
-                    "title": pull_request["title"],
+                    "repo": repo.full_name,
+                    "title": pull_request.title,
                     "user": user,
                     "action": action,
                 },
             },
             "sms": {
-                "phone_recipient": sms_message.to,
-                "phone_sender": sms_message.from_,
-                "date_sent": sms_message.date_sent,
-                "message": sms_message.body,
+                "phone_recipient": settings.TWILIO_RECIPIENT_PHONE,
+                "phone_sender": settings.TWILIO_SENDER_PHONE,
+                "message": message,
             },
         }
     )
@@ -81,58 +88,62 @@ async def github_pr(request: Request) -> JSONResponse:
     summary="Notify upon Github Issue creation.",
     description="Send SMS and Discord notifications upon Issue creation in HackersAndSlackers Github projects.",
 )
-async def github_issue(request: Request) -> JSONResponse:
+async def github_issue(request: Request, sms_queue: SMSQueue = Depends(get_sms_queue)) -> JSONResponse:
     """
     Send SMS and Discord notifications upon issue creation for HackersAndSlackers Github projects.
 
     :param Request request: Incoming Github payload for newly opened issue.
+    :param SMSQueue sms_queue: Outbound SMS queue.
 
     :returns: JSONResponse
     """
-    payload = await request.json()
-    action = payload.get("action")
-    user = payload["sender"].get("login")
-    issue = payload["issue"]
-    repo = payload["repository"]
-    if user in (settings.GH_USERNAME, "dependabot-preview[bot]", "renovate[bot]"):
+    payload = await parse_event(request, GithubIssueEvent, ("issues",))
+    if payload is None:
+        return JSONResponse(
+            {"issue": {"time": get_current_time(), "status": "ignored", "event": request.headers.get("X-GitHub-Event")}}
+        )
+    action = payload.action
+    user = payload.sender.login
+    issue = payload.issue
+    repo = payload.repository
+    if is_ignored_sender(user):
         return JSONResponse(
             {
                 "issue": {
-                    "id": issue["id"],
+                    "id": issue.id,
                     "time": get_current_time(),
                     "status": "ignored",
                     "trigger": {
                         "type": "github",
-                        "repo": repo["full_name"],
-                        "title": issue["title"],
+                        "repo": repo.full_name,
+                        "title": issue.title,
                         "user": user,
                         "action": action,
                     },
                 }
             }
         )
-    message = f'Issue {action} for repository {repo["name"]}: `{issue["title"]}` \n\n {issue["url"]}'
-    sms_message = sms.send_message(message)
-    LOGGER.info(f"Github issue {action} for {repo['name']} generated SMS message")
+    message = f"Issue {action} for repository {repo.name}: `{issue.title}` \n\n {issue.url}"
+    sms_queue.enqueue(message)
+    LOGGER.info(f"Github issue {action} for {repo.name} queued SMS message")
     return JSONResponse(
         {
             "issue": {
-                "id": issue["id"],
+                "id": issue.id,
                 "time": get_current_time(),
-                "status": sms_message.status,
+                "status": "queued",
                 "trigger": {
                     "type": "github",
-                    "repo": repo["full_name"],
-                    "title": issue["title"],
+                    "repo": repo.full_name,
+                    "title": issue.title,
                     "user": user,
                     "action": action,
                 },
             },
             "sms": {
-                "phone_recipient": sms_message.to,
-                "phone_sender": sms_message.from_,
-                "date_sent": sms_message.date_sent,
-                "message": sms_message.body,
+                "phone_recipient": settings.TWILIO_RECIPIENT_PHONE,
+                "phone_sender": settings.TWILIO_SENDER_PHONE,
+                "message": message,
             },
         }
     )
@@ -0,0 +1,83 @@
+"""Filter, verify & decode Github webhooks without materializing payloads handlers don't read."""
+
+import hashlib
+import hmac
+from typing import Optional, Tuple, Type, TypeVar
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+from config import settings
+
+Event = TypeVar("Event", bound=BaseModel)
+
+
+def accepts_event(request: Request, events: Tuple[str, ...]) -> bool:
+    """
+    Check the `X-GitHub-Event` header before reading the request body.
+
+    Requests without the header (ie: manual tests) are accepted.
+
+    :param Request request: Incoming Github webhook.
+    :param Tuple[str, ...] events: Github event types handled by the endpoint.
+
+    :returns: bool
+    """
+    event = request.headers.get("X-GitHub-Event")
+    return event is None or event in events
+
+
+async def read_signed_body(request: Request) -> bytes:
+    """
+    Read request body in chunks, updating its HMAC digest as chunks arrive.
+
+    Signatures are only verified when `GH_WEBHOOK_SECRET` is set.
+
+    :param Request request: Incoming Github webhook.
+
+    :returns: bytes
+    """
+    body = bytearray()
+    if not settings.GH_WEBHOOK_SECRET:
+        async for chunk in request.stream():
+            body.extend(chunk)
+        return bytes(body)
+    digest = hmac.new(settings.GH_WEBHOOK_SECRET.encode(), digestmod=hashlib.sha256)
+    async for chunk in request.stream():
+        digest.update(chunk)
+        body.extend(chunk)
+    signature = request.headers.get("X-Hub-Signature-256", "")
+    if not hmac.compare_digest(f"sha256={digest.hexdigest()}", signature):
+        raise HTTPException(status_code=401, detail="Invalid Github webhook signature.")
+    return bytes(body)
+
+
+def is_ignored_sender(login: str) -> bool:
+    """
+    Check whether webhooks triggered by Github user should skip notifications.
+
+    :param str login: Github username of webhook sender.
+
+    :returns: bool
+    """
+    return login == settings.GH_USERNAME or login in settings.GH_IGNORED_SENDERS
+
+
+async def parse_event(request: Request, model: Type[Event], events: Tuple[str, ...]) -> Optional[Event]:
+    """
+    Verify & decode Github webhook into `model`, skipping payload fields the model doesn't declare.
+
+    :param Request request: Incoming Github webhook.
+    :param Type[Event] model: Lean schema of the fields read by the endpoint.
+    :param Tuple[str, ...] events: Github event types handled by the endpoint.
+
+    :returns: Optional[Event]
+    """
+    if not accepts_event(request, events):
+        return None
+    body = await read_signed_body(request)
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False)) from e
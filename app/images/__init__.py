@@ -1,16 +1,24 @@
 """Generate optimized images to be served from Google Cloud CDN."""
 
-from typing import Optional
+import asyncio
+from typing import TYPE_CHECKING, Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
 
-from clients import images
+from app.images.cdn_urls import canonicalize_cdn_urls
+from app.jobs.runner import JobContext, job_runner
+from app.moment import get_current_datetime
+from app.routing import WebhookRoute
+from clients import get_images
 from config import settings
-from database.schemas import PostUpdate
+from database.schemas import JobStatus, LeanPostUpdate
 from log import LOGGER
 
-router = APIRouter(prefix="/images", tags=["images"])
+if TYPE_CHECKING:
+    from clients.img import ImageTransformer
+
+router = APIRouter(prefix="/images", tags=["images"], route_class=WebhookRoute)
 
 
 @router.post(
@@ -18,11 +26,14 @@ router = APIRouter(prefix="/images", tags=["images"])
     summary="Optimize single post image.",
     description="Generate retina and mobile feature_image for a single post upon update.",
 )
-async def optimize_post_image(post_update: PostUpdate) -> JSONResponse:
+async def optimize_post_image(
+    post_update: LeanPostUpdate, images: "ImageTransformer" = Depends(get_images)
+) -> JSONResponse:
     """
     Generate retina version of a post's feature image if one doesn't exist.
 
-    :param PostUpdate post_update: Incoming payload for an updated Ghost post.
+    :param LeanPostUpdate post_update: Incoming payload for an updated Ghost post.
+    :param ImageTransformer images: Google Cloud Storage image transformer.
 
     :returns: JSONResponse
     """
@@ -41,12 +52,43 @@ async def optimize_post_image(post_update: PostUpdate) -> JSONResponse:
     return JSONResponse({post.title: "No images exist for optimization"})
 
 
+@job_runner.task("images.transform")
+def transform_images(job: JobContext, directory: Optional[str] = None) -> dict:
+    """
+    Purge unwanted images, then generate retina & mobile varieties of images within a CDN directory.
+
+    :param JobContext job: Handle for reporting progress.
+    :param Optional[str] directory: Remote directory to transform; defaults to the current month's uploads.
+
+    :returns: dict
+    """
+    if directory is None:
+        directory = get_current_datetime().strftime("%Y/%m")
+    images = get_images()
+    steps = {
+        "purged": images.purge_unwanted_images,
+        "retina": images.retina_transformations,
+        "mobile": images.mobile_transformations,
+        # "standard": images.standard_transformations,
+    }
+    transformed_images = {}
+    for completed, (name, transform) in enumerate(steps.items()):
+        job.progress(completed, len(steps), f"Applying `{name}` transformations to `{directory}`")
+        transformed_images[name] = transform(directory)
+    job.progress(len(steps), len(steps))
+    LOGGER.success(f"Transformed {', '.join(f'{len(v or [])} {k}' for k, v in transformed_images.items())} images")
+    return transformed_images
+
+
 @router.get(
     "/",
     summary="Batch optimize CDN images.",
-    description="Generates retina and mobile varieties of post feature_images. \
+    description="Queues a job generating retina and mobile varieties of post feature_images. \
             Defaults to images uploaded within the current month; \
-            accepts a `?directory=` parameter which accepts a path to recursively optimize images on the given CDN.",
+            accepts a `?directory=` parameter which accepts a path to recursively optimize images on the given CDN. \
+            Poll `/jobs/{id}/` for results.",
+    response_model=JobStatus,
+    status_code=202,
 )
 async def bulk_transform_images(
     directory: Optional[str] = Query(
@@ -54,44 +96,70 @@ async def bulk_transform_images(
         title="directory",
         description="Subdirectory of remote CDN to transverse and transform images.",
         max_length=50,
-    )
-) -> JSONResponse:
+    ),
+):
     """
-    Apply transformations to images uploaded within the current month.
+    Queue job applying transformations to images uploaded within the current month.
     Optionally accepts a `directory` parameter to override image directory.
 
     :param Optional[str] directory: Remote directory to recursively fetch images and apply transformations.
+    """
+    if directory is None:
+        directory = settings.GCP_BUCKET_FOLDER
+    return await asyncio.to_thread(job_runner.submit, "images.transform", directory=directory)
 
-    :returns: JSONResponse
+
+@job_runner.task("images.cdn_urls")
+def rewrite_cdn_urls(job: JobContext, dry_run: bool = False) -> dict:
     """
-    try:
-        if directory is None:
-            directory = settings.GCP_BUCKET_FOLDER
-        transformed_images = {
-            "purged": images.purge_unwanted_images(directory),
-            "retina": images.retina_transformations(directory),
-            "mobile": images.mobile_transformations(directory),
-            # "standard": gcs.standard_transformations(directory),
-        }
-        response = []
-        for k, v in transformed_images.items():
-            if v is not None:
-                response.append(f"{len(v)} {k}")
-            else:
-                response.append(f"0 {k}")
-        LOGGER.success(f"Transformed {', '.join(response)} images")
-        return JSONResponse(transformed_images)
-    except Exception as e:
-        LOGGER.error(f"Unexpected exception raised when transforming images: {e}")
-        return JSONResponse(e, status_code=500)
+    Rewrite legacy image URLs in the Ghost database to CDN URLs, one `UPDATE` per table.
+
+    :param JobContext job: Handle for reporting progress.
+    :param bool dry_run: Flag to only count rows which would be rewritten.
+
+    :returns: dict
+    """
+    results = canonicalize_cdn_urls(dry_run=dry_run, progress=job.progress)
+    failed = [table for table, counts in results.items() if counts is None]
+    if failed:
+        raise RuntimeError(f"Failed to rewrite CDN URLs in tables: {', '.join(failed)}")
+    job.progress(len(results), len(results))
+    return results
+
+
+@router.get(
+    "/cdn/",
+    summary="Rewrite legacy image URLs to the CDN.",
+    description="Queue a job rewriting legacy storage URLs of images in posts, tags, authors & settings to CDN URLs, \
+            as configured by `CDN_URL_REWRITES`. Reports rewritten rows per table & column; \
+            pass `?dry_run=true` to only count them. Poll `/jobs/{id}/` for results.",
+    response_model=JobStatus,
+    status_code=202,
+)
+async def bulk_rewrite_cdn_urls(
+    dry_run: bool = Query(
+        default=False,
+        title="dry_run",
+        description="Count rows with legacy image URLs without rewriting them.",
+    ),
+):
+    """
+    Queue job rewriting legacy image URLs to CDN URLs.
+
+    :param bool dry_run: Flag to only count rows which would be rewritten.
+    """
+    return await asyncio.to_thread(job_runner.submit, "images.cdn_urls", dry_run=dry_run)
 
 
 @router.get("/sort/")
-async def bulk_organize_images(directory: Optional[str] = None) -> JSONResponse:
+async def bulk_organize_images(
+    directory: Optional[str] = None, images: "ImageTransformer" = Depends(get_images)
+) -> JSONResponse:
     """
     Sort retina and mobile images into their appropriate directories.
 
     :param Optional[str] directory: Remote directory to organize images into subdirectories.
+    :param ImageTransformer images: Google Cloud Storage image transformer.
 
     :returns: JSONResponse
     """
@@ -0,0 +1,36 @@
+"""Point image URLs stored in the Ghost database at the CDN."""
+
+from typing import Callable, Dict, List, Optional
+
+from config import settings
+from database import ghost_db
+from log import LOGGER
+
+
+def canonicalize_cdn_urls(
+    tables: Optional[List[str]] = None,
+    dry_run=False,
+    progress: Optional[Callable[[int, int, str], None]] = None,
+) -> Dict[str, Optional[Dict[str, int]]]:
+    """
+    Rewrite legacy image URL prefixes (`CDN_URL_REWRITES`) in each table of `CDN_URL_COLUMNS` with one `UPDATE`.
+
+    :param Optional[List[str]] tables: Subset of tables to rewrite; rewrites all configured tables if unset.
+    :param bool dry_run: Flag to only count rows which would be rewritten.
+    :param Optional[Callable[[int, int, str], None]] progress: Callback receiving tables completed, total & message.
+
+    :returns: Dict[str, Optional[Dict[str, int]]]
+    """
+    columns = {
+        table: table_columns
+        for table, table_columns in settings.CDN_URL_COLUMNS.items()
+        if tables is None or table in tables
+    }
+    results = {}
+    for completed, (table, table_columns) in enumerate(columns.items()):
+        if progress is not None:
+            progress(completed, len(columns), f"Rewriting CDN URLs in `{table}`")
+        results[table] = ghost_db.rewrite_urls(table, table_columns, settings.CDN_URL_REWRITES, dry_run=dry_run)
+    rewritten = sum(sum(counts.values()) for counts in results.values() if counts)
+    LOGGER.success(f"{'Found' if dry_run else 'Rewrote'} {rewritten} legacy CDN URLs across {len(results)} tables.")
+    return results
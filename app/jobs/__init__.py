@@ -0,0 +1,28 @@
+"""Poll status of background jobs."""
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException
+
+from app.jobs.runner import job_runner
+from database.schemas import JobStatus
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get(
+    "/{job_id}/",
+    summary="Get job status.",
+    description="Poll progress of a background job; `result` is populated once the job has succeeded.",
+    response_model=JobStatus,
+)
+async def get_job(job_id: str):
+    """
+    Fetch status, progress & result of a background job.
+
+    :param str job_id: Unique ID of job returned upon submission.
+    """
+    job = await asyncio.to_thread(job_runner.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job `{job_id}` not found.")
+    return job
@@ -0,0 +1,308 @@
+"""Run long maintenance work in a worker pool, tracking progress & results in the features database."""
+
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.moment import get_current_datetime
+from config import settings
+from database import SessionLocal, engine
+from database.locks import advisory_lock
+from database.models import Job, ScheduledRun
+from log import LOGGER
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+ACTIVE = (QUEUED, RUNNING)
+
+
+def job_status(job: Job) -> Dict[str, Any]:
+    """
+    Serialize job row into a status response.
+
+    :param Job job: Job row.
+
+    :returns: Dict[str, Any]
+    """
+    return {
+        "id": job.id,
+        "name": job.name,
+        "params": json.loads(job.params) if job.params else {},
+        "status": job.status,
+        "progress": job.progress,
+        "total": job.total,
+        "message": job.message,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+class JobContext:
+    """Handle passed to running jobs for reporting progress."""
+
+    def __init__(self, job_id: str):
+        """
+        Job context constructor.
+
+        :param str job_id: Unique ID of running job.
+        """
+        self.job_id = job_id
+
+    def progress(self, completed: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+        """
+        Record progress of running job.
+
+        :param int completed: Number of steps completed.
+        :param Optional[int] total: Total number of steps, if known.
+        :param Optional[str] message: Short description of current step.
+        """
+        values = {"progress": completed, "updated_at": get_current_datetime()}
+        if total is not None:
+            values["total"] = total
+        if message is not None:
+            values["message"] = message[:255]
+        try:
+            with SessionLocal() as db:
+                db.query(Job).filter(Job.id == self.job_id).update(values)
+                db.commit()
+        except SQLAlchemyError as e:
+            LOGGER.warning(f"Failed to record progress for job `{self.job_id}`: {e}")
+
+
+class JobRunner:
+    """
+    Submit registered tasks to a bounded worker pool, deduplicating identical submissions.
+
+    Each job holds an advisory lock named after it while running, so a job is never run by two API workers at once;
+    heavy jobs additionally share a single lock so only one of them runs at a time across all workers.
+    """
+
+    def __init__(self, max_workers: int, stale_after: int, heavy: List[str] = (), heavy_lock_timeout: int = 0):
+        """
+        Job runner constructor.
+
+        :param int max_workers: Number of jobs which may run concurrently in this process.
+        :param int stale_after: Seconds without progress after which an active job is presumed abandoned.
+        :param List[str] heavy: Names of jobs contending on MySQL & GCS which must not run concurrently.
+        :param int heavy_lock_timeout: Seconds a heavy job waits for other heavy jobs to finish before being skipped.
+        """
+        self.max_workers = max_workers
+        self.stale_after = stale_after
+        self.heavy = set(heavy)
+        self.heavy_lock_timeout = heavy_lock_timeout
+        self.tasks: Dict[str, Callable[..., Any]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Tuple[str, Future]] = {}
+        self._lock = Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Worker pool, created on first submission."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        return self._executor
+
+    def task(self, name: str) -> Callable:
+        """
+        Register a function as a job; it is called with a `JobContext` followed by job parameters.
+
+        :param str name: Unique name of job (ie: `images.transform`).
+
+        :returns: Callable
+        """
+
+        def register(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.tasks[name] = func
+            return func
+
+        return register
+
+    def submit(self, name: str, **params) -> Dict[str, Any]:
+        """
+        Queue a job, or return the active job with the same name & parameters if one exists.
+
+        :param str name: Name of registered job.
+        :param params: JSON-serializable keyword arguments passed to the job.
+
+        :returns: Dict[str, Any]
+        """
+        if name not in self.tasks:
+            raise KeyError(f"No job registered as `{name}`")
+        encoded_params = json.dumps(params, sort_keys=True, default=str)
+        key = f"{name}:{encoded_params}"[:255]
+        now = get_current_datetime()
+        with self._lock, SessionLocal() as db:
+            active_job = (
+                db.query(Job)
+                .filter(
+                    Job.key == key,
+                    Job.status.in_(ACTIVE),
+                    Job.updated_at >= now - timedelta(seconds=self.stale_after),
+                )
+                .order_by(Job.created_at.desc())
+                .first()
+            )
+            if active_job is not None:
+                LOGGER.info(f"Job `{name}` already {active_job.status} as `{active_job.id}`; skipping submission.")
+                return job_status(active_job)
+            job = Job(
+                id=str(uuid4()),
+                name=name,
+                key=key,
+                params=encoded_params,
+                status=QUEUED,
+                progress=0,
+                created_at=now,
+                updated_at=now,
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            status = job_status(job)
+        job_id = status["id"]
+        future = self.executor.submit(self._run, job_id, name, params)
+        self._pending[job_id] = (name, future)
+        future.add_done_callback(lambda _: self._pending.pop(job_id, None))
+        LOGGER.info(f"Queued job `{name}` as `{status['id']}`.")
+        return status
+
+    def _run(self, job_id: str, name: str, params: dict) -> None:
+        """
+        Execute job in a worker thread & store its outcome.
+
+        :param str job_id: Unique ID of job.
+        :param str name: Name of registered job.
+        :param dict params: Keyword arguments passed to the job.
+        """
+        try:
+            with ExitStack() as locks:
+                if not locks.enter_context(advisory_lock(engine, f"job:{name}")):
+                    self._skip(job_id, name, f"`{name}` is already running in another worker.")
+                    return
+                if name in self.heavy and not locks.enter_context(
+                    advisory_lock(engine, "job:heavy", self.heavy_lock_timeout)
+                ):
+                    self._skip(job_id, name, "Another heavy job is still running.")
+                    return
+                self._update(job_id, status=RUNNING, started_at=get_current_datetime())
+                result = self.tasks[name](JobContext(job_id), **params)
+        except Exception as e:
+            LOGGER.error(f"Job `{name}` ({job_id}) failed: {e}")
+            self._update(job_id, status=FAILED, error=str(e), finished_at=get_current_datetime())
+            return
+        self._update(
+            job_id,
+            status=SUCCEEDED,
+            result=json.dumps(result, default=str),
+            finished_at=get_current_datetime(),
+        )
+        LOGGER.success(f"Job `{name}` ({job_id}) succeeded.")
+
+    def _skip(self, job_id: str, name: str, reason: str) -> None:
+        """
+        Mark job as skipped without running it.
+
+        :param str job_id: Unique ID of job.
+        :param str name: Name of registered job.
+        :param str reason: Why the job was skipped.
+        """
+        LOGGER.warning(f"Skipped job `{name}` ({job_id}): {reason}")
+        self._update(job_id, status=SKIPPED, message=reason, finished_at=get_current_datetime())
+
+    @staticmethod
+    def _update(job_id: str, **values) -> None:
+        """
+        Update job row.
+
+        :param str job_id: Unique ID of job.
+        :param values: Column values to set.
+        """
+        try:
+            with SessionLocal() as db:
+                db.query(Job).filter(Job.id == job_id).update({**values, "updated_at": get_current_datetime()})
+                db.commit()
+        except SQLAlchemyError as e:
+            LOGGER.error(f"Failed to update job `{job_id}`: {e}")
+
+    @staticmethod
+    def get(job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch status of a job.
+
+        :param str job_id: Unique ID of job.
+
+        :returns: Optional[Dict[str, Any]]
+        """
+        with SessionLocal() as db:
+            job = db.get(Job, job_id)
+            return job_status(job) if job is not None else None
+
+    @staticmethod
+    def last_succeeded(name: str) -> Optional[datetime]:
+        """
+        Fetch start time of the most recent successful run of a job, for resuming incremental work.
+
+        :param str name: Name of registered job.
+
+        :returns: Optional[datetime]
+        """
+        with SessionLocal() as db:
+            job = (
+                db.query(Job).filter(Job.name == name, Job.status == SUCCEEDED).order_by(Job.started_at.desc()).first()
+            )
+            return job.started_at if job is not None else None
+
+    @staticmethod
+    def claim(name: str, run_at: datetime) -> bool:
+        """
+        Claim a scheduled run of a job, so only the first worker to reach it submits the job.
+
+        Claims more than a day older than the run are pruned.
+
+        :param str name: Name of registered job.
+        :param datetime run_at: Time the run was scheduled for.
+
+        :raises SQLAlchemyError: If the database can't be reached.
+
+        :returns: bool
+        """
+        try:
+            with SessionLocal() as db:
+                db.add(ScheduledRun(name=name, run_at=run_at, claimed_at=get_current_datetime()))
+                db.query(ScheduledRun).filter(
+                    ScheduledRun.name == name, ScheduledRun.run_at < run_at - timedelta(days=1)
+                ).delete()
+                db.commit()
+            return True
+        except IntegrityError:
+            return False
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs; running jobs finish in the background & jobs which never started are skipped."""
+        if self._executor is not None:
+            pending = list(self._pending.items())
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            for job_id, (name, future) in pending:
+                if future.cancelled():
+                    self._skip(job_id, name, "Server shut down before the job started.")
+
+
+job_runner = JobRunner(
+    max_workers=settings.JOBS_MAX_WORKERS,
+    stale_after=settings.JOBS_STALE_AFTER,
+    heavy=settings.JOBS_HEAVY,
+    heavy_lock_timeout=settings.JOBS_HEAVY_LOCK_TIMEOUT,
+)
@@ -0,0 +1,181 @@
+"""Submit recurring maintenance jobs on cron schedules defined in settings."""
+
+import asyncio
+from datetime import datetime, timedelta
+from random import uniform
+from typing import Dict, Optional, Set
+
+from app.jobs.runner import job_runner
+from app.moment import get_current_datetime
+from config import settings
+from log import LOGGER
+
+CRON_FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),
+)
+
+
+def parse_cron_field(field: str, low: int, high: int) -> Set[int]:
+    """
+    Expand a single cron field (ie: `*/15`, `1-5`, `0,30`) into the values it matches.
+
+    :param str field: Cron field.
+    :param int low: Smallest value allowed in field.
+    :param int high: Largest value allowed in field.
+
+    :returns: Set[int]
+    """
+    values = set()
+    for part in field.split(","):
+        value_range, _, step = part.partition("/")
+        if value_range == "*":
+            start, end = low, high
+        elif "-" in value_range:
+            start, end = (int(bound) for bound in value_range.split("-"))
+        else:
+            start = end = int(value_range)
+            if step:
+                end = high
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field `{field}` must be within {low}-{high}")
+        values.update(range(start, end + 1, int(step or 1)))
+    return values
+
+
+class CronSchedule:
+    """Five-field cron expression (`minute hour day month weekday`, Sunday = 0)."""
+
+    def __init__(self, expression: str):
+        """
+        Cron schedule constructor.
+
+        :param str expression: Cron expression (ie: `0 */6 * * *`).
+        """
+        fields = expression.split()
+        if len(fields) != len(CRON_FIELDS):
+            raise ValueError(f"Cron expression `{expression}` must have {len(CRON_FIELDS)} fields")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            parse_cron_field(field, low, high) for field, (_, low, high) in zip(fields, CRON_FIELDS)
+        )
+        # Like cron, restricting both day of month & weekday matches either
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def _matches_day(self, moment: datetime) -> bool:
+        """
+        Check whether a date satisfies the day of month & weekday fields.
+
+        :param datetime moment: Date to check.
+
+        :returns: bool
+        """
+        day_matches = moment.day in self.days
+        weekday_matches = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_matches and weekday_matches
+        return day_matches or weekday_matches
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Find the first minute after `moment` matching the schedule.
+
+        :param datetime moment: Time to search forward from.
+
+        :returns: datetime
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._matches_day(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression `{self.expression}` never matches")
+
+
+class Scheduler:
+    """
+    Submit jobs to the job runner when their schedules come due, after a random delay.
+
+    Every API worker runs a scheduler; each run is claimed in the database, so only one worker submits it.
+    """
+
+    def __init__(self, schedules: Dict[str, str], jitter: int):
+        """
+        Scheduler constructor.
+
+        :param Dict[str, str] schedules: Map of registered job names -> cron expressions.
+        :param int jitter: Maximum seconds to delay each run by, so workers don't all race to claim it at once.
+        """
+        self.schedules = {name: CronSchedule(expression) for name, expression in schedules.items()}
+        self.jitter = jitter
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def due(self, now: datetime) -> Dict[str, datetime]:
+        """
+        Next run time of every scheduled job.
+
+        :param datetime now: Current time.
+
+        :returns: Dict[str, datetime]
+        """
+        return {name: schedule.next_after(now) for name, schedule in self.schedules.items()}
+
+    async def _submit(self, name: str, run_at: datetime) -> None:
+        """
+        Submit scheduled job after a random delay, unless another worker already claimed the run.
+
+        :param str name: Name of registered job.
+        :param datetime run_at: Time the run was scheduled for.
+        """
+        await asyncio.sleep(uniform(0, self.jitter))
+        try:
+            if not await asyncio.to_thread(job_runner.claim, name, run_at):
+                LOGGER.info(f"Scheduled run of `{name}` at {run_at} was claimed by another worker.")
+                return
+            job = await asyncio.to_thread(job_runner.submit, name)
+            LOGGER.info(f"Scheduled job `{name}` is {job['status']} ({job['id']}).")
+        except Exception as e:
+            LOGGER.error(f"Failed to submit scheduled job `{name}`: {e}")
+
+    async def _run(self) -> None:
+        """Sleep until the next job is due, submit every job due at that time & repeat."""
+        next_runs = self.due(get_current_datetime())
+        while True:
+            run_at = min(next_runs.values())
+            await asyncio.sleep(max((run_at - get_current_datetime()).total_seconds(), 0))
+            for name, due in [(name, due) for name, due in next_runs.items() if due <= run_at]:
+                task = asyncio.create_task(self._submit(name, due))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+                next_runs[name] = self.schedules[name].next_after(run_at)
+
+    def start(self) -> None:
+        """Start scheduling jobs on the running event loop."""
+        for name in [name for name in self.schedules if name not in job_runner.tasks]:
+            LOGGER.error(f"Cannot schedule `{name}`: no job registered with that name.")
+            del self.schedules[name]
+        if self.schedules and self._task is None:
+            LOGGER.info(f"Scheduling jobs: {', '.join(f'{n} ({s.expression})' for n, s in self.schedules.items())}")
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop scheduling jobs, including runs waiting out their jitter."""
+        tasks = [task for task in (self._task, *self._pending) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+
+scheduler = Scheduler(settings.JOBS_SCHEDULE, settings.JOBS_SCHEDULE_JITTER)
@@ -0,0 +1,19 @@
+"""Pytest fixtures for background jobs."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.jobs import runner
+from database import Base
+from database.models import Job, ScheduledRun
+
+
+@pytest.fixture
+def job_db(tmp_path, monkeypatch):
+    """Store jobs in a file-backed SQLite database, giving each worker thread its own connection."""
+    engine = create_engine(f"sqlite:///{tmp_path}/features.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__, ScheduledRun.__table__])
+    monkeypatch.setattr(runner, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(runner, "engine", engine)
+    return engine
@@ -0,0 +1,101 @@
+"""Test background job submission, deduplication & progress tracking."""
+
+from threading import Event
+
+from app.jobs import runner
+
+
+def test_job_runner(job_db):
+    """Test identical submissions share a job, and progress & results are stored once the job finishes."""
+    job_runner = runner.JobRunner(max_workers=1, stale_after=60)
+    progressed, release = Event(), Event()
+
+    @job_runner.task("test.count")
+    def count(job: runner.JobContext, directory: str) -> dict:
+        job.progress(1, 2, "Counting")
+        progressed.set()
+        release.wait(5)
+        return {"directory": directory, "count": 2}
+
+    assert job_runner.last_succeeded("test.count") is None
+    first = job_runner.submit("test.count", directory="2024/08")
+    progressed.wait(5)
+    duplicate = job_runner.submit("test.count", directory="2024/08")
+    other = job_runner.submit("test.count", directory="2024/09")
+    assert first["status"] == runner.QUEUED
+    assert duplicate["id"] == first["id"]
+    assert other["id"] != first["id"]
+
+    release.set()
+    job_runner.executor.shutdown(wait=True)
+    finished = job_runner.get(first["id"])
+    assert finished["status"] == runner.SUCCEEDED
+    assert finished["progress"] == 1 and finished["total"] == 2
+    assert finished["result"] == {"directory": "2024/08", "count": 2}
+    assert job_runner.last_succeeded("test.count") is not None
+    assert job_runner.get("missing") is None
+
+
+def test_failed_job(job_db):
+    """Test exceptions raised by jobs are stored rather than propagated."""
+    job_runner = runner.JobRunner(max_workers=1, stale_after=60)
+
+    @job_runner.task("test.fail")
+    def fail(job: runner.JobContext):
+        raise RuntimeError("Boom")
+
+    job_id = job_runner.submit("test.fail")["id"]
+    job_runner.executor.shutdown(wait=True)
+    failed = job_runner.get(job_id)
+    assert failed["status"] == runner.FAILED
+    assert failed["error"] == "Boom"
+
+
+def test_heavy_jobs_skip_while_another_runs(job_db):
+    """Test a heavy job is skipped rather than run alongside another heavy job."""
+    job_runner = runner.JobRunner(max_workers=2, stale_after=60, heavy=["test.first", "test.second"])
+    started, release = Event(), Event()
+
+    @job_runner.task("test.first")
+    def first(job: runner.JobContext):
+        started.set()
+        release.wait(5)
+
+    @job_runner.task("test.second")
+    def second(job: runner.JobContext):
+        return None
+
+    first_id = job_runner.submit("test.first")["id"]
+    started.wait(5)
+    second_id = job_runner.submit("test.second")["id"]
+    for _ in range(500):
+        if job_runner.get(second_id)["status"] != runner.QUEUED:
+            break
+        release.wait(0.01)
+    release.set()
+    job_runner.executor.shutdown(wait=True)
+    assert job_runner.get(first_id)["status"] == runner.SUCCEEDED
+    assert job_runner.get(second_id)["status"] == runner.SKIPPED
+
+
+def test_shutdown_skips_queued_jobs(job_db):
+    """Test jobs still queued when the server shuts down are marked skipped rather than left queued."""
+    job_runner = runner.JobRunner(max_workers=1, stale_after=60)
+    started, release = Event(), Event()
+
+    @job_runner.task("test.block")
+    def block(job: runner.JobContext, n: int):
+        started.set()
+        release.wait(5)
+
+    running_id = job_runner.submit("test.block", n=1)["id"]
+    started.wait(5)
+    queued_id = job_runner.submit("test.block", n=2)["id"]
+    executor = job_runner.executor
+    job_runner.shutdown()
+    release.set()
+    executor.shutdown(wait=True)
+    assert job_runner.get(running_id)["status"] == runner.SUCCEEDED
+    skipped = job_runner.get(queued_id)
+    assert skipped["status"] == runner.SKIPPED
+    assert skipped["message"] == "Server shut down before the job started."
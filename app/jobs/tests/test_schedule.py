@@ -0,0 +1,62 @@
+"""Test cron schedules, claims & advisory locks used by scheduled jobs."""
+
+import asyncio
+from datetime import datetime, timedelta
+from time import sleep
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.jobs import runner, schedule
+from app.jobs.schedule import CronSchedule
+from database.locks import advisory_lock
+
+
+def test_cron_schedule_next_run():
+    """Test next run times for step, range & weekday expressions."""
+    assert CronSchedule("*/15 * * * *").next_after(datetime(2024, 8, 1, 6, 7, 30)) == datetime(2024, 8, 1, 6, 15)
+    assert CronSchedule("0 3 * * *").next_after(datetime(2024, 8, 1, 3, 0)) == datetime(2024, 8, 2, 3, 0)
+    assert CronSchedule("30 2 * * 0").next_after(datetime(2024, 8, 1)) == datetime(2024, 8, 4, 2, 30)
+    assert CronSchedule("0 0 1 1-3 *").next_after(datetime(2024, 8, 1)) == datetime(2025, 1, 1)
+    with pytest.raises(ValueError):
+        CronSchedule("0 25 * * *")
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_after(datetime(2024, 8, 1))
+
+
+def test_advisory_lock_is_exclusive():
+    """Test a held lock can't be acquired again until released."""
+    engine = create_engine("sqlite://")
+    with advisory_lock(engine, "job:test") as acquired:
+        assert acquired
+        with advisory_lock(engine, "job:test") as reacquired:
+            assert not reacquired
+    with advisory_lock(engine, "job:test") as acquired:
+        assert acquired
+
+
+def test_scheduled_run_is_submitted_once_across_workers(job_db, monkeypatch):
+    """Test workers sharing a schedule submit each run once, even when the job finishes before others wake up."""
+    job_runner = runner.JobRunner(max_workers=2, stale_after=60)
+    runs = []
+
+    @job_runner.task("test.sweep")
+    def sweep(job: runner.JobContext):
+        runs.append(job.job_id)
+
+    monkeypatch.setattr(schedule, "job_runner", job_runner)
+    workers = [schedule.Scheduler({"test.sweep": "*/15 * * * *"}, jitter=0) for _ in range(2)]
+    run_at = datetime(2024, 8, 1, 6, 15)
+
+    async def fire_together():
+        await asyncio.gather(*(worker._submit("test.sweep", run_at) for worker in workers))
+
+    asyncio.run(fire_together())
+    for _ in range(500):
+        if runs:
+            break
+        sleep(0.01)
+    asyncio.run(workers[1]._submit("test.sweep", run_at))
+    asyncio.run(workers[1]._submit("test.sweep", run_at + timedelta(minutes=15)))
+    job_runner.executor.shutdown(wait=True)
+    assert len(runs) == 2
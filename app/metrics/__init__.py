@@ -0,0 +1,24 @@
+"""Expose API & outbound call metrics to Prometheus."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from metrics import render_metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get(
+    "/",
+    summary="Prometheus metrics.",
+    description="Per-route latency histograms & outbound call counts, latency, status codes and bytes per service.",
+    response_class=PlainTextResponse,
+)
+async def prometheus_metrics() -> PlainTextResponse:
+    """
+    Render metrics in Prometheus text exposition format.
+
+    :returns: PlainTextResponse
+    """
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -1,8 +1,13 @@
 """Manage Ghost Newsletter subscriptions."""
 
-from fastapi import APIRouter, HTTPException
+from typing import List
 
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.newsletter.mixpanel import create_mixpanel_record
 from app.newsletter.newsletter import welcome_newsletter_subscriber
+from clients import get_welcome_queue
+from clients.mail_queue import BatchMailQueue
 from database.schemas import GhostMember, GhostSubscriber
 from log import LOGGER
 
@@ -15,17 +20,21 @@ router = APIRouter(prefix="/newsletter", tags=["newsletter"])
     description="Create free-tier Ghost membership for Netlify user account upon signup.",
     response_model=GhostSubscriber,
 )
-async def new_ghost_member(subscriber: GhostSubscriber) -> GhostSubscriber:
+async def new_ghost_member(
+    subscriber: GhostSubscriber, welcome_queue: BatchMailQueue = Depends(get_welcome_queue)
+) -> GhostSubscriber:
     """
     Welcome new Ghost subscriber & add analytics.
 
     :param GhostSubscriber subscriber: Ghost newsletter subscriber with updated info.
+    :param BatchMailQueue welcome_queue: Outbound welcome email queue.
 
     :returns: GhostSubscriber
     """
     try:
         current_member = subscriber.current
-        welcome_newsletter_subscriber(current_member)
+        welcome_newsletter_subscriber(current_member, welcome_queue)
+        create_mixpanel_record(current_member)
         return subscriber
     except Exception as e:
         raise HTTPException(
@@ -34,6 +43,29 @@ async def new_ghost_member(subscriber: GhostSubscriber) -> GhostSubscriber:
         )
 
 
+@router.post(
+    "/import/",
+    summary="Welcome imported Ghost members.",
+    description="Queue welcome emails for many newly imported Ghost members, sent in Mailgun batches.",
+)
+async def welcome_imported_members(
+    members: List[GhostMember], welcome_queue: BatchMailQueue = Depends(get_welcome_queue)
+) -> dict:
+    """
+    Queue welcome emails for imported Ghost members.
+
+    :param List[GhostMember] members: Newly imported Ghost members.
+    :param BatchMailQueue welcome_queue: Outbound welcome email queue.
+
+    :returns: dict
+    """
+    for member in members:
+        welcome_newsletter_subscriber(member, welcome_queue)
+        create_mixpanel_record(member)
+    LOGGER.info(f"Queued welcome emails for {len(members)} imported members.")
+    return {"queued": len(members)}
+
+
 @router.delete(
     "/",
     summary="Delete Ghost Member.",
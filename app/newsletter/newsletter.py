@@ -1,37 +1,22 @@
 """Welcome newsletter subscribers ."""
 
-from typing import Optional
-
-from clients import mailgun
+from clients.mail_queue import BatchMailQueue
 from config import settings
 from database.schemas import GhostMember, SubscriptionWelcomeEmail
-from log import LOGGER
 
 
-def welcome_newsletter_subscriber(
-    subscriber: GhostMember,
-) -> Optional[SubscriptionWelcomeEmail]:
+def welcome_newsletter_subscriber(subscriber: GhostMember, welcome_queue: BatchMailQueue) -> SubscriptionWelcomeEmail:
     """
-    Send welcome email to newsletter subscriber.
+    Queue welcome email to newsletter subscriber, to be sent with other recent subscribers in a Mailgun batch.
 
-    :param Member subscriber: New Ghost member with newsletter subscription.
+    :param GhostMember subscriber: New Ghost member with newsletter subscription.
+    :param BatchMailQueue welcome_queue: Outbound welcome email queue.
 
-    :returns: Optional[SubscriptionWelcomeEmail]
+    :returns: SubscriptionWelcomeEmail
     """
-    body = {
-        "from": settings.MAILGUN_FROM_SENDER,
-        "to": [subscriber.email],
-        "subject": settings.MAILGUN_SUBJECT_LINE,
-        "template": settings.MAILGUN_NEWSLETTER_TEMPLATE,
-        "h:X-Mailgun-Variables": {"name": subscriber.name},
-        "o:tracking": True,
-    }
-    response = mailgun.send_email(body)
-    if response.status_code != 200:
-        LOGGER.error(f"Mailgun failed to send welcome email: {body}")
-        return None
+    welcome_queue.enqueue(subscriber.email, {"name": subscriber.name or ""})
     return SubscriptionWelcomeEmail(
-        from_email=settings.MAILGUN_PERSONAL_EMAIL,
+        from_email=settings.MAILGUN_FROM_SENDER,
         to_email=subscriber.email,
         subject=settings.MAILGUN_SUBJECT_LINE,
         template=settings.MAILGUN_NEWSLETTER_TEMPLATE,
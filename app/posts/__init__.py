@@ -1,20 +1,30 @@
 """Enrich post metadata."""
 
+import asyncio
+import json
 from datetime import datetime, timedelta
-from time import sleep
+from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from fastapi.exceptions import HTTPException
 from fastapi.responses import JSONResponse
 
+from app.analytics.slugs import slug_resolver
+from app.images.cdn_urls import canonicalize_cdn_urls
+from app.jobs.runner import JobContext, job_runner
 from app.moment import get_current_datetime, get_current_time
-from app.posts.metadata import optimize_posts_metadata
-from app.posts.update import update_html_ssl_urls, update_metadata_images
-from clients import ghost
-from database.schemas import PostBulkUpdate, PostUpdate
+from app.posts.alt_text import backfill_image_alt, fill_document_alt
+from app.posts.metadata import insert_posts_metadata, update_posts_metadata
+from app.posts.secure_links import backfill_secure_links, secure_document, secure_html
+from app.posts.update import update_metadata_images
+from app.routing import WebhookRoute
+from clients import get_ghost
+from clients.ghost import Ghost
+from database.read_sql import collect_sql_queries
+from database.schemas import JobStatus, LeanPostContentUpdate
 from log import LOGGER
 
-router = APIRouter(prefix="/posts", tags=["posts"])
+router = APIRouter(prefix="/posts", tags=["posts"], route_class=WebhookRoute)
 
 
 @router.post(
@@ -22,20 +32,21 @@ router = APIRouter(prefix="/posts", tags=["posts"])
     summary="Optimize post metadata.",
     description="Performs multiple actions to optimize post SEO. \
                 Generates meta tags, ensures SSL hyperlinks, and populates missing <img /> `alt` attributes.",
-    response_model=PostUpdate,
 )
-async def update_post(post_update: PostUpdate) -> JSONResponse:
+async def update_post(post_update: LeanPostContentUpdate, ghost: Ghost = Depends(get_ghost)) -> JSONResponse:
     """
     Enrich post metadata upon update.
 
-    :param PostUpdate post_update: Request to update Ghost post.
+    :param LeanPostContentUpdate post_update: Request to update Ghost post.
+    :param Ghost ghost: Ghost admin client.
 
     :returns: JSONResponse
     """
     previous_update = post_update.post.previous
-    if previous_update:
+    slug_resolver.invalidate(post_update.post.current.slug, previous_update.slug if previous_update else None)
+    if previous_update and previous_update.updated_at:
         current_time = get_current_datetime()
-        previous_update_date = datetime.strptime(str(previous_update.updated_at), "%Y-%m-%dT%H:%M:%S.000Z")
+        previous_update_date = datetime.strptime(previous_update.updated_at, "%Y-%m-%dT%H:%M:%S.000Z")
         if previous_update_date and current_time - previous_update_date < timedelta(seconds=5):
             LOGGER.warning("Post update ignored (post was recently updated).")
             raise HTTPException(status_code=422, detail="Post update ignored (post was recently updated).")
@@ -56,46 +67,148 @@ async def update_post(post_update: PostUpdate) -> JSONResponse:
             }
         ]
     }
+    secured = set()
     if html and "http://" in html:
-        body = update_html_ssl_urls(html, body, slug)
+        secure = secure_html(html, secured)
+        if secure != html:
+            body["posts"][0]["html"] = secure
     if feature_image is not None:
         body = update_metadata_images(feature_image, body, slug)
-    sleep(1)
+    if post.mobiledoc:
+        # Parse mobiledoc once to both secure links & fill missing image `alt` text
+        try:
+            document = json.loads(post.mobiledoc)
+            if secure_document(document, secured) + fill_document_alt(document):
+                body["posts"][0]["mobiledoc"] = json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+        except ValueError as e:
+            LOGGER.warning(f"Failed to parse mobiledoc of post `{slug}`: {e}")
+    if secured:
+        LOGGER.info(f"Replaced {len(secured)} insecure URLs in post `{slug}`")
+    await asyncio.sleep(1)
     time = get_current_time()
     body["posts"][0]["updated_at"] = time
-    response, code = ghost.update_post(post.id, body, post.slug)
-    LOGGER.success(f"Successfully updated post `{slug}`: {body}")
-    return JSONResponse({str(code): response})
+    response = await ghost.update_post_async(post.id, body, post.slug)
+    if response is None:
+        raise HTTPException(status_code=502, detail=f"Failed to update post `{slug}`.")
+    LOGGER.success(f"Successfully updated post `{slug}`")
+    LOGGER.opt(lazy=True).debug("Update payload for post `{}`: {}", lambda: slug, lambda: body)
+    return JSONResponse(response)
+
+
+@job_runner.task("posts.metadata")
+def sanitize_posts_metadata(job: JobContext) -> dict:
+    """
+    Run SQL queries to sanitize metadata for all posts.
+
+    :param JobContext job: Handle for reporting progress.
+
+    :returns: dict
+    """
+    job.progress(0, 3, "Updating mismatched post metadata")
+    posts_metadata_updated = update_posts_metadata(collect_sql_queries("posts/updates"))
+    job.progress(1, 3, "Rewriting post image URLs")
+    cdn_urls = canonicalize_cdn_urls(["posts", "posts_meta"])
+    job.progress(2, 3, "Inserting missing post metadata")
+    posts_metadata_added = insert_posts_metadata()
+    job.progress(3, 3)
+    return {
+        "updated": {"count": posts_metadata_updated},
+        "inserted": {"count": posts_metadata_added},
+        "cdn_urls": cdn_urls,
+    }
 
 
 @router.get(
     "/",
     summary="Sanitize metadata for all posts.",
-    description="Ensure all posts have properly optimized metadata.",
-    response_model=PostBulkUpdate,
+    description="Queue a job ensuring all posts have properly optimized metadata; poll `/jobs/{id}/` for results.",
+    response_model=JobStatus,
+    status_code=202,
 )
-async def batch_update_metadata() -> JSONResponse:
+async def batch_update_metadata():
+    """Queue job to sanitize metadata for all posts."""
+    return await asyncio.to_thread(job_runner.submit, "posts.metadata")
+
+
+@job_runner.task("posts.alt_text")
+def populate_image_alt_text(job: JobContext) -> dict:
     """
-    Run SQL queries to sanitize metadata for all posts.
+    Populate missing `alt` text of image cards for all published posts.
 
-    :returns: JSONResponse
+    :param JobContext job: Handle for reporting progress.
+
+    :returns: dict
     """
-    posts_metadata_updated, posts_metadata_added = optimize_posts_metadata()
-    return JSONResponse(
-        content=f"Inserted {posts_metadata_added}; Updated {posts_metadata_updated}",
-        status_code=200,
+    return backfill_image_alt(progress=lambda scanned: job.progress(scanned, message=f"Scanned {scanned} posts"))
+
+
+@router.get(
+    "/alt/",
+    summary="Populate missing image alt text.",
+    description="Queue a job filling missing `alt` text of image cards in all published posts from each image's \
+                caption or filename; poll `/jobs/{id}/` for results.",
+    response_model=JobStatus,
+    status_code=202,
+)
+async def backfill_post_image_alt():
+    """Queue job to populate missing image `alt` text for all posts."""
+    return await asyncio.to_thread(job_runner.submit, "posts.alt_text")
+
+
+@job_runner.task("posts.secure_links")
+def secure_post_links(job: JobContext, since: Optional[str] = None) -> dict:
+    """
+    Replace insecure links of posts changed since the last successful sweep.
+
+    :param JobContext job: Handle for reporting progress.
+    :param Optional[str] since: ISO timestamp overriding when to sweep from; `all` sweeps every post.
+
+    :returns: dict
+    """
+    if since is None:
+        start = job_runner.last_succeeded("posts.secure_links")
+    else:
+        start = None if since == "all" else datetime.fromisoformat(since)
+    totals = backfill_secure_links(
+        since=start, progress=lambda scanned: job.progress(scanned, message=f"Scanned {scanned} posts")
     )
+    return {**totals, "since": start.isoformat() if start else None}
+
+
+@router.get(
+    "/links/",
+    summary="Replace insecure links in posts.",
+    description="Queue a job rewriting `http://` link & image URLs to `https://` in the html, mobiledoc & plaintext \
+                of posts changed since the last sweep (pass `since` as an ISO timestamp, or `all` to sweep every \
+                post); poll `/jobs/{id}/` for results.",
+    response_model=JobStatus,
+    status_code=202,
+)
+async def sweep_insecure_links(since: Optional[str] = None):
+    """
+    Queue job to replace insecure links in posts.
+
+    :param Optional[str] since: ISO timestamp to sweep posts changed from, or `all`.
+    """
+    if since not in (None, "all"):
+        try:
+            datetime.fromisoformat(since)
+        except ValueError:
+            raise HTTPException(status_code=422, detail=f"Invalid `since` timestamp `{since}`.")
+    params = {"since": since} if since is not None else {}
+    return await asyncio.to_thread(job_runner.submit, "posts.secure_links", **params)
 
 
 @router.get(
     "/{post_id}/",
     summary="Get a post.",
 )
-async def get_single_post(post_id: str) -> JSONResponse:
+async def get_single_post(post_id: str, ghost: Ghost = Depends(get_ghost)) -> JSONResponse:
     """
     Request to get Ghost post.
 
     :param str post_id: Post to fetch
+    :param Ghost ghost: Ghost admin client.
 
     :returns: JSONResponse
     """
@@ -108,14 +221,17 @@ async def get_single_post(post_id: str) -> JSONResponse:
     "/all/",
     summary="Get all post URLs.",
 )
-async def get_all_posts() -> JSONResponse:
+async def get_all_posts(ghost: Ghost = Depends(get_ghost)) -> JSONResponse:
     """
     List all published Ghost posts.
 
+    :param Ghost ghost: Ghost admin client.
+
     :returns: JSONResponse
     """
     posts = ghost.get_all_posts()
-    LOGGER.success(f"Fetched all {len(posts)} Ghost posts: {posts}")
+    LOGGER.success(f"Fetched all {len(posts)} Ghost posts")
+    LOGGER.opt(lazy=True).debug("Ghost post URLs: {}", lambda: posts)
     return JSONResponse(
         posts,
         status_code=200,
@@ -0,0 +1,154 @@
+"""Populate missing `alt` text of image cards in post mobiledocs."""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from os import path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from app.posts.update import update_mobiledoc
+from config import settings
+from database import ghost_db
+from database.read_sql import parse_sql_batch
+from log import LOGGER
+
+HTML_TAG = re.compile(r"<[^>]+>")
+WHITESPACE = re.compile(r"\s+")
+# Size suffixes added to image variants (ie: `image@2x.jpg`, `image-1024x768.jpg`, `image_mobile.jpg`)
+FILENAME_SUFFIX = re.compile(r"(@\dx|[-_]\d+x\d+|[-_](retina|mobile))$", re.IGNORECASE)
+FILENAME_SEPARATORS = re.compile(r"[-_+.]+")
+
+
+def alt_from_caption(caption: Optional[str]) -> Optional[str]:
+    """
+    Convert an image caption (which may contain HTML) to plain text.
+
+    :param Optional[str] caption: Caption of image card.
+
+    :returns: Optional[str]
+    """
+    if not caption:
+        return None
+    text = WHITESPACE.sub(" ", unescape(HTML_TAG.sub(" ", caption))).strip()
+    return text or None
+
+
+def alt_from_src(src: Optional[str]) -> Optional[str]:
+    """
+    Derive readable text from an image's filename (ie: `castle-bravo_blast@2x.jpg` -> `Castle bravo blast`).
+
+    :param Optional[str] src: URL of image.
+
+    :returns: Optional[str]
+    """
+    if not src:
+        return None
+    filename = path.splitext(path.basename(unquote(urlparse(src).path)))[0]
+    text = FILENAME_SEPARATORS.sub(" ", FILENAME_SUFFIX.sub("", filename)).strip()
+    return text[:1].upper() + text[1:] if text else None
+
+
+def fill_image_alt(image: Dict[str, Any]) -> bool:
+    """
+    Set `alt` of an image payload from its caption or filename, if missing.
+
+    :param Dict[str, Any] image: Payload of image card (or image within a gallery card).
+
+    :returns: bool
+    """
+    if not isinstance(image, dict) or image.get("alt"):
+        return False
+    alt = alt_from_caption(image.get("caption")) or alt_from_src(image.get("src"))
+    if alt is None:
+        return False
+    image["alt"] = alt
+    return True
+
+
+def fill_document_alt(document: Dict[str, Any]) -> int:
+    """
+    Populate `alt` of image and gallery cards missing one, in place.
+
+    :param Dict[str, Any] document: Parsed mobiledoc.
+
+    :returns: int
+    """
+    filled = 0
+    for card in document.get("cards", []):
+        if len(card) < 2 or not isinstance(card[1], dict):
+            continue
+        if card[0] == "image":
+            filled += fill_image_alt(card[1])
+        elif card[0] == "gallery":
+            filled += sum(fill_image_alt(image) for image in card[1].get("images", []))
+    return filled
+
+
+def fill_missing_alt(mobiledoc: str) -> Optional[str]:
+    """
+    Parse mobiledoc once & populate `alt` of image and gallery cards missing one.
+
+    :param str mobiledoc: Mobiledoc encoded as JSON string.
+
+    :returns: Optional[str]
+    """
+    try:
+        document = json.loads(mobiledoc)
+    except (TypeError, ValueError):
+        return None
+    if not fill_document_alt(document):
+        return None
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+
+
+def ghost_timestamp(updated_at) -> str:
+    """
+    Format `updated_at` as expected by Ghost's collision detection.
+
+    :param updated_at: Last update of post, as read from the Ghost database.
+
+    :returns: str
+    """
+    if isinstance(updated_at, str):
+        return updated_at
+    return f"{updated_at.strftime('%Y-%m-%dT%H:%M:%S')}.000Z"
+
+
+def backfill_image_alt(progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+    """
+    Page through published posts containing images & save mobiledocs with missing `alt` text filled in.
+
+    Posts are read in pages of `ALT_TEXT_BATCH_SIZE` (keyed on post ID) and updated via the Ghost Admin API (so post HTML is
+    re-rendered) with at most `ALT_TEXT_CONCURRENCY` requests in flight.
+
+    :param Optional[Callable[[int], None]] progress: Callback receiving the number of posts scanned so far.
+
+    :returns: Dict[str, int]
+    """
+    query = parse_sql_batch([f"{settings.BASE_DIR}/database/queries/posts/selects/img_alt_missing_mobiledoc.sql"])[0]
+    totals = {"scanned": 0, "updated": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=settings.ALT_TEXT_CONCURRENCY, thread_name_prefix="alt-text") as executor:
+        for posts in ghost_db.page_query(query, batch_size=settings.ALT_TEXT_BATCH_SIZE):
+            updates: List[dict] = []
+            for post in posts:
+                mobiledoc = fill_missing_alt(post["mobiledoc"])
+                if mobiledoc is not None:
+                    updates.append({**post, "mobiledoc": mobiledoc})
+            results = executor.map(
+                lambda post: update_mobiledoc(
+                    post["id"], post["mobiledoc"], ghost_timestamp(post["updated_at"]), post["slug"]
+                ),
+                updates,
+            )
+            updated = sum(result is not None for result in results)
+            totals["scanned"] += len(posts)
+            totals["updated"] += updated
+            totals["failed"] += len(updates) - updated
+            if progress is not None:
+                progress(totals["scanned"])
+    LOGGER.success(
+        f"Populated image alt text for {totals['updated']} of {totals['scanned']} posts ({totals['failed']} failed)."
+    )
+    return totals
@@ -0,0 +1,202 @@
+"""Rewrite insecure `http://` links of a post's html, mobiledoc & plaintext in a single pass."""
+
+import json
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+
+from config import settings
+from database import ghost_db
+from database.read_sql import parse_sql_batch
+from log import LOGGER
+
+# Quoted values of HTML attributes holding URLs; `srcset` values hold several comma-separated URLs
+HTML_URL_ATTRIBUTE = re.compile(
+    r"""(\s(?:href|src|srcset|data-src|data-srcset|poster|action|cite)\s*=\s*)("[^"]*"|'[^']*')""",
+    re.IGNORECASE,
+)
+ATTRIBUTE_URL = re.compile(r"(^[\"']\s*|,\s*|\s)(http://[^\s,\"']+)", re.IGNORECASE)
+# Inline links (`[text](http://...)`) & autolinks (`<http://...>`) of markdown cards
+MARKDOWN_URL = re.compile(r"(\]\(\s*<?|<)(http://[^\s)>]+)", re.IGNORECASE)
+# Mobiledoc markup attributes & card payload fields holding URLs
+MARKUP_URL_ATTRIBUTES = frozenset({"href", "src"})
+CARD_URL_FIELDS = frozenset({"src", "href", "url", "icon", "thumbnail", "image", "poster"})
+UPDATE_POST_LINKS = (
+    "UPDATE posts SET html = :html, mobiledoc = :mobiledoc, plaintext = :plaintext "
+    "WHERE id = :id AND updated_at = :updated_at"
+)
+
+
+def secure_url(url: str, secured: Set[str]) -> str:
+    """
+    Upgrade URL to `https://`, recording the original.
+
+    :param str url: URL of link or image.
+    :param Set[str] secured: Insecure URLs rewritten so far.
+
+    :returns: str
+    """
+    if not url.lower().startswith("http://"):
+        return url
+    secured.add(url)
+    return f"https://{url[7:]}"
+
+
+def secure_html(html: str, secured: Set[str]) -> str:
+    """
+    Upgrade URLs of link, image & media attributes in HTML, leaving `http://` in text untouched.
+
+    :param str html: Raw post (or card) HTML.
+    :param Set[str] secured: Insecure URLs rewritten so far.
+
+    :returns: str
+    """
+
+    def secure_attribute(match: re.Match) -> str:
+        value = ATTRIBUTE_URL.sub(lambda url: f"{url.group(1)}{secure_url(url.group(2), secured)}", match.group(2))
+        return f"{match.group(1)}{value}"
+
+    return HTML_URL_ATTRIBUTE.sub(secure_attribute, html)
+
+
+def secure_markdown(markdown: str, secured: Set[str]) -> str:
+    """
+    Upgrade URLs of inline links & autolinks in markdown.
+
+    :param str markdown: Content of markdown card.
+    :param Set[str] secured: Insecure URLs rewritten so far.
+
+    :returns: str
+    """
+    return MARKDOWN_URL.sub(lambda match: f"{match.group(1)}{secure_url(match.group(2), secured)}", markdown)
+
+
+def secure_card(payload: Any, secured: Set[str]) -> Any:
+    """
+    Upgrade URL, HTML & markdown fields of a mobiledoc card payload (including nested gallery images & metadata).
+
+    :param Any payload: Card payload, or a value nested within it.
+    :param Set[str] secured: Insecure URLs rewritten so far.
+
+    :returns: Any
+    """
+    if isinstance(payload, list):
+        return [secure_card(value, secured) for value in payload]
+    if not isinstance(payload, dict):
+        return payload
+    for key, value in payload.items():
+        if isinstance(value, str):
+            if key in CARD_URL_FIELDS:
+                payload[key] = secure_url(value, secured)
+            elif key in ("html", "caption"):
+                payload[key] = secure_html(value, secured)
+            elif key == "markdown":
+                payload[key] = secure_markdown(value, secured)
+        else:
+            payload[key] = secure_card(value, secured)
+    return payload
+
+
+def secure_document(document: Dict[str, Any], secured: Set[str]) -> int:
+    """
+    Upgrade URLs of link markups & cards in a parsed mobiledoc in place, returning the number of URLs secured.
+
+    :param Dict[str, Any] document: Parsed mobiledoc.
+    :param Set[str] secured: Insecure URLs rewritten so far.
+
+    :returns: int
+    """
+    found: Set[str] = set()
+    for markup in document.get("markups", []):
+        if len(markup) < 2 or not isinstance(markup[1], list):
+            continue
+        attributes = markup[1]
+        for i in range(0, len(attributes) - 1, 2):
+            if attributes[i] in MARKUP_URL_ATTRIBUTES and isinstance(attributes[i + 1], str):
+                attributes[i + 1] = secure_url(attributes[i + 1], found)
+    for card in document.get("cards", []):
+        if len(card) >= 2:
+            card[1] = secure_card(card[1], found)
+    secured |= found
+    return len(found)
+
+
+def secure_plaintext(plaintext: str, secured: Set[str]) -> str:
+    """
+    Upgrade URLs in plaintext which were secured in the post's html or mobiledoc.
+
+    Ghost derives plaintext from html, rendering links as `text [url]`; only those URLs are rewritten.
+
+    :param str plaintext: Plaintext of post.
+    :param Set[str] secured: Insecure URLs rewritten in html or mobiledoc.
+
+    :returns: str
+    """
+    if not secured:
+        return plaintext
+    urls = re.compile("|".join(re.escape(url) for url in sorted(secured, key=len, reverse=True)))
+    return urls.sub(lambda match: f"https://{match.group(0)[7:]}", plaintext)
+
+
+def secure_post(post: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Upgrade insecure links in the html, mobiledoc & plaintext of a post, parsing each representation once.
+
+    :param Dict[str, Any] post: Post with any of `html`, `mobiledoc` & `plaintext`.
+
+    :returns: Dict[str, str]
+    """
+    secured: Set[str] = set()
+    changes = {}
+    html = post.get("html")
+    if html and "http://" in html:
+        secure = secure_html(html, secured)
+        if secure != html:
+            changes["html"] = secure
+    mobiledoc = post.get("mobiledoc")
+    if mobiledoc and "http://" in mobiledoc:
+        try:
+            document = json.loads(mobiledoc)
+            if secure_document(document, secured):
+                changes["mobiledoc"] = json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            LOGGER.warning(f"Skipped securing links of malformed mobiledoc for post `{post.get('slug')}`: {e}")
+    plaintext = post.get("plaintext")
+    if plaintext and secured:
+        secure = secure_plaintext(plaintext, secured)
+        if secure != plaintext:
+            changes["plaintext"] = secure
+    return changes
+
+
+def backfill_secure_links(
+    since: Optional[datetime] = None, progress: Optional[Callable[[int], None]] = None
+) -> Dict[str, int]:
+    """
+    Page through posts changed since the previous sweep & save their html, mobiledoc & plaintext with links secured.
+
+    Posts are read in pages of `SECURE_LINKS_BATCH_SIZE` keyed on post ID; each page is saved in a single transaction,
+    skipping posts edited since they were read.
+
+    :param Optional[datetime] since: Only check posts updated at or after this time; checks all posts if unset.
+    :param Optional[Callable[[int], None]] progress: Callback receiving the number of posts scanned so far.
+
+    :returns: Dict[str, int]
+    """
+    query = parse_sql_batch([f"{settings.BASE_DIR}/database/queries/posts/selects/insecure_links.sql"])[0]
+    totals = {"scanned": 0, "updated": 0}
+    batches = ghost_db.page_query(
+        query, batch_size=settings.SECURE_LINKS_BATCH_SIZE, params={"since": since or datetime.min}
+    )
+    for posts in batches:
+        updates = []
+        for post in posts:
+            changes = secure_post(post)
+            if changes:
+                updates.append({**post, **changes})
+        totals["scanned"] += len(posts)
+        totals["updated"] += ghost_db.execute_batch(UPDATE_POST_LINKS, updates) or 0
+        if progress is not None:
+            progress(totals["scanned"])
+    LOGGER.success(f"Secured links of {totals['updated']} of {totals['scanned']} posts.")
+    return totals
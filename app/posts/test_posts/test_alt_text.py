@@ -0,0 +1,37 @@
+"""Test populating missing image `alt` text in mobiledocs."""
+
+import json
+
+from app.posts.alt_text import alt_from_caption, alt_from_src, fill_missing_alt
+
+
+def test_alt_sources():
+    """Test alt text is derived from plain-text captions, falling back to readable filenames."""
+    assert alt_from_caption('Breathe in <a href="https://example.com">that</a> &amp; more') == "Breathe in that & more"
+    assert alt_from_caption("<br>") is None
+    assert alt_from_src("https://cdn.example.com/2020/02/1024px-Castle_Bravo_Blast@2x.jpg?w=2") == (
+        "1024px Castle Bravo Blast"
+    )
+    assert alt_from_src("https://cdn.example.com/2020/02/fear-and-loathing-800x600.png") == "Fear and loathing"
+
+
+def test_fill_missing_alt():
+    """Test only image & gallery cards missing `alt` are filled, and documents without gaps are left alone."""
+    mobiledoc = json.dumps(
+        {
+            "version": "0.3.1",
+            "cards": [
+                ["image", {"src": "https://cdn.example.com/kept.jpg", "alt": "Kept"}],
+                ["image", {"src": "https://cdn.example.com/a.jpg", "caption": "From <b>caption</b>"}],
+                ["image", {"src": "https://cdn.example.com/from-file_name.jpg", "alt": ""}],
+                ["gallery", {"images": [{"src": "https://cdn.example.com/gallery-1.png"}]}],
+                ["markdown", {"markdown": "# Title"}],
+            ],
+            "sections": [],
+        }
+    )
+    cards = json.loads(fill_missing_alt(mobiledoc))["cards"]
+    assert [card[1].get("alt") for card in cards[:3]] == ["Kept", "From caption", "From file name"]
+    assert cards[3][1]["images"][0]["alt"] == "Gallery 1"
+    assert fill_missing_alt(json.dumps({"cards": cards})) is None
+    assert fill_missing_alt("not json") is None
@@ -0,0 +1,84 @@
+"""Test rewriting insecure links of post html, mobiledoc & plaintext."""
+
+import json
+
+from app.posts import secure_links
+from app.posts.secure_links import backfill_secure_links, secure_html, secure_post
+from config import settings
+from database.sql_db import Database
+
+
+def test_secure_html():
+    """Test only URL attributes are upgraded, leaving `http://` mentioned in text alone."""
+    secured = set()
+    html = (
+        '<p>Visit <a href="http://example.com/a">http://example.com/a</a> or type http://localhost.</p>'
+        "<img src='http://cdn.example.com/b.jpg' "
+        'srcset="http://cdn.example.com/b.jpg 1x, http://cdn.example.com/c.jpg 2x">'
+        '<a href="https://example.com/?next=http://other.com">ok</a>'
+    )
+    assert secure_html(html, secured) == (
+        '<p>Visit <a href="https://example.com/a">http://example.com/a</a> or type http://localhost.</p>'
+        "<img src='https://cdn.example.com/b.jpg' "
+        'srcset="https://cdn.example.com/b.jpg 1x, https://cdn.example.com/c.jpg 2x">'
+        '<a href="https://example.com/?next=http://other.com">ok</a>'
+    )
+    assert secured == {"http://example.com/a", "http://cdn.example.com/b.jpg", "http://cdn.example.com/c.jpg"}
+
+
+def test_secure_post():
+    """Test html, mobiledoc markups & cards, and plaintext links are secured in one pass."""
+    mobiledoc = {
+        "version": "0.3.1",
+        "markups": [["a", ["href", "http://example.com/a", "rel", "noopener"]], ["code"]],
+        "cards": [
+            ["image", {"src": "http://cdn.example.com/b.jpg", "caption": 'Via <a href="http://example.com/c">c</a>'}],
+            ["markdown", {"markdown": "See [docs](http://example.com/d) or run `curl http://localhost`"}],
+            ["bookmark", {"url": "http://example.com/e", "metadata": {"icon": "http://example.com/e.ico"}}],
+        ],
+        "sections": [[1, "p", [[0, [], 0, "Type http://localhost to start."]]]],
+    }
+    post = {
+        "slug": "post",
+        "html": '<p><a href="http://example.com/a">link</a> & http://localhost</p>',
+        "mobiledoc": json.dumps(mobiledoc),
+        "plaintext": "link [http://example.com/a] & http://localhost",
+    }
+    changes = secure_post(post)
+    assert changes["html"] == '<p><a href="https://example.com/a">link</a> & http://localhost</p>'
+    assert changes["plaintext"] == "link [https://example.com/a] & http://localhost"
+    document = json.loads(changes["mobiledoc"])
+    assert document["markups"][0] == ["a", ["href", "https://example.com/a", "rel", "noopener"]]
+    assert document["cards"][0][1] == {
+        "src": "https://cdn.example.com/b.jpg",
+        "caption": 'Via <a href="https://example.com/c">c</a>',
+    }
+    assert document["cards"][1][1]["markdown"] == "See [docs](https://example.com/d) or run `curl http://localhost`"
+    assert document["cards"][2][1] == {
+        "url": "https://example.com/e",
+        "metadata": {"icon": "https://example.com/e.ico"},
+    }
+    assert document["sections"] == mobiledoc["sections"]
+    assert secure_post({**post, **changes}) == {}
+
+
+def test_backfill_secure_links_pages_by_id(monkeypatch):
+    """Posts are read a page at a time by ID, with each page saved before the next is read."""
+    db = Database(uri="sqlite://", db_name="", args={})
+    with db.db.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE posts (id TEXT PRIMARY KEY, slug TEXT, updated_at TEXT, html TEXT, mobiledoc TEXT, "
+            "plaintext TEXT)"
+        )
+        for n in range(3):
+            conn.exec_driver_sql(
+                "INSERT INTO posts VALUES (?, ?, '2024-01-01 00:00:00', ?, NULL, NULL)",
+                (f"{n:024x}", f"post-{n}", f'<a href="http://example.com/{n}">{n}</a>'),
+            )
+    monkeypatch.setattr(secure_links, "ghost_db", db)
+    monkeypatch.setattr(settings, "SECURE_LINKS_BATCH_SIZE", 2)
+    scanned = []
+    assert backfill_secure_links(progress=scanned.append) == {"scanned": 3, "updated": 3}
+    assert scanned == [2, 3]
+    with db.db.connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM posts WHERE html LIKE '%http://%'").scalar() == 0
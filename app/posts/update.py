@@ -1,33 +1,42 @@
 """Methods for updating Ghost post content or metadata."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional
 
 from fastapi import HTTPException
 
-from clients import ghost
+from clients import get_ghost
 from log import LOGGER
 
 
-def update_mobiledoc(post_id: str, mobiledoc: str) -> Tuple[str, int]:
+def update_mobiledoc(
+    post_id: str, mobiledoc: str, updated_at: Optional[str] = None, slug: Optional[str] = None
+) -> Optional[dict]:
     """
-    Update Lynx post with proper embedded URLs.
+    Replace mobiledoc of a post.
 
     :param str post_id: ID of post to be updated.
     :param str mobiledoc: Mobiledoc encoded as string with escaped characters.
+    :param Optional[str] updated_at: Last update of post, required by Ghost; fetched from Ghost if not provided.
+    :param Optional[str] slug: Human-readable unique identifier, for logging purposes.
 
-    :returns: Tuple[str, int]
+    :returns: Optional[dict]
     """
-    ghost_post = ghost.get_post(post_id)
+    ghost = get_ghost()
+    if updated_at is None:
+        ghost_post = ghost.get_post(post_id)
+        if ghost_post is None:
+            return None
+        updated_at = ghost_post["updated_at"]
+        slug = ghost_post["slug"]
     body = {
         "posts": [
             {
                 "mobiledoc": mobiledoc,
-                "status": ghost_post.status,
-                "updated_at": ghost_post.updated_at,
+                "updated_at": updated_at,
             }
         ]
     }
-    return ghost.update_post(ghost_post["id"], body, ghost_post["slug"])
+    return ghost.update_post(post_id, body, slug or post_id)
 
 
 def bulk_update_post_metadata(post_dicts: List[Optional[dict]]) -> List[Optional[dict]]:
@@ -40,6 +49,7 @@ def bulk_update_post_metadata(post_dicts: List[Optional[dict]]) -> List[Optional
     """
     try:
         if bool(post_dicts):
+            ghost = get_ghost()
             updated_posts = []
             for post_dict in post_dicts:
                 post = ghost.get_post(post_dict["id"])
@@ -65,22 +75,6 @@ def bulk_update_post_metadata(post_dicts: List[Optional[dict]]) -> List[Optional
         LOGGER.error(f"Error updating metadata: {e}")
 
 
-def update_html_ssl_urls(html: str, body: dict, slug: str) -> dict:
-    """
-    Replace hyperlinks in post with SSL equivalents.
-
-    :param str html: Raw post html.
-    :param dict body: JSON body representing Ghost post.
-    :param str slug: Unique post identifier for logging purposes.
-
-    :returns: dict
-    """
-    html = html.replace("http://", "https://")
-    body["posts"][0].update({"html": html})
-    LOGGER.info(f"Replaced unsecure URLs in post `{slug}`")
-    return body
-
-
 def update_metadata_images(feature_image: str, body: dict, slug: str) -> dict:
     """
     Update OG and Twitter images to match feature image.
@@ -0,0 +1,54 @@
+"""Validate webhook request bodies straight from raw JSON."""
+
+from typing import Any, Callable, Coroutine, Optional, Type
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ValidationError
+
+
+def parse_body(body: bytes, model: Optional[Type[BaseModel]] = None) -> Any:
+    """
+    Validate JSON document against `model` without decoding fields it doesn't declare, else decode it with `orjson`.
+
+    Invalid documents are decoded as-is, leaving FastAPI to report validation (or JSON decoding) errors as a 422.
+
+    :param bytes body: Raw JSON document.
+    :param Optional[Type[BaseModel]] model: Schema ignoring undeclared fields.
+
+    :returns: Any
+    """
+    if model is not None:
+        try:
+            return model.model_validate_json(body)
+        except ValidationError:
+            pass
+    return orjson.loads(body)
+
+
+class FastJSONRequest(Request):
+    """Request parsing its JSON body straight from bytes into the route's body model."""
+
+    model: Optional[Type[BaseModel]] = None
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = parse_body(await self.body(), self.model)
+        return self._json
+
+
+class WebhookRoute(APIRoute):
+    """Route parsing request bodies with `FastJSONRequest`, for routers receiving large webhook payloads."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        body_type = self.body_field.type_ if self.body_field else None
+        model = body_type if isinstance(body_type, type) and issubclass(body_type, BaseModel) else None
+
+        async def webhook_route_handler(request: Request) -> Response:
+            webhook_request = FastJSONRequest(request.scope, request.receive)
+            webhook_request.model = model
+            return await handler(webhook_request)
+
+        return webhook_route_handler
@@ -3,12 +3,35 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
+from app.images.cdn_urls import canonicalize_cdn_urls
+from app.jobs.runner import JobContext, job_runner
+from app.routing import WebhookRoute
 from database import ghost_db
 from database.read_sql import collect_sql_queries
-from database.schemas import TagUpdate
+from database.schemas import LeanTagUpdate
 from log import LOGGER
 
-router = APIRouter(prefix="/tags", tags=["tags"])
+router = APIRouter(prefix="/tags", tags=["tags"], route_class=WebhookRoute)
+
+
+@job_runner.task("tags.metadata")
+def sanitize_tags_metadata(job: JobContext) -> dict:
+    """
+    Run SQL queries to sanitize metadata for all tags.
+
+    :param JobContext job: Handle for reporting progress.
+
+    :returns: dict
+    """
+    tag_update_queries = collect_sql_queries("tags")
+    job.progress(0, len(tag_update_queries) + 1, "Updating tag metadata")
+    update_results = ghost_db.execute_queries(tag_update_queries)
+    if update_results is None:
+        raise RuntimeError("Failed to update tag metadata.")
+    job.progress(len(tag_update_queries), len(tag_update_queries) + 1, "Rewriting tag image URLs")
+    update_results["cdn_urls"] = canonicalize_cdn_urls(["tags"])["tags"]
+    job.progress(len(tag_update_queries) + 1, len(tag_update_queries) + 1)
+    return update_results
 
 
 @router.post(
@@ -16,13 +39,14 @@ router = APIRouter(prefix="/tags", tags=["tags"])
     summary="Optimize tag metadata.",
     description="Optimize tag page SEO upon update of a single tag.",
 )
-async def update_tags_metadata(tag_update: TagUpdate) -> JSONResponse:
+async def update_tags_metadata(tag_update: LeanTagUpdate) -> JSONResponse:
     """
     Enrich tag metadata upon update.
 
     :returns: JSONResponse
     """
     tag_update_queries = collect_sql_queries("tags")
-    update_results = ghost_db.execute_queries(tag_update_queries)
+    update_results = ghost_db.execute_queries(tag_update_queries) or {}
+    update_results["cdn_urls"] = canonicalize_cdn_urls(["tags"])["tags"]
     LOGGER.success(f"Tag `{tag_update.current.slug}` updated; updated tag page metadata: {update_results}")
     return JSONResponse(update_results, status_code=200)
@@ -0,0 +1,96 @@
+"""
+Run the benchmark suite against local stand-ins & report results as JSON.
+
+Each benchmark runs in a fresh interpreter so cold-start numbers aren't skewed by earlier runs.
+Run with `python -m benchmarks [--output results.json]`; compare output files between commits to spot regressions.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from os import environ, path
+from typing import Dict, Optional
+
+from benchmarks.environment import local_stand_ins
+
+BASE_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+BENCHMARKS = ["import_time", "startup", "webhooks", "webhook_parsing", "page_filter", "alt_text"]
+
+
+def parse_report(output: str) -> dict:
+    """
+    Extract the JSON report from log output (background jobs may still be logging once it's printed).
+
+    :param str output: Standard output of a benchmark run.
+
+    :returns: dict
+    """
+    lines = output.splitlines()
+    start = max(i for i, line in enumerate(lines) if line == "{")
+    report, _ = json.JSONDecoder().raw_decode("\n".join(lines[start:]))
+    return report
+
+
+def run_benchmark(name: str, env: Dict[str, str]) -> dict:
+    """
+    Run a single benchmark module in a fresh interpreter.
+
+    :param str name: Module name within `benchmarks`.
+    :param Dict[str, str] env: Environment variables pointing the API at local stand-ins.
+
+    :returns: dict
+    """
+    result = subprocess.run(
+        [sys.executable, "-m", f"benchmarks.{name}"],
+        cwd=env["BENCHMARK_WORKDIR"],
+        env={**environ, **env, "PYTHONPATH": BASE_DIR},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return {"benchmark": name, "error": result.stderr.strip().splitlines()[-1]}
+    return parse_report(result.stdout)
+
+
+def git_commit() -> Optional[str]:
+    """
+    Commit the benchmarks ran against, if run from a git checkout.
+
+    :returns: Optional[str]
+    """
+    result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True)
+    return result.stdout.strip() or None
+
+
+def main():
+    """Run selected benchmarks & write the combined report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write results to this file instead of stdout.")
+    parser.add_argument("benchmarks", nargs="*", help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)}).")
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    with local_stand_ins() as env:
+        results = {name: run_benchmark(name, env) for name in args.benchmarks or BENCHMARKS}
+    report = json.dumps(
+        {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "results": results,
+        },
+        indent=2,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Start local stand-ins for external services & build the environment pointing the API at them."""
+
+import json
+import sqlite3
+from contextlib import ExitStack, contextmanager
+from os import path
+from tempfile import TemporaryDirectory
+from typing import Dict, Iterator
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from benchmarks.fakes import LocalServer, create_fake_gcs, create_fake_ghost, png_bytes
+from benchmarks.payloads import mobiledoc
+
+BUCKET_NAME = "benchmark-cdn"
+GHOST_CLIENT_ID = "benchmark"
+IMAGE_FOLDER = "benchmark/2024/01"
+IMAGES = 20
+POSTS = 200
+TAGS = 200
+
+TAG_COLUMNS = [
+    "feature_image",
+    "meta_title",
+    "meta_description",
+    "og_title",
+    "og_description",
+    "og_image",
+    "twitter_title",
+    "twitter_description",
+    "twitter_image",
+]
+
+
+def service_account_info(token_uri: str) -> dict:
+    """
+    Generate throwaway service account credentials which refresh tokens against a local server.
+
+    :param str token_uri: Token endpoint of fake GCS server.
+
+    :returns: dict
+    """
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return {
+        "type": "service_account",
+        "project_id": "benchmark",
+        "private_key_id": "benchmark",
+        "private_key": pem.decode(),
+        "client_email": "benchmark@benchmark.iam.gserviceaccount.com",
+        "client_id": "0",
+        "token_uri": token_uri,
+    }
+
+
+def create_ghost_db(db_path: str, tags: int, posts: int) -> None:
+    """
+    Create SQLite stand-in for the Ghost database, seeded with tags & posts matching the fake Ghost API.
+
+    :param str db_path: Path of SQLite database file.
+    :param int tags: Number of tags to seed.
+    :param int posts: Number of posts to seed.
+    """
+    with sqlite3.connect(db_path) as conn:
+        columns = ", ".join(f"{column} TEXT" for column in TAG_COLUMNS)
+        conn.execute(f"CREATE TABLE tags (id TEXT PRIMARY KEY, slug TEXT, {columns})")
+        conn.executemany(
+            "INSERT INTO tags (id, slug, feature_image, meta_title, meta_description) VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    f"{n:024x}",
+                    f"tag-{n}",
+                    f"https://hackersandslackers-cdn.storage.googleapis.com/2024/01/tag-{n}.png",
+                    f"Tag {n}",
+                    f"Posts tagged {n}.",
+                )
+                for n in range(tags)
+            ],
+        )
+        conn.execute(
+            "CREATE TABLE posts (id TEXT PRIMARY KEY, slug TEXT, status TEXT, updated_at TEXT, mobiledoc TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO posts (id, slug, status, updated_at, mobiledoc) VALUES (?, ?, ?, ?, ?)",
+            [(f"{n:024x}", f"post-{n}", "published", "2024-01-01T00:00:00.000Z", mobiledoc(n)) for n in range(posts)],
+        )
+
+
+@contextmanager
+def local_stand_ins() -> Iterator[Dict[str, str]]:
+    """
+    Run fake Ghost & GCS servers and SQLite databases for the duration of a `with` block.
+
+    Yields environment variables which point the API at the stand-ins; these take precedence over `.env`.
+
+    :returns: Iterator[Dict[str, str]]
+    """
+    with ExitStack() as stack:
+        workdir = stack.enter_context(TemporaryDirectory(prefix="benchmarks-"))
+        images = {f"{IMAGE_FOLDER}/image-{n}.png": png_bytes(seed=n) for n in range(IMAGES)}
+        fake_ghost = create_fake_ghost(posts=POSTS, client_id=GHOST_CLIENT_ID, content_api_key=GHOST_CLIENT_ID)
+        ghost = stack.enter_context(LocalServer(fake_ghost))
+        gcs = stack.enter_context(LocalServer(create_fake_gcs([BUCKET_NAME], {BUCKET_NAME: images})))
+        create_ghost_db(path.join(workdir, "ghost"), TAGS, POSTS)
+        yield {
+            "BENCHMARK_WORKDIR": workdir,
+            "DATABASE_CREATE_TABLES": "true",
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{workdir}",
+            "SQLALCHEMY_GHOST_DATABASE_NAME": "ghost",
+            "SQLALCHEMY_FEATURES_DATABASE_NAME": "features",
+            "SQLALCHEMY_ENGINE_OPTIONS": json.dumps({"check_same_thread": False}),
+            "GHOST_BASE_URL": ghost.url,
+            "GHOST_CLIENT_ID": GHOST_CLIENT_ID,
+            "GHOST_ADMIN_API_KEY": "00" * 32,
+            "GHOST_CONTENT_API_KEY": GHOST_CLIENT_ID,
+            "STORAGE_EMULATOR_HOST": gcs.url,
+            "GCP_PROJECT_NAME": "benchmark",
+            "GCP_JSON_CREDENTIALS": json.dumps(service_account_info(f"{gcs.url}/token")),
+            "GCP_BUCKET_NAME": BUCKET_NAME,
+            "GCP_BUCKET_URL": f"{gcs.url}/{BUCKET_NAME}",
+            "SEARCH_SUGGESTIONS_SNAPSHOT_PATH": path.join(workdir, "search_suggestions.json"),
+            "TWILIO_ACCOUNT_SID": "ACbenchmark",
+            "TWILIO_AUTH_TOKEN": "benchmark",
+        }
@@ -0,0 +1,5 @@
+"""Local stand-ins for external services, used to benchmark the API without network access."""
+
+from benchmarks.fakes.gcs import create_fake_gcs, png_bytes
+from benchmarks.fakes.ghost import FakeGhost, create_fake_ghost
+from benchmarks.fakes.server import LocalServer
@@ -0,0 +1,147 @@
+"""Local stand-in for the Google Cloud Storage JSON API, in the style of `fake-gcs-server`.
+
+Point `google-cloud-storage` at it with `STORAGE_EMULATOR_HOST`. Service account credentials need a `token_uri`
+of `<url>/token` so token refreshes are answered locally too.
+"""
+
+import json
+from email.parser import BytesParser
+from io import BytesIO
+from typing import Dict, Iterable
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from PIL import Image
+
+Objects = Dict[str, Dict[str, dict]]
+
+
+def png_bytes(size: int = 64, seed: int = 0) -> bytes:
+    """
+    Render a small, deterministic PNG image.
+
+    :param int size: Width & height of image in pixels.
+    :param int seed: Varies the fill color between images.
+
+    :returns: bytes
+    """
+    with BytesIO() as output:
+        Image.new("RGB", (size, size), color=(seed * 37 % 256, seed * 71 % 256, seed * 113 % 256)).save(output, "PNG")
+        return output.getvalue()
+
+
+def _resource(bucket: str, name: str, obj: dict) -> dict:
+    """
+    Render object metadata as returned by the JSON API.
+
+    :param str bucket: Bucket name.
+    :param str name: Object name.
+    :param dict obj: Stored object.
+
+    :returns: dict
+    """
+    return {
+        "kind": "storage#object",
+        "id": f"{bucket}/{name}/1",
+        "bucket": bucket,
+        "name": name,
+        "size": str(len(obj["data"])),
+        "contentType": obj["contentType"],
+        "generation": "1",
+        "metageneration": "1",
+    }
+
+
+def _not_found(name: str) -> JSONResponse:
+    """
+    Render a JSON API 404 error.
+
+    :param str name: Missing bucket or object name.
+
+    :returns: JSONResponse
+    """
+    return JSONResponse({"error": {"code": 404, "message": f"No such object: {name}"}}, status_code=404)
+
+
+def create_fake_gcs(buckets: Iterable[str], objects: Dict[str, Dict[str, bytes]] = None) -> FastAPI:
+    """
+    Build a fake GCS JSON API holding objects in memory.
+
+    :param Iterable[str] buckets: Names of buckets to create.
+    :param Dict[str, Dict[str, bytes]] objects: Objects to seed, as `{bucket: {name: data}}`.
+
+    :returns: FastAPI
+    """
+    store: Objects = {bucket: {} for bucket in buckets}
+    for bucket, seeded in (objects or {}).items():
+        for name, data in seeded.items():
+            store[bucket][name] = {"data": data, "contentType": "application/octet-stream"}
+    api = FastAPI(title="Fake GCS", docs_url=None, redoc_url=None, openapi_url=None)
+
+    @api.post("/token")
+    async def token():
+        return {"access_token": "fake-gcs-token", "expires_in": 3600, "token_type": "Bearer"}
+
+    @api.get("/storage/v1/b/{bucket}")
+    async def get_bucket(bucket: str):
+        if bucket not in store:
+            return _not_found(bucket)
+        return {"kind": "storage#bucket", "id": bucket, "name": bucket}
+
+    @api.get("/storage/v1/b/{bucket}/o")
+    async def list_objects(bucket: str, prefix: str = ""):
+        items = [_resource(bucket, name, obj) for name, obj in sorted(store[bucket].items()) if name.startswith(prefix)]
+        return {"kind": "storage#objects", "items": items}
+
+    @api.get("/storage/v1/b/{bucket}/o/{name:path}")
+    @api.get("/download/storage/v1/b/{bucket}/o/{name:path}")
+    async def get_object(bucket: str, name: str, request: Request):
+        obj = store[bucket].get(name)
+        if obj is None:
+            return _not_found(name)
+        if request.query_params.get("alt") == "media":
+            return Response(obj["data"], media_type=obj["contentType"])
+        return _resource(bucket, name, obj)
+
+    @api.delete("/storage/v1/b/{bucket}/o/{name:path}")
+    async def delete_object(bucket: str, name: str):
+        if store[bucket].pop(name, None) is None:
+            return _not_found(name)
+        return Response(status_code=204)
+
+    @api.post("/storage/v1/b/{bucket}/o/{path:path}")
+    async def copy_object(bucket: str, path: str):
+        for verb in ("/copyTo/b/", "/rewriteTo/b/"):
+            if verb in path:
+                name, destination = path.split(verb, 1)
+                dest_bucket, dest_name = destination.split("/o/", 1)
+                break
+        else:
+            return JSONResponse({"error": {"code": 400, "message": "Unsupported operation."}}, status_code=400)
+        obj = store[bucket].get(name)
+        if obj is None:
+            return _not_found(name)
+        store[dest_bucket][dest_name] = dict(obj)
+        resource = _resource(dest_bucket, dest_name, obj)
+        if "rewriteTo" in verb:
+            return {"kind": "storage#rewriteResponse", "done": True, "resource": resource}
+        return resource
+
+    @api.post("/upload/storage/v1/b/{bucket}/o")
+    async def upload_object(bucket: str, request: Request):
+        body = await request.body()
+        content_type = request.headers.get("content-type", "application/octet-stream")
+        if request.query_params.get("uploadType") == "multipart":
+            message = BytesParser().parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+            metadata_part, media_part = message.get_payload()
+            metadata = metadata_part.get_payload(decode=True)
+            name = json.loads(metadata)["name"]
+            data = media_part.get_payload(decode=True)
+            content_type = media_part.get_content_type()
+        else:
+            name = request.query_params["name"]
+            data = body
+        store[bucket][name] = {"data": data, "contentType": content_type}
+        return _resource(bucket, name, store[bucket][name])
+
+    return api
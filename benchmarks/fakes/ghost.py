@@ -0,0 +1,504 @@
+"""
+Local stand-in for the Ghost Admin & Content APIs.
+
+Serves deterministic posts, pages, users & members from memory, verifies Admin API JWTs & Content API keys
+the way Ghost does, and can inject latency & errors. Faults can be changed at runtime with
+`PUT /__fake__/faults`, and `GET /__fake__/stats` reports requests served.
+
+Serve standalone for load tests with `python -m benchmarks.fakes.ghost --port 2368 --latency-ms 50`.
+"""
+
+import argparse
+import asyncio
+import random
+from typing import Dict, List, Optional, Tuple
+
+import jwt
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse
+
+ADMIN_PREFIX = "/ghost/api/admin"
+CONTENT_PREFIX = "/ghost/api/content"
+DEFAULT_LIMIT = 15
+MAX_TOKEN_LIFETIME = 5 * 60
+
+
+def seed_posts(count: int, base_url: str = "https://example.com") -> List[dict]:
+    """
+    Generate deterministic Ghost posts.
+
+    :param int count: Number of posts to generate.
+    :param str base_url: Public URL of the fake blog.
+
+    :returns: List[dict]
+    """
+    author = {"id": "1", "name": "Admin", "slug": "admin", "roles": []}
+    return [
+        {
+            "id": f"{n:024x}",
+            "uuid": f"00000000-0000-0000-0000-{n:012x}",
+            "title": f"Post {n}",
+            "slug": f"post-{n}",
+            "url": f"{base_url}/post-{n}/",
+            "status": "published",
+            "type": "post",
+            "html": f'<p>Read <a href="http://example.com/post-{n - 1}/">the previous post</a>.</p>',
+            "feature_image": f"https://cdn.example.com/2024/01/post-{n}.png",
+            "custom_excerpt": f"Excerpt for post {n}.",
+            "authors": [author],
+            "primary_author": author,
+            "updated_at": "2024-01-01T00:00:00.000Z",
+        }
+        for n in range(count)
+    ]
+
+
+def seed_pages(count: int, base_url: str = "https://example.com") -> List[dict]:
+    """
+    Generate deterministic Ghost pages.
+
+    :param int count: Number of pages to generate.
+    :param str base_url: Public URL of the fake blog.
+
+    :returns: List[dict]
+    """
+    return [
+        {"id": f"{n:024x}", "slug": f"page-{n}", "title": f"Page {n}", "url": f"{base_url}/page-{n}/", "type": "page"}
+        for n in range(count)
+    ]
+
+
+def seed_users(count: int, base_url: str = "https://example.com") -> List[dict]:
+    """
+    Generate deterministic Ghost staff users; the first is the site owner.
+
+    :param int count: Number of users to generate.
+    :param str base_url: Public URL of the fake blog.
+
+    :returns: List[dict]
+    """
+    return [
+        {
+            "id": str(n + 1),
+            "name": "Admin" if n == 0 else f"Author {n}",
+            "slug": "admin" if n == 0 else f"author-{n}",
+            "email": f"user-{n}@example.com",
+            "profile_image": f"https://cdn.example.com/authors/user-{n}.png",
+            "url": f"{base_url}/author/{'admin' if n == 0 else f'author-{n}'}/",
+            "roles": [{"name": "Owner" if n == 0 else "Author"}],
+        }
+        for n in range(count)
+    ]
+
+
+def ghost_error(status_code: int, error_type: str, message: str) -> JSONResponse:
+    """
+    Render an error in Ghost's response format.
+
+    :param int status_code: HTTP status code.
+    :param str error_type: Ghost error type (ie: `NotFoundError`).
+    :param str message: Error message.
+
+    :returns: JSONResponse
+    """
+    return JSONResponse({"errors": [{"message": message, "type": error_type}]}, status_code=status_code)
+
+
+def parse_filter(ghost_filter: str) -> Dict[str, List[str]]:
+    """
+    Parse the subset of Ghost's NQL filter syntax used by clients: `key:value` & `key:[a,b]` terms joined by `+`.
+
+    :param str ghost_filter: Value of the `filter` query parameter.
+
+    :returns: Dict[str, List[str]]
+    """
+    terms = {}
+    for term in filter(None, ghost_filter.split("+")):
+        key, _, value = term.partition(":")
+        if value.startswith("[") and value.endswith("]"):
+            terms[key] = value[1:-1].split(",")
+        else:
+            terms[key] = [value]
+    return terms
+
+
+def paginate(resources: List[dict], limit: str, page: str) -> Tuple[List[dict], dict]:
+    """
+    Slice a page of resources & build Ghost's `meta.pagination`.
+
+    :param List[dict] resources: All resources matching the request.
+    :param str limit: Page size, or `all`.
+    :param str page: 1-indexed page number.
+
+    :returns: Tuple[List[dict], dict]
+    """
+    total = len(resources)
+    page = max(int(page), 1)
+    limit = max(total, 1) if limit == "all" else max(int(limit), 1)
+    pages = max(-(-total // limit), 1)
+    offset = (page - 1) * limit
+    pagination = {
+        "page": page,
+        "limit": limit,
+        "pages": pages,
+        "total": total,
+        "next": page + 1 if page < pages else None,
+        "prev": page - 1 if page > 1 else None,
+    }
+    return resources[offset : offset + limit], {"pagination": pagination}
+
+
+class FakeGhost:
+    """In-memory Ghost Admin & Content API."""
+
+    def __init__(
+        self,
+        posts: int = 200,
+        pages: int = 10,
+        users: int = 5,
+        client_id: str = "fake",
+        secret: str = "00" * 32,
+        content_api_key: str = "fake",
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: int = 0,
+    ):
+        """
+        Fake Ghost constructor.
+
+        :param int posts: Number of posts to seed.
+        :param int pages: Number of pages to seed.
+        :param int users: Number of staff users to seed.
+        :param str client_id: ID of Admin API key (JWT `kid`).
+        :param str secret: Hex-encoded secret of Admin API key.
+        :param str content_api_key: Content API key.
+        :param float latency_ms: Delay added to every API response.
+        :param float jitter_ms: Maximum random delay added on top of `latency_ms`.
+        :param float error_rate: Fraction of API requests to fail with `error_status`.
+        :param int error_status: HTTP status of injected errors.
+        :param int seed: Random seed for jitter & error injection, so runs are repeatable.
+        """
+        self.client_id = client_id
+        self.secret = secret
+        self.content_api_key = content_api_key
+        self.posts: Dict[str, dict] = {post["id"]: post for post in seed_posts(posts)}
+        self.slugs: Dict[str, str] = {post["slug"]: post["id"] for post in self.posts.values()}
+        self.pages = seed_pages(pages)
+        self.users = seed_users(users)
+        self.members: List[dict] = []
+        self.stats = {"requests": 0, "injected_errors": 0, "unauthorized": 0}
+        self.random = random.Random(seed)
+        self.configure(latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate, error_status=error_status)
+
+    def configure(
+        self,
+        latency_ms: Optional[float] = None,
+        jitter_ms: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        error_status: Optional[int] = None,
+    ) -> dict:
+        """
+        Change injected faults; unset arguments are left as they are.
+
+        :param Optional[float] latency_ms: Delay added to every API response.
+        :param Optional[float] jitter_ms: Maximum random delay added on top of `latency_ms`.
+        :param Optional[float] error_rate: Fraction of API requests to fail with `error_status`.
+        :param Optional[int] error_status: HTTP status of injected errors.
+
+        :returns: dict
+        """
+        faults = {
+            "latency_ms": latency_ms,
+            "jitter_ms": jitter_ms,
+            "error_rate": error_rate,
+            "error_status": error_status,
+        }
+        for name, value in faults.items():
+            if value is not None:
+                setattr(self, name, value)
+        return self.faults
+
+    @property
+    def faults(self) -> dict:
+        """
+        Currently injected faults.
+
+        :returns: dict
+        """
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "error_rate": self.error_rate,
+            "error_status": self.error_status,
+        }
+
+    def verify_admin_token(self, authorization: Optional[str]) -> Optional[str]:
+        """
+        Verify an Admin API `Authorization: Ghost <jwt>` header.
+
+        :param Optional[str] authorization: Value of `Authorization` header.
+
+        :returns: Optional[str]
+        """
+        scheme, _, token = (authorization or "").partition(" ")
+        if scheme != "Ghost" or not token:
+            return "Authorization header format is `Authorization: Ghost [token]`."
+        try:
+            if jwt.get_unverified_header(token).get("kid") != self.client_id:
+                return "Unknown Admin API Key."
+            claims = jwt.decode(
+                token,
+                bytes.fromhex(self.secret),
+                algorithms=["HS256"],
+                options={"require": ["iat", "exp", "aud"], "verify_aud": False},
+            )
+        except jwt.PyJWTError as e:
+            return f"Invalid token: {e}"
+        if not str(claims["aud"]).endswith("/admin/"):
+            return "Invalid token: audience is not the Admin API."
+        if claims["exp"] - claims["iat"] > MAX_TOKEN_LIFETIME:
+            return "Invalid token: maximum lifetime is 5 minutes."
+        return None
+
+    def browse(self, resources: List[dict], request: Request, resource_type: str) -> dict:
+        """
+        Filter, paginate & trim resources for a browse request.
+
+        :param List[dict] resources: Resources of a single type.
+        :param Request request: Incoming browse request.
+        :param str resource_type: Response key (ie: `posts`).
+
+        :returns: dict
+        """
+        params = request.query_params
+        for key, values in parse_filter(params.get("filter", "")).items():
+            resources = [resource for resource in resources if str(resource.get(key)) in values]
+        results, meta = paginate(resources, params.get("limit", str(DEFAULT_LIMIT)), params.get("page", "1"))
+        if params.get("fields"):
+            fields = params["fields"].split(",")
+            results = [{field: result.get(field) for field in fields} for result in results]
+        return {resource_type: results, "meta": meta}
+
+    def read_post(self, post_id: Optional[str] = None, slug: Optional[str] = None) -> JSONResponse:
+        """
+        Read a single post by ID or slug.
+
+        :param Optional[str] post_id: ID of post.
+        :param Optional[str] slug: Slug of post.
+
+        :returns: JSONResponse
+        """
+        post = self.posts.get(post_id if slug is None else self.slugs.get(slug))
+        if post is None:
+            return ghost_error(404, "NotFoundError", "Post not found.")
+        return JSONResponse({"posts": [post]})
+
+    def read_user(self, user_id: str, resource_type: str) -> JSONResponse:
+        """
+        Read a single staff user by ID.
+
+        :param str user_id: ID of user.
+        :param str resource_type: Response key (`users` for Admin API, `authors` for Content API).
+
+        :returns: JSONResponse
+        """
+        for user in self.users:
+            if user["id"] == user_id:
+                return JSONResponse({resource_type: [user]})
+        return ghost_error(404, "NotFoundError", "User not found.")
+
+    def admin_router(self) -> APIRouter:
+        """
+        Admin API routes.
+
+        :returns: APIRouter
+        """
+        admin = APIRouter(prefix=ADMIN_PREFIX)
+
+        @admin.post("/session/")
+        async def create_session():
+            return JSONResponse({}, status_code=201)
+
+        @admin.get("/posts")
+        @admin.get("/posts/")
+        async def browse_posts(request: Request):
+            return self.browse(list(self.posts.values()), request, "posts")
+
+        @admin.get("/posts/slug/{slug}/")
+        async def read_post_by_slug(slug: str):
+            return self.read_post(slug=slug)
+
+        @admin.get("/posts/{post_id}/")
+        async def read_post(post_id: str):
+            return self.read_post(post_id=post_id)
+
+        @admin.put("/posts/{post_id}/")
+        async def edit_post(post_id: str, request: Request):
+            if post_id not in self.posts:
+                return ghost_error(404, "NotFoundError", "Post not found.")
+            body = await request.json()
+            self.posts[post_id].update(body["posts"][0])
+            return {"posts": [self.posts[post_id]]}
+
+        @admin.get("/pages")
+        @admin.get("/pages/")
+        async def browse_pages(request: Request):
+            return self.browse(self.pages, request, "pages")
+
+        @admin.get("/users")
+        @admin.get("/users/")
+        async def browse_users(request: Request):
+            return self.browse(self.users, request, "users")
+
+        @admin.get("/users/{user_id}/")
+        async def read_user(user_id: str):
+            return self.read_user(user_id, "users")
+
+        @admin.get("/members")
+        @admin.get("/members/")
+        async def browse_members(request: Request):
+            return self.browse(self.members, request, "members")
+
+        @admin.post("/members/")
+        async def add_member(request: Request):
+            body = await request.json()
+            member = (body.get("members") or [body])[0]
+            if any(existing["email"] == member.get("email") for existing in self.members):
+                return ghost_error(422, "ValidationError", "Member already exists.")
+            member = {"id": f"{len(self.members) + 1:024x}", "status": "free", **member}
+            self.members.append(member)
+            return JSONResponse({"members": [member]}, status_code=201)
+
+        return admin
+
+    def content_router(self) -> APIRouter:
+        """
+        Content API routes.
+
+        :returns: APIRouter
+        """
+        content = APIRouter(prefix=CONTENT_PREFIX)
+
+        @content.get("/posts/")
+        async def browse_posts(request: Request):
+            return self.browse(list(self.posts.values()), request, "posts")
+
+        @content.get("/posts/slug/{slug}/")
+        async def read_post_by_slug(slug: str):
+            return self.read_post(slug=slug)
+
+        @content.get("/pages/")
+        async def browse_pages(request: Request):
+            return self.browse(self.pages, request, "pages")
+
+        @content.get("/authors/")
+        async def browse_authors(request: Request):
+            return self.browse(self.users, request, "authors")
+
+        @content.get("/authors/{user_id}/")
+        async def read_author(user_id: str):
+            return self.read_user(user_id, "authors")
+
+        return content
+
+    def control_router(self) -> APIRouter:
+        """
+        Routes to inspect & reconfigure the fake itself; never delayed, failed or authenticated.
+
+        :returns: APIRouter
+        """
+        control = APIRouter(prefix="/__fake__")
+
+        @control.get("/faults")
+        async def get_faults():
+            return self.faults
+
+        @control.put("/faults")
+        async def put_faults(request: Request):
+            return self.configure(**await request.json())
+
+        @control.get("/stats")
+        async def get_stats():
+            return {**self.stats, "members": len(self.members)}
+
+        return control
+
+    async def inject_faults(self, request: Request, call_next):
+        """
+        Authenticate API requests, then apply configured latency & errors.
+
+        :param Request request: Incoming request.
+        :param call_next: Next ASGI handler.
+        """
+        path = request.url.path
+        if path.startswith("/__fake__"):
+            return await call_next(request)
+        self.stats["requests"] += 1
+        if path.startswith(ADMIN_PREFIX):
+            error = self.verify_admin_token(request.headers.get("Authorization"))
+        elif request.query_params.get("key") != self.content_api_key:
+            error = "Unknown Content API Key."
+        else:
+            error = None
+        delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if error is not None:
+            self.stats["unauthorized"] += 1
+            return ghost_error(401, "UnauthorizedError", error)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            return ghost_error(self.error_status, "InternalServerError", "Injected error.")
+        return await call_next(request)
+
+    def create_app(self) -> FastAPI:
+        """
+        Build ASGI app serving this fake.
+
+        :returns: FastAPI
+        """
+        api = FastAPI(title="Fake Ghost API", docs_url=None, redoc_url=None, openapi_url=None)
+        api.middleware("http")(self.inject_faults)
+        api.include_router(self.admin_router())
+        api.include_router(self.content_router())
+        api.include_router(self.control_router())
+        return api
+
+
+def create_fake_ghost(**kwargs) -> FastAPI:
+    """
+    Build a fake Ghost API app; accepts the same arguments as `FakeGhost`.
+
+    :returns: FastAPI
+    """
+    return FakeGhost(**kwargs).create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve a fake Ghost Admin & Content API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2368)
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--client-id", default="fake")
+    parser.add_argument("--secret", default="00" * 32)
+    parser.add_argument("--content-api-key", default="fake")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    args = parser.parse_args()
+    fake = FakeGhost(
+        posts=args.posts,
+        client_id=args.client_id,
+        secret=args.secret,
+        content_api_key=args.content_api_key,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    uvicorn.run(fake.create_app(), host=args.host, port=args.port, log_level="warning")
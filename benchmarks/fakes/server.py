@@ -0,0 +1,67 @@
+"""Serve an ASGI app from a background thread on a free local port."""
+
+from threading import Thread
+from time import sleep
+
+import uvicorn
+
+
+class LocalServer:
+    """ASGI app served by uvicorn on localhost, for the life of a `with` block."""
+
+    def __init__(self, app, host: str = "127.0.0.1"):
+        """
+        Local server constructor.
+
+        :param app: ASGI application to serve.
+        :param str host: Interface to bind to.
+        """
+        self.host = host
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=0, log_level="warning", lifespan="off"))
+        self.thread = Thread(target=self.server.run, daemon=True)
+
+    @property
+    def port(self) -> int:
+        """
+        Port the server is bound to.
+
+        :returns: int
+        """
+        return self.server.servers[0].sockets[0].getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the running server.
+
+        :returns: str
+        """
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10.0) -> "LocalServer":
+        """
+        Start serving & block until the socket is bound.
+
+        :param float timeout: Seconds to wait for the server to start.
+
+        :returns: LocalServer
+        """
+        self.thread.start()
+        waited = 0.0
+        while not self.server.started:
+            if waited > timeout or not self.thread.is_alive():
+                raise RuntimeError("Local server failed to start.")
+            sleep(0.01)
+            waited += 0.01
+        return self
+
+    def stop(self) -> None:
+        """Stop serving & wait for the server thread to exit."""
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+    def __enter__(self) -> "LocalServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,108 @@
+"""
+Benchmark cold import of the API entry point.
+
+Imports `asgi` in fresh interpreters with `python -X importtime` and reports the median cumulative import time,
+the heaviest top-level packages, and whether heavy SDKs which should only load on first use were imported.
+Run with `python -m benchmarks.import_time`.
+"""
+
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from os import environ
+from statistics import median
+from tempfile import gettempdir
+from typing import Dict, List
+
+from config import settings
+
+ROUNDS = 5
+TOP_PACKAGES = 15
+MODULE = "asgi"
+
+# SDKs which are only needed once a client is first used
+DEFERRED_SDKS = [
+    "github",
+    "google.cloud.bigquery",
+    "google.cloud.storage",
+    "pandas",
+    "PIL",
+    "twilio",
+]
+
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def import_profile(module: str) -> List[dict]:
+    """
+    Import a module in a fresh interpreter & parse its `-X importtime` report.
+
+    :param str module: Name of module to import.
+
+    :returns: List[dict]
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=gettempdir(),
+        env={**environ, "PYTHONPATH": settings.BASE_DIR},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            profile.append(
+                {
+                    "module": name,
+                    "self_us": int(self_us),
+                    "cumulative_us": int(cumulative_us),
+                    "depth": (len(indent) - 1) // 2,
+                }
+            )
+    return profile
+
+
+def top_packages(profile: List[dict], limit: int) -> Dict[str, float]:
+    """
+    Sum self import time per top-level package, heaviest first.
+
+    :param List[dict] profile: Parsed `-X importtime` report.
+    :param int limit: Number of packages to return.
+
+    :returns: Dict[str, float]
+    """
+    totals = defaultdict(int)
+    for entry in profile:
+        totals[entry["module"].split(".")[0]] += entry["self_us"]
+    heaviest = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return {package: round(us / 1000, 1) for package, us in heaviest}
+
+
+def run() -> dict:
+    """
+    Run import time benchmark.
+
+    :returns: dict
+    """
+    profiles = [import_profile(MODULE) for _ in range(ROUNDS)]
+    totals = [next(entry["cumulative_us"] for entry in profile if entry["module"] == MODULE) for profile in profiles]
+    imported = {entry["module"] for entry in profiles[-1]}
+    return {
+        "benchmark": "import_time",
+        "module": MODULE,
+        "rounds": ROUNDS,
+        "median_ms": round(median(totals) / 1000, 1),
+        "min_ms": round(min(totals) / 1000, 1),
+        "modules_imported": len(imported),
+        "deferred_sdks_imported": [sdk for sdk in DEFERRED_SDKS if sdk in imported],
+        "top_packages_ms": top_packages(profiles[-1], TOP_PACKAGES),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
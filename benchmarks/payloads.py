@@ -0,0 +1,129 @@
+"""Representative webhook payloads sent by Ghost, Github & BuyMeACoffee."""
+
+import json
+import random
+
+from benchmarks.fakes.ghost import seed_posts
+from database.schemas import PostUpdate
+
+ADMIN = {"id": "1", "name": "Admin", "slug": "admin", "roles": []}
+
+
+def post_update(n: int = 0) -> dict:
+    """
+    Ghost `post.updated` webhook for a seeded post.
+
+    :param int n: Index of seeded post.
+
+    :returns: dict
+    """
+    post = seed_posts(n + 1)[n]
+    return {"post": {"current": {**post, "authors": [ADMIN], "primary_author": ADMIN}, "previous": None}}
+
+
+def large_post_update(size: int = 200_000) -> bytes:
+    """
+    Ghost `post.updated` webhook for a real post, with its content repeated to roughly `size` bytes.
+
+    :param int size: Approximate size of encoded payload in bytes.
+
+    :returns: bytes
+    """
+    post = dict(PostUpdate.Config.json_schema_extra["current"])
+    content = sum(len(json.dumps(post[field])) for field in ("mobiledoc", "html", "plaintext"))
+    repeats = max(1, round((size - len(json.dumps(post)) + content) / content))
+    # Webhook schemas treat `mobiledoc` as an opaque string, so its content is repeated as-is
+    post.update(
+        mobiledoc=post["mobiledoc"] * repeats,
+        html=post["html"] * repeats,
+        plaintext=post["plaintext"] * repeats,
+    )
+    return json.dumps({"post": {"current": post, "previous": {"updated_at": post["updated_at"]}}}).encode()
+
+
+def tag_update(n: int = 0) -> dict:
+    """
+    Ghost `tag.updated` webhook.
+
+    :param int n: Index of seeded tag.
+
+    :returns: dict
+    """
+    return {"current": {"id": f"{n:024x}", "name": f"Tag {n}", "slug": f"tag-{n}"}, "previous": None}
+
+
+def donation(coffee_id: int) -> dict:
+    """
+    BuyMeACoffee donation webhook.
+
+    :param int coffee_id: Unique ID of donation.
+
+    :returns: dict
+    """
+    return {
+        "name": "Benchmark",
+        "email": "benchmark@example.com",
+        "count": 1,
+        "message": "Benchmark donation.",
+        "link": f"https://buymeacoffee.com/hackersslackers/c/{coffee_id}",
+        "coffee_id": coffee_id,
+    }
+
+
+def github_pr(sender: str = "dependabot-preview[bot]") -> dict:
+    """
+    Github `pull_request` webhook (ignored senders skip SMS notifications).
+
+    :param str sender: Github username which opened the PR.
+
+    :returns: dict
+    """
+    return {
+        "action": "opened",
+        "sender": {"login": sender},
+        "pull_request": {"number": 1, "title": "Benchmark PR", "body": "", "url": "https://example.com/pull/1"},
+        "repository": {"name": "benchmark", "full_name": "benchmark/benchmark"},
+    }
+
+
+def ghost_subscriber() -> dict:
+    """
+    Ghost `member.deleted` webhook.
+
+    :returns: dict
+    """
+    member = {
+        "id": "1",
+        "uuid": "00000000-0000-0000-0000-000000000001",
+        "email": "benchmark@example.com",
+        "name": "Benchmark",
+    }
+    return {"current": member, "previous": member}
+
+
+def mobiledoc(n: int, images: int = 6) -> str:
+    """
+    Synthetic post mobiledoc mixing image cards with alt text, captions only, or neither, plus a gallery.
+
+    :param int n: Index of post; seeds the mix of cards so documents are identical between runs.
+    :param int images: Number of image cards.
+
+    :returns: str
+    """
+    rng = random.Random(n)
+    cards = []
+    for i in range(images):
+        payload = {"src": f"https://cdn.example.com/2024/01/post-{n}_figure-{i}@2x.jpg", "cardWidth": ""}
+        kind = rng.choice(("alt", "caption", "bare", "empty"))
+        if kind == "alt":
+            payload["alt"] = f"Figure {i} of post {n}"
+        elif kind == "caption":
+            payload["caption"] = f'Figure {i} from <a href="https://example.com/{n}">the docs</a>'
+        elif kind == "empty":
+            payload["alt"] = ""
+        cards.append(["image", payload])
+    gallery = [{"src": f"https://cdn.example.com/2024/01/gallery-{n}-{i}.png", "alt": ""} for i in range(3)]
+    cards.append(["gallery", {"images": gallery}])
+    sections = [[10, i] for i in range(len(cards))]
+    sections += [[1, "p", [[0, [], 0, f"Paragraph {p} of post {n}. " * 20]]] for p in range(20)]
+    return json.dumps({"version": "0.3.1", "atoms": [], "cards": cards, "markups": [], "sections": sections})
@@ -0,0 +1,74 @@
+"""
+Benchmark API startup: `create_app()`, lifespan startup and first-request latency per router.
+
+Expects to run against local stand-ins (see `python -m benchmarks`), in a fresh interpreter so nothing is warm.
+Run alone with `python -m benchmarks.startup`.
+"""
+
+import json
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from benchmarks import payloads
+from benchmarks.environment import IMAGE_FOLDER
+
+# (router, method, path, payload) of the first request sent to each router
+FIRST_REQUESTS: List[Tuple[str, str, str, Callable[[], dict]]] = [
+    ("accounts", "GET", "/account/comments/", None),
+    ("analytics", "GET", "/analytics/searches/suggest?q=py", None),
+    ("authors", "POST", "/authors/post/updated/", payloads.post_update),
+    ("donations", "GET", "/donation/", None),
+    ("github", "POST", "/github/pr/", payloads.github_pr),
+    ("images", "GET", f"/images/?directory={IMAGE_FOLDER}", None),
+    ("newsletter", "DELETE", "/newsletter/", payloads.ghost_subscriber),
+    ("posts", "GET", f"/posts/{0:024x}/", None),
+    ("tags", "POST", "/tags/", payloads.tag_update),
+]
+
+
+def elapsed_ms(start: float) -> float:
+    """
+    Milliseconds elapsed since `start`.
+
+    :param float start: Value of `perf_counter()` when timing began.
+
+    :returns: float
+    """
+    return round((perf_counter() - start) * 1000, 2)
+
+
+def run() -> dict:
+    """
+    Run startup benchmark.
+
+    :returns: dict
+    """
+    start = perf_counter()
+    from fastapi.testclient import TestClient
+
+    from app import create_app
+
+    import_ms = elapsed_ms(start)
+    start = perf_counter()
+    api = create_app()
+    create_app_ms = elapsed_ms(start)
+    client = TestClient(api, raise_server_exceptions=False)
+    start = perf_counter()
+    with client:
+        lifespan_ms = elapsed_ms(start)
+        first_requests = {}
+        for router, method, url, payload in FIRST_REQUESTS:
+            start = perf_counter()
+            response = client.request(method, url, json=payload() if payload else None)
+            first_requests[router] = {"ms": elapsed_ms(start), "status": response.status_code}
+    return {
+        "benchmark": "startup",
+        "import_ms": import_ms,
+        "create_app_ms": create_app_ms,
+        "lifespan_ms": lifespan_ms,
+        "first_request": first_requests,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
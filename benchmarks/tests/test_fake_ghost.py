@@ -0,0 +1,73 @@
+"""Test the Ghost client against the local fake Ghost API."""
+
+import pytest
+import requests
+
+from benchmarks.fakes import FakeGhost, LocalServer
+from clients.ghost import Ghost
+from clients.transport import get_session
+from config import settings
+
+
+@pytest.fixture
+def fake_ghost() -> FakeGhost:
+    return FakeGhost(posts=40, pages=20, client_id="test", secret="ab" * 32, content_api_key="content")
+
+
+@pytest.fixture
+def ghost_url(fake_ghost: FakeGhost) -> str:
+    with LocalServer(fake_ghost.create_app()) as server:
+        yield server.url
+
+
+def ghost_client(url: str, secret: str = "ab" * 32) -> Ghost:
+    return Ghost(
+        admin_api_url=f"{url}/ghost/api/admin",
+        api_version="v3.0",
+        content_api_url=f"{url}/ghost/api/content",
+        content_api_key="content",
+        client_id="test",
+        client_secret=secret,
+    )
+
+
+def test_admin_api_reads(ghost_url: str):
+    """Posts are served by ID, slug & in bulk; pages are paginated like Ghost."""
+    ghost = ghost_client(ghost_url)
+    assert ghost.get_post(f"{3:024x}")["slug"] == "post-3"
+    assert ghost.get_post_by_slug("post-7")["title"] == "Post 7"
+    posts = ghost.get_posts_by_slugs(["post-1", "post-2", "missing"], fields="slug,title,url")
+    assert sorted(post["slug"] for post in posts) == ["post-1", "post-2"]
+    assert set(posts[0]) == {"slug", "title", "url"}
+    assert len(ghost.get_pages()) == 15
+    assert len(ghost.get_all_authors()) == 5
+    assert ghost.get_author("2")[0]["slug"] == "author-1"
+
+
+def test_admin_api_members(ghost_url: str, fake_ghost: FakeGhost):
+    """Members are created once per email address."""
+    ghost = ghost_client(ghost_url)
+    body = {"members": [{"email": "member@example.com", "name": "Member"}]}
+    assert ghost.create_member(body)[1] == 201
+    assert ghost.create_member(body)[1] == 422
+    assert len(fake_ghost.members) == 1
+
+
+def test_admin_api_rejects_bad_tokens(ghost_url: str, fake_ghost: FakeGhost):
+    """Tokens signed with the wrong secret, or sent without the `Ghost` scheme, are rejected."""
+    assert ghost_client(ghost_url, secret="cd" * 32).get_post(f"{3:024x}") is None
+    resp = requests.get(f"{ghost_url}/ghost/api/admin/posts/", headers={"Authorization": "token"}, timeout=5)
+    assert resp.status_code == 401
+    assert fake_ghost.stats["unauthorized"] == 2
+
+
+def test_fault_injection(ghost_url: str, fake_ghost: FakeGhost, monkeypatch):
+    """Injected errors are returned in Ghost's error format, retried & can be changed at runtime."""
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF", 0.01)
+    get_session.cache_clear()
+    ghost = ghost_client(ghost_url)
+    requests.put(f"{ghost_url}/__fake__/faults", json={"error_rate": 1.0, "error_status": 503}, timeout=5)
+    assert ghost.get_posts_by_slugs(["post-1"]) is None
+    fake_ghost.configure(error_rate=0.0)
+    assert ghost.get_posts_by_slugs(["post-1"])[0]["slug"] == "post-1"
+    assert fake_ghost.stats["injected_errors"] == settings.HTTP_RETRIES + 1
@@ -0,0 +1,80 @@
+"""
+Benchmark decoding & validating large Ghost post webhooks.
+
+Compares the full `PostUpdate` schema decoded with `json` against parsing each route's lean schema straight from
+the request body as webhook routes do, on a real post scaled to ~200 KB.
+Run with `python -m benchmarks webhook_parsing`.
+"""
+
+import json
+from time import perf_counter
+from typing import Any, Callable, Dict
+
+from app.routing import parse_body
+from benchmarks.payloads import large_post_update
+from database.schemas import (
+    LeanPostAuthorsUpdate,
+    LeanPostContentUpdate,
+    LeanPostUpdate,
+    PostUpdate,
+)
+
+PAYLOAD_SIZE = 200_000
+ITERATIONS = 100
+ROUNDS = 7
+
+
+def time_parsers(body: bytes, parsers: Dict[str, Callable[[bytes], Any]]) -> Dict[str, dict]:
+    """
+    Time the best of several rounds of parsing a payload with each parser, interleaving parsers within each round.
+
+    :param bytes body: Encoded webhook payload.
+    :param Dict[str, Callable[[bytes], Any]] parsers: Map of names -> functions decoding & validating a payload.
+
+    :returns: Dict[str, dict]
+    """
+    timings = {name: [] for name in parsers}
+    for _ in range(ROUNDS):
+        for name, parse in parsers.items():
+            start = perf_counter()
+            for _ in range(ITERATIONS):
+                parse(body)
+            timings[name].append((perf_counter() - start) / ITERATIONS)
+    return {
+        name: {
+            "us_per_payload": round(min(times) * 1_000_000, 1),
+            "mb_per_sec": round(len(body) / min(times) / 1_000_000, 1),
+        }
+        for name, times in timings.items()
+    }
+
+
+def run() -> dict:
+    """
+    Run webhook parsing benchmark.
+
+    :returns: dict
+    """
+    body = large_post_update(PAYLOAD_SIZE)
+    results = time_parsers(
+        body,
+        {
+            "full": lambda payload: PostUpdate.model_validate(json.loads(payload)),
+            "posts": lambda payload: parse_body(payload, LeanPostContentUpdate),
+            "authors": lambda payload: parse_body(payload, LeanPostAuthorsUpdate),
+            "images": lambda payload: parse_body(payload, LeanPostUpdate),
+        },
+    )
+    full = results["full"]["us_per_payload"]
+    return {
+        "benchmark": "webhook_parsing",
+        "payload_bytes": len(body),
+        **results,
+        "speedup": {
+            route: round(full / results[route]["us_per_payload"], 2) for route in ("posts", "authors", "images")
+        },
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
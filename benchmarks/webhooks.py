@@ -0,0 +1,78 @@
+"""
+Benchmark throughput of representative webhooks against local stand-ins.
+
+Sends sequential requests in-process & reports throughput, latency percentiles and response status counts.
+Expects to run against local stand-ins (see `python -m benchmarks`). Run alone with `python -m benchmarks.webhooks`.
+"""
+
+import json
+from collections import Counter
+from itertools import count
+from statistics import quantiles
+from time import perf_counter
+from typing import Callable, Dict, Tuple
+
+from benchmarks import payloads
+
+coffee_ids = count(1)
+
+# name -> (method, path, payload, requests); `/posts/` sleeps for a second per update, so it gets fewer requests
+WEBHOOKS: Dict[str, Tuple[str, str, Callable[[], dict], int]] = {
+    "posts": ("POST", "/posts/", payloads.post_update, 5),
+    "tags": ("POST", "/tags/", payloads.tag_update, 100),
+    "images": ("POST", "/images/", payloads.post_update, 100),
+    "donation": ("POST", "/donation/", lambda: payloads.donation(next(coffee_ids)), 100),
+    "github_renovate": ("POST", "/github/pr/", lambda: payloads.github_pr("renovate[bot]"), 100),
+}
+
+
+def time_webhook(client, method: str, url: str, payload: Callable[[], dict], requests: int) -> dict:
+    """
+    Send a webhook repeatedly & summarize latencies.
+
+    :param TestClient client: Client for API under test.
+    :param str method: HTTP method.
+    :param str url: Path of webhook endpoint.
+    :param Callable[[], dict] payload: Builds the request body for each request.
+    :param int requests: Number of requests to send.
+
+    :returns: dict
+    """
+    latencies = []
+    statuses = Counter()
+    start = perf_counter()
+    for _ in range(requests):
+        body = payload()
+        sent = perf_counter()
+        response = client.request(method, url, json=body)
+        latencies.append((perf_counter() - sent) * 1000)
+        statuses[str(response.status_code)] += 1
+    total = perf_counter() - start
+    percentiles = quantiles(latencies, n=20) if len(latencies) > 1 else latencies * 19
+    return {
+        "requests": requests,
+        "requests_per_sec": round(requests / total, 1),
+        "p50_ms": round(percentiles[9], 2),
+        "p95_ms": round(percentiles[18], 2),
+        "max_ms": round(max(latencies), 2),
+        "status": dict(statuses),
+    }
+
+
+def run() -> dict:
+    """
+    Run webhook benchmark.
+
+    :returns: dict
+    """
+    from fastapi.testclient import TestClient
+
+    from app import create_app
+
+    with TestClient(create_app(), raise_server_exceptions=False) as client:
+        results = {name: time_webhook(client, *webhook) for name, webhook in WEBHOOKS.items()}
+    return {"benchmark": "webhooks", "webhooks": results}
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
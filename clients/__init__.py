@@ -1,52 +1,185 @@
-"""Initialize clients and third-party SDKs."""
+"""Lazily initialize clients and third-party SDKs.
 
-from github import Github
-from google.cloud import bigquery
+Each provider builds its client on first use and caches it for the life of the process, so importing the API
+doesn't pay for SDK imports or client construction up-front. Providers double as FastAPI dependencies
+(ie: `ghost: Ghost = Depends(get_ghost)`) and can be swapped in tests via `app.dependency_overrides`.
+"""
+
+from functools import cache
+from typing import TYPE_CHECKING
 
 from clients.ghost import Ghost
-from clients.img import ImageTransformer
 from clients.mail import Mailgun
-from clients.sms import Twilio
+from clients.mail_queue import BatchMailQueue
+from clients.sms_queue import SMSQueue
+from clients.transport import pooled_session
 from config import settings
 
-# Google Cloud Storage
-images = ImageTransformer(
-    gcp_project_name=settings.GCP_PROJECT_NAME,
-    gcp_api_credentials=settings.GCP_CREDENTIALS,
-    bucket_name=settings.GCP_BUCKET_NAME,
-    bucket_url=settings.GCP_BUCKET_URL,
-)
-
-# Ghost Admin Client
-ghost = Ghost(
-    admin_api_url=settings.GHOST_ADMIN_API_URL,
-    api_version=settings.GHOST_API_VERSION,
-    content_api_url=settings.GHOST_CONTENT_API_URL,
-    client_id=settings.GHOST_CLIENT_ID,
-    client_secret=settings.GHOST_ADMIN_API_KEY,
-    content_api_key=settings.GHOST_CONTENT_API_KEY,
-)
-
-# Twilio SMS
-sms = Twilio(
-    sid=settings.TWILIO_ACCOUNT_SID,
-    token=settings.TWILIO_AUTH_TOKEN,
-    recipient=settings.TWILIO_RECIPIENT_PHONE,
-    sender=settings.TWILIO_SENDER_PHONE,
-)
-
-# Google BigQuery
-gbq = bigquery.Client(
-    project=settings.GCP_PROJECT_NAME,
-    credentials=settings.GCP_CREDENTIALS,
-)
-
-# Mailgun SMTP
-mailgun = Mailgun(
-    settings.MAILGUN_EMAIL_SERVER,
-    settings.MAILGUN_FROM_SENDER_EMAIL,
-    settings.MAILGUN_SENDER_API_KEY,
-)
-
-# Github
-gh = Github(settings.GH_API_KEY)
+if TYPE_CHECKING:
+    from google.cloud.bigquery import Client as BigQueryClient
+    from google.cloud.bigquery_storage import BigQueryReadClient
+    from mixpanel import Mixpanel
+
+    from clients.img import ImageTransformer
+    from clients.mixpanel_buffer import MixpanelBuffer
+    from clients.sms import Twilio
+
+
+@cache
+def get_images() -> "ImageTransformer":
+    """
+    Google Cloud Storage image transformer.
+
+    :returns: ImageTransformer
+    """
+    from clients.img import ImageTransformer
+
+    return ImageTransformer(
+        gcp_project_name=settings.GCP_PROJECT_NAME,
+        gcp_api_credentials=settings.GCP_CREDENTIALS,
+        bucket_name=settings.GCP_BUCKET_NAME,
+        bucket_url=settings.GCP_BUCKET_URL,
+    )
+
+
+@cache
+def get_ghost() -> Ghost:
+    """
+    Ghost Admin client.
+
+    :returns: Ghost
+    """
+    return Ghost(
+        admin_api_url=settings.GHOST_ADMIN_API_URL,
+        api_version=settings.GHOST_API_VERSION,
+        content_api_url=settings.GHOST_CONTENT_API_URL,
+        client_id=settings.GHOST_CLIENT_ID,
+        client_secret=settings.GHOST_ADMIN_API_KEY,
+        content_api_key=settings.GHOST_CONTENT_API_KEY,
+    )
+
+
+@cache
+def get_sms() -> "Twilio":
+    """
+    Twilio SMS client.
+
+    :returns: Twilio
+    """
+    from clients.sms import Twilio
+
+    return Twilio(
+        sid=settings.TWILIO_ACCOUNT_SID,
+        token=settings.TWILIO_AUTH_TOKEN,
+        recipient=settings.TWILIO_RECIPIENT_PHONE,
+        sender=settings.TWILIO_SENDER_PHONE,
+    )
+
+
+@cache
+def get_sms_queue() -> SMSQueue:
+    """
+    Outbound SMS queue which digests & rate limits messages sent via Twilio.
+
+    :returns: SMSQueue
+    """
+    return SMSQueue(
+        send=lambda body: get_sms().send_message(body),
+        digest_window=settings.SMS_DIGEST_WINDOW,
+        rate_per_minute=settings.SMS_RATE_PER_MINUTE,
+        burst=settings.SMS_BURST,
+        max_length=settings.SMS_MAX_LENGTH,
+    )
+
+
+@cache
+def get_gbq() -> "BigQueryClient":
+    """
+    Google BigQuery client.
+
+    :returns: BigQueryClient
+    """
+    from google.auth.transport.requests import AuthorizedSession
+    from google.cloud import bigquery
+
+    return bigquery.Client(
+        project=settings.GCP_PROJECT_NAME,
+        credentials=settings.GCP_CREDENTIALS,
+        _http=pooled_session("bigquery", AuthorizedSession(settings.GCP_CREDENTIALS)),
+    )
+
+
+@cache
+def get_gbq_storage() -> "BigQueryReadClient":
+    """
+    Google BigQuery Storage Read API client; streams query results as Arrow batches.
+
+    :returns: BigQueryReadClient
+    """
+    from google.cloud import bigquery_storage
+
+    return bigquery_storage.BigQueryReadClient(credentials=settings.GCP_CREDENTIALS)
+
+
+@cache
+def get_mailgun() -> Mailgun:
+    """
+    Mailgun SMTP client.
+
+    :returns: Mailgun
+    """
+    return Mailgun(
+        settings.MAILGUN_EMAIL_SERVER,
+        settings.MAILGUN_FROM_SENDER,
+        settings.MAILGUN_SENDER_API_KEY,
+    )
+
+
+@cache
+def get_welcome_queue() -> BatchMailQueue:
+    """
+    Outbound queue batching newsletter welcome emails sent via Mailgun.
+
+    :returns: BatchMailQueue
+    """
+    return BatchMailQueue(
+        send=lambda recipients: get_mailgun().send_template_batch(
+            recipients,
+            subject=settings.MAILGUN_SUBJECT_LINE,
+            template=settings.MAILGUN_NEWSLETTER_TEMPLATE,
+            variables={"name": "%recipient.name%"},
+        ),
+        batch_window=settings.MAILGUN_BATCH_WINDOW,
+        batch_size=settings.MAILGUN_BATCH_SIZE,
+        max_retries=settings.MAILGUN_MAX_RETRIES,
+        backoff=settings.MAILGUN_RETRY_BACKOFF,
+    )
+
+
+@cache
+def get_mixpanel_buffer() -> "MixpanelBuffer":
+    """
+    Mixpanel consumer shared per process, sending events & profile updates in batches.
+
+    :returns: MixpanelBuffer
+    """
+    from clients.mixpanel_buffer import MixpanelBuffer
+
+    return MixpanelBuffer(
+        batch_size=settings.MIXPANEL_BATCH_SIZE,
+        flush_interval=settings.MIXPANEL_FLUSH_INTERVAL,
+        request_timeout=settings.MIXPANEL_REQUEST_TIMEOUT,
+        max_attempts=settings.MIXPANEL_MAX_ATTEMPTS,
+    )
+
+
+@cache
+def get_mixpanel() -> "Mixpanel":
+    """
+    Mixpanel client buffering messages via `get_mixpanel_buffer()`.
+
+    :returns: Mixpanel
+    """
+    from mixpanel import Mixpanel
+
+    return Mixpanel(settings.MIXPANEL_API_TOKEN, consumer=get_mixpanel_buffer())
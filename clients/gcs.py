@@ -1,12 +1,15 @@
 """Google Cloud Storage client and image transformer."""
 
 import re
+from functools import cached_property
 from typing import Iterator, Tuple
 
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
 from google.cloud.storage.blob import Blob
 from google.cloud.storage.client import Bucket, Client
 
+from clients.transport import pooled_session
 from log import LOGGER
 
 
@@ -25,16 +28,17 @@ class GCS:
         self.bucket_name = bucket_name
         self.bucket_url = bucket_url
 
-    @property
+    @cached_property
     def client(self) -> Client:
         """
-        Google Cloud Storage client.
+        Google Cloud Storage client, created on first use.
 
         :returns: Client
         """
         return storage.Client(
             project=self.gcp_project_name,
             credentials=self.gcp_api_credentials,
+            _http=pooled_session("gcs", AuthorizedSession(self.gcp_api_credentials)),
         )
 
     @property
@@ -3,10 +3,11 @@
 from datetime import datetime as date
 from typing import List, Optional, Tuple
 
+import httpx
 import jwt
-import requests
 from requests.exceptions import HTTPError
 
+from clients.transport import get_async_client, get_session
 from log import LOGGER
 
 
@@ -38,12 +39,13 @@ class Ghost:
         self.content_api_url = content_api_url
         self.secret = client_secret
         self.content_api_key = content_api_key
+        self.session = get_session("ghost")
 
     def _https_session(self) -> None:
         """Authorize HTTPS session with Ghost admin."""
         endpoint = f"{self.admin_api_url}/session/"
-        headers = {"Authorization": self.session_token}
-        resp = requests.post(endpoint, headers=headers, timeout=20)
+        headers = {"Authorization": f"Ghost {self.session_token}"}
+        resp = self.session.post(endpoint, headers=headers, timeout=20)
         LOGGER.info(f"Authorization resulted in status code {resp.status_code}.")
 
     @property
@@ -73,7 +75,7 @@ class Ghost:
                 "formats": "mobiledoc,html",
             }
             endpoint = f"{self.admin_api_url}/posts/{post_id}/"
-            resp = requests.get(endpoint, headers=headers, params=params, timeout=20)
+            resp = self.session.get(endpoint, headers=headers, params=params, timeout=20)
             if resp.json().get("errors") is not None and resp.json().get("posts") is not None:
                 LOGGER.error(f"Failed to fetch post `{post_id}`: {resp.json().get('errors')[0]['message']}")
             post = resp.json()["posts"][0]
@@ -104,7 +106,7 @@ class Ghost:
                 "formats": "mobiledoc",
             }
             endpoint = f"{self.admin_api_url}/posts/slug/{post_slug}/"
-            resp = requests.get(endpoint, headers=headers, params=params, timeout=20)
+            resp = self.session.get(endpoint, headers=headers, params=params, timeout=20)
             post = resp.json()["posts"][0]
             LOGGER.info(f"Fetched Ghost post `{post['slug']}`")
             return post
@@ -115,6 +117,41 @@ class Ghost:
         except Exception as e:
             LOGGER.error(f"Unexpected error occurred while fetching post `{post_slug}`: {e}")
 
+    def get_posts_by_slugs(self, post_slugs: List[str], fields: Optional[str] = None) -> Optional[List[dict]]:
+        """
+        Fetch multiple Ghost posts by slug in a single request.
+
+        :param List[str] post_slugs: Unique slugs of posts to fetch.
+        :param Optional[str] fields: Comma-separated subset of post fields to return (ie: `slug,title,url`).
+
+        :returns: Optional[List[dict]]
+        """
+        if not post_slugs:
+            return []
+        try:
+            headers = {
+                "Authorization": f"Ghost {self.session_token}",
+                "Content-Type": "application/json",
+            }
+            params = {
+                "filter": f"slug:[{','.join(post_slugs)}]",
+                "limit": "all",
+            }
+            if fields is not None:
+                params["fields"] = fields
+            endpoint = f"{self.admin_api_url}/posts/"
+            resp = self.session.get(endpoint, headers=headers, params=params, timeout=20)
+            if resp.json().get("errors") is not None:
+                LOGGER.error(f"Failed to fetch Ghost posts by slug: {resp.json().get('errors')[0]['message']}")
+                return None
+            posts = resp.json().get("posts", [])
+            LOGGER.info(f"Fetched {len(posts)} of {len(post_slugs)} Ghost posts by slug")
+            return posts
+        except HTTPError as e:
+            LOGGER.error(f"Ghost HTTPError while fetching posts by slug: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected error occurred while fetching posts by slug: {e}")
+
     def get_pages(self) -> Optional[dict]:
         """
         Fetch Ghost pages.
@@ -127,7 +164,7 @@ class Ghost:
                 "Content-Type": "application/json",
             }
             endpoint = f"{self.admin_api_url}/pages"
-            resp = requests.get(endpoint, headers=headers, timeout=20)
+            resp = self.session.get(endpoint, headers=headers, timeout=20)
             if resp.json().get("errors") is not None:
                 LOGGER.error(f"Failed to fetch Ghost pages: {resp.json().get('errors')[0]['message']}")
             LOGGER.info(f"Fetched {len(resp.json())} Ghost pages")
@@ -139,6 +176,40 @@ class Ghost:
         except Exception as e:
             LOGGER.error(f"Unexpected error occurred while fetching pages: {e}")
 
+    def _update_post_request(self, post_id: str, body: dict) -> dict:
+        """
+        Build request updating post by ID, shared by the blocking & async clients.
+
+        :param str post_id: Ghost post ID
+        :param dict body: Payload containing post updates.
+
+        :returns: dict
+        """
+        return {
+            "url": f"{self.admin_api_url}/posts/{post_id}/",
+            "json": body,
+            "headers": {
+                "Authorization": f"Ghost {self.session_token}",
+                "Content-Type": "application/json",
+            },
+            "timeout": 20,
+        }
+
+    @staticmethod
+    def _parse_update_post_response(resp, slug: str) -> Optional[dict]:
+        """
+        Parse response of a post update from either client.
+
+        :param resp: Response of `requests` or `httpx`.
+        :param str slug: Human-readable unique identifier.
+
+        :returns: Optional[dict]
+        """
+        if resp.status_code == 200:
+            LOGGER.success(f"Successfully updated post `{slug}`")
+            return resp.json()
+        LOGGER.error(f"Failed to update post `{slug}` ({resp.status_code}): {resp.text}")
+
     def update_post(self, post_id: str, body: dict, slug: str) -> Optional[dict]:
         """
         Update post by ID.
@@ -150,23 +221,31 @@ class Ghost:
         :returns: Optional[dict]
         """
         try:
-            resp = requests.put(
-                f"{self.admin_api_url}/posts/{post_id}/",
-                json=body,
-                headers={
-                    "Authorization": self.session_token,
-                    "Content-Type": "application/json",
-                },
-                timeout=20,
-            )
-            if resp.status_code != 200:
-                LOGGER.success(f"Successfully updated post `{slug}`")
-                return resp.json()
+            resp = self.session.put(**self._update_post_request(post_id, body))
+            return self._parse_update_post_response(resp, slug)
         except HTTPError as e:
             LOGGER.error(f"HTTPError while updating Ghost post: {e}")
         except Exception as e:
             LOGGER.error(f"Unexpected error while updating Ghost post: {e}")
 
+    async def update_post_async(self, post_id: str, body: dict, slug: str) -> Optional[dict]:
+        """
+        Update post by ID without blocking the event loop.
+
+        :param str post_id: Ghost post ID
+        :param dict body: Payload containing post updates.
+        :param str slug: Human-readable unique identifier.
+
+        :returns: Optional[dict]
+        """
+        try:
+            resp = await get_async_client("ghost").put(**self._update_post_request(post_id, body))
+            return self._parse_update_post_response(resp, slug)
+        except httpx.HTTPError as e:
+            LOGGER.error(f"HTTPError while updating Ghost post: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected error while updating Ghost post: {e}")
+
     def get_all_authors(self) -> Optional[List[dict]]:
         """
         Fetch all Ghost authors.
@@ -179,7 +258,7 @@ class Ghost:
                 "Authorization": f"Ghost {self.session_token}",
                 "Content-Type": "application/json",
             }
-            resp = requests.get(f"{self.admin_api_url}/users", params=params, headers=headers, timeout=20)
+            resp = self.session.get(f"{self.admin_api_url}/users", params=params, headers=headers, timeout=20)
             if resp.status_code == 200:
                 return resp.json().get("users")
         except HTTPError as e:
@@ -200,7 +279,7 @@ class Ghost:
             headers = {
                 "Content-Type": "application/json",
             }
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.content_api_url}/authors/{author_id}/",
                 params=params,
                 headers=headers,
@@ -222,10 +301,10 @@ class Ghost:
         :returns: Optional[List[str]]
         """
         try:
-            resp = requests.post(
+            resp = self.session.post(
                 f"{self.admin_api_url}/members/",
                 json=body,
-                headers={"Authorization": self.session_token},
+                headers={"Authorization": f"Ghost {self.session_token}"},
                 timeout=20,
             )
             response = f'Successfully created new Ghost member `{body.get("email")}: {resp.json()}.'
@@ -250,7 +329,7 @@ class Ghost:
                 "filter": "type:post",
             }
             endpoint = f"{self.admin_api_url}/posts"
-            resp = requests.get(endpoint, headers=headers, params=params, timeout=20)
+            resp = self.session.get(endpoint, headers=headers, params=params, timeout=20)
             if resp.status_code == 200:
                 posts = resp.json()["posts"]
                 return [post["url"] for post in posts if post["status"] == "published"]
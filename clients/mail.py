@@ -1,10 +1,11 @@
 """Create Mailgun client."""
 
-from typing import List
+import json
+from typing import Dict, List
 
-import requests
 from requests import HTTPError, Response
 
+from clients.transport import get_session
 from log import LOGGER
 
 
@@ -16,6 +17,7 @@ class Mailgun:
         self.from_address = from_address
         self.api_key = api_key
         self.endpoint = f"https://api.mailgun.net/v3/{self.mail_server}/messages"
+        self.session = get_session("mailgun")
 
     def send_email(self, body: dict, test_mode=False) -> Response:
         """
@@ -29,16 +31,49 @@ class Mailgun:
         try:
             if test_mode is True:
                 body.update({"o:testmode": True})
-            return requests.post(
+            return self.session.post(
                 self.endpoint,
                 auth=("api", self.api_key),
                 data=body,
+                timeout=20,
             )
         except HTTPError as e:
             LOGGER.error(f"HTTPError error while sending email to `{body['to']}` subject `{body['subject']}`: {e}")
         except Exception as e:
             LOGGER.error(f"Unexpected error while sending email to `{body['to']}` subject `{body['subject']}`: {e}")
 
+    def send_template_batch(
+        self, recipients: Dict[str, dict], subject: str, template: str, variables: dict, test_mode=False
+    ) -> Response:
+        """
+        Send templated email to a batch of up to 1,000 recipients with a single Mailgun call.
+
+        Each recipient only sees their own address; `%recipient.<key>%` placeholders in `variables` are substituted
+        with the recipient's variables.
+
+        :param Dict[str, dict] recipients: Email addresses mapped to per-recipient variables.
+        :param str subject: Subject line of email.
+        :param str template: Name of Mailgun template.
+        :param dict variables: Template variables.
+        :param bool test_mode: Flag to indicate email is being sent for test purposes.
+
+        :returns: Response
+        """
+        body = {
+            "from": self.from_address,
+            "to": list(recipients),
+            "subject": subject,
+            "template": template,
+            "h:X-Mailgun-Variables": json.dumps(variables),
+            "recipient-variables": json.dumps(recipients),
+            "o:tracking": True,
+        }
+        if test_mode is True:
+            body.update({"o:testmode": True})
+        resp = self.session.post(self.endpoint, auth=("api", self.api_key), data=body, timeout=20)
+        resp.raise_for_status()
+        return resp
+
     def email_notification_new_comment(self, post: dict, recipient: List[str], comment: dict, test_mode=False) -> dict:
         """
         Notify author when a user comments on a post.
@@ -61,7 +96,8 @@ class Mailgun:
         }
         email_response = self.send_email(body, test_mode)
         if email_response.status_code == 200:
-            LOGGER.success(f"Successfully send comment notification to {recipient}: {body}")
+            LOGGER.success(f"Successfully send comment notification to {recipient}")
+            LOGGER.opt(lazy=True).debug("Comment notification payload: {}", lambda: body)
             return {
                 "status": {
                     "sent": True,
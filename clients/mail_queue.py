@@ -0,0 +1,121 @@
+"""Queue outbound emails, sending recipients which arrive together as Mailgun batches."""
+
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from log import LOGGER
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Check whether a failed send may succeed if retried; client errors other than rate limits won't.
+
+    :param Exception error: Error raised while sending.
+
+    :returns: bool
+    """
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+class BatchMailQueue:
+    """
+    Outbound email queue; webhooks enqueue recipients & return immediately.
+
+    Recipients arriving within `batch_window` seconds of each other are sent together in batches of up to
+    `batch_size`, with per-recipient variables. Failed batches are retried with exponential backoff, and Mailgun
+    calls run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, dict]], object],
+        batch_window: float,
+        batch_size: int,
+        max_retries: int,
+        backoff: float,
+    ):
+        """
+        Batch mail queue constructor.
+
+        :param Callable[[Dict[str, dict]], object] send: Blocking function which emails a batch of recipients.
+        :param float batch_window: Seconds to wait for further recipients before sending.
+        :param int batch_size: Maximum recipients per batch.
+        :param int max_retries: Number of times a failed batch is retried.
+        :param float backoff: Seconds to wait before the first retry; doubles with each retry.
+        """
+        self.send = send
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pending: Dict[str, dict] = {}
+        self._queued: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, email: str, variables: Optional[dict] = None) -> None:
+        """
+        Queue recipient to be emailed in the background; must be called from the event loop.
+
+        Recipients queued again before their batch is sent are only emailed once.
+
+        :param str email: Email address of recipient.
+        :param Optional[dict] variables: Recipient variables substituted into the email.
+        """
+        self.start()
+        self.pending[email] = variables or {}
+        self._queued.set()
+
+    def _take_batches(self) -> List[Dict[str, dict]]:
+        """
+        Remove pending recipients, split into batches of `batch_size`.
+
+        :returns: List[Dict[str, dict]]
+        """
+        recipients, self.pending = list(self.pending.items()), {}
+        return [dict(recipients[i : i + self.batch_size]) for i in range(0, len(recipients), self.batch_size)]
+
+    async def _deliver(self, recipients: Dict[str, dict]) -> None:
+        """
+        Send batch in a worker thread, retrying failures with exponential backoff.
+
+        :param Dict[str, dict] recipients: Recipients mapped to their variables.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                await asyncio.to_thread(self.send, recipients)
+                LOGGER.info(f"Sent email batch to {len(recipients)} recipient(s).")
+                return
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    LOGGER.error(f"Failed to send email batch to {len(recipients)} recipient(s): {e}")
+                    return
+                delay = self.backoff * 2**attempt
+                LOGGER.warning(f"Failed to send batch to {len(recipients)} recipient(s); retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+
+    async def _run(self) -> None:
+        """Wait for recipients, let a batch window elapse, then send everything queued."""
+        while True:
+            await self._queued.wait()
+            await asyncio.sleep(self.batch_window)
+            self._queued.clear()
+            for recipients in self._take_batches():
+                await self._deliver(recipients)
+
+    def start(self) -> None:
+        """Start sending queued emails on the running event loop."""
+        if self._task is None or self._task.done():
+            self._queued = asyncio.Event()
+            if self.pending:
+                self._queued.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the queue, sending any recipients still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for recipients in self._take_batches():
+            await self._deliver(recipients)
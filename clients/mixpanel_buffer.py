@@ -0,0 +1,198 @@
+"""Buffer Mixpanel events & profile updates, sending them in batches from a background thread."""
+
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Tuple, Union
+
+from mixpanel import Consumer, MixpanelException
+from requests.auth import HTTPBasicAuth
+
+from clients.transport import pooled_session
+from log import LOGGER
+from metrics import OUTBOUND_MESSAGES
+
+# Largest batch accepted by Mixpanel's ingestion endpoints
+MIXPANEL_MAX_BATCH_SIZE = 50
+
+MIXPANEL_PATHS = {"events": "track", "people": "engage", "groups": "groups", "imports": "import"}
+
+
+class PooledConsumer(Consumer):
+    """Mixpanel consumer sending requests via the pooled transport, retrying `POST`s (Mixpanel deduplicates them)."""
+
+    def __init__(self, request_timeout: float, api_host: str = "api.mixpanel.com"):
+        """
+        Pooled Mixpanel consumer constructor.
+
+        :param float request_timeout: Timeout of requests to Mixpanel in seconds.
+        :param str api_host: Mixpanel API domain.
+        """
+        super().__init__(request_timeout=request_timeout, api_host=api_host)
+        self.request_timeout = request_timeout
+        self.urls = {endpoint: f"https://{api_host}/{path}" for endpoint, path in MIXPANEL_PATHS.items()}
+        self.session = pooled_session("mixpanel", retry_methods=frozenset({"POST"}))
+
+    def send(
+        self,
+        endpoint: str,
+        json_message: str,
+        api_key: Union[str, Tuple[Optional[str], Optional[str]], None] = None,
+        api_secret: Optional[str] = None,
+    ):
+        """
+        Send message to a Mixpanel endpoint.
+
+        :param str endpoint: Mixpanel endpoint (`events`, `people`, `groups` or `imports`).
+        :param str json_message: JSON-encoded message or batch of messages.
+        :param Union[str, Tuple[Optional[str], Optional[str]], None] api_key: Project API key, or API key & secret.
+        :param Optional[str] api_secret: Mixpanel project API secret (required by `imports`).
+        """
+        if endpoint not in self.urls:
+            raise MixpanelException(f"No such endpoint `{endpoint}`; expected one of: {', '.join(self.urls)}.")
+        if isinstance(api_key, tuple):
+            api_key, api_secret = api_key
+        params = {"data": json_message, "verbose": 1, "ip": 0}
+        if api_key:
+            params["api_key"] = api_key
+        auth = HTTPBasicAuth(api_secret, "") if api_secret is not None else None
+        try:
+            response = self.session.post(self.urls[endpoint], data=params, auth=auth, timeout=self.request_timeout)
+            body = response.json()
+        except Exception as e:
+            raise MixpanelException(e) from e
+        if body.get("status") != 1:
+            raise MixpanelException(f"Mixpanel error: {body.get('error')}")
+
+
+class MixpanelBuffer:
+    """
+    Thread-safe Mixpanel consumer shared per process (ie: `Mixpanel(token, consumer=MixpanelBuffer(...))`).
+
+    `send()` only appends to a per-endpoint buffer; a background thread flushes buffers once `batch_size` messages
+    are queued for an endpoint or every `flush_interval` seconds, whichever comes first. Batches Mixpanel rejects
+    are requeued for the next flush, up to `max_attempts` sends each.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        request_timeout: float,
+        max_attempts: int = 3,
+        consumer: Optional[Consumer] = None,
+    ):
+        """
+        Mixpanel buffer constructor.
+
+        :param int batch_size: Messages per endpoint which trigger a flush (at most 50).
+        :param float flush_interval: Maximum seconds a message waits in the buffer.
+        :param float request_timeout: Timeout of requests to Mixpanel in seconds.
+        :param int max_attempts: Sends of each batch before it's dropped as failed.
+        :param Optional[Consumer] consumer: Consumer sending batches; defaults to a `PooledConsumer`.
+        """
+        self.batch_size = min(batch_size, MIXPANEL_MAX_BATCH_SIZE)
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.consumer = consumer or PooledConsumer(request_timeout=request_timeout)
+        self.buffers: Dict[str, List[str]] = {}
+        self.retries: List[Tuple[str, List[str], int]] = []
+        self.api_key: Optional[Tuple[Optional[str], Optional[str]]] = None
+        self.counts = {"queued": 0, "sent": 0, "requeued": 0, "failed": 0}
+        self._lock = Lock()
+        self._flushing = Lock()
+        self._wake = Event()
+        self._closed = Event()
+        self._thread: Optional[Thread] = None
+
+    def send(self, endpoint: str, json_message: str, api_key: Optional[str] = None, api_secret: Optional[str] = None):
+        """
+        Buffer message for an endpoint without blocking on Mixpanel.
+
+        :param str endpoint: Mixpanel endpoint (`events`, `people`, `groups` or `imports`).
+        :param str json_message: JSON-encoded message.
+        :param Optional[str] api_key: Mixpanel project API key (required by `imports`).
+        :param Optional[str] api_secret: Mixpanel project API secret (required by `imports`).
+        """
+        with self._lock:
+            buffer = self.buffers.setdefault(endpoint, [])
+            buffer.append(json_message)
+            if api_key is not None or api_secret is not None:
+                self.api_key = (api_key, api_secret)
+            full = len(buffer) >= self.batch_size
+        self._record("queued", 1)
+        self.start()
+        if full:
+            self._wake.set()
+
+    def _record(self, outcome: str, messages: int) -> None:
+        """
+        Count messages by outcome, both for `stats` & Prometheus.
+
+        :param str outcome: Outcome of messages (`queued`, `sent`, `requeued` or `failed`).
+        :param int messages: Number of messages.
+        """
+        with self._lock:
+            self.counts[outcome] += messages
+        OUTBOUND_MESSAGES.labels("mixpanel", outcome).inc(messages)
+
+    def flush(self) -> None:
+        """Send requeued batches, then buffered messages in batches of `batch_size`, requeueing rejected batches."""
+        with self._flushing:
+            with self._lock:
+                buffers, self.buffers = self.buffers, {}
+                retries, self.retries = self.retries, []
+                api_key = self.api_key
+            batches = retries + [
+                (endpoint, messages[i : i + self.batch_size], 1)
+                for endpoint, messages in buffers.items()
+                for i in range(0, len(messages), self.batch_size)
+            ]
+            for endpoint, batch, attempt in batches:
+                try:
+                    self.consumer.send(endpoint, f"[{','.join(batch)}]", api_key=api_key)
+                    self._record("sent", len(batch))
+                except MixpanelException as e:
+                    if attempt < self.max_attempts:
+                        with self._lock:
+                            self.retries.append((endpoint, batch, attempt + 1))
+                        self._record("requeued", len(batch))
+                        LOGGER.warning(f"Mixpanel rejected batch of {len(batch)} `{endpoint}` messages; requeued: {e}")
+                    else:
+                        self._record("failed", len(batch))
+                        LOGGER.error(
+                            f"Mixpanel rejected batch of {len(batch)} `{endpoint}` messages {attempt} times: {e}"
+                        )
+
+    def _run(self) -> None:
+        """Flush buffers when an endpoint fills up or `flush_interval` elapses, until closed."""
+        while not self._closed.is_set():
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self) -> None:
+        """Start the background flushing thread, if not already running."""
+        if self._thread is None and not self._closed.is_set():
+            with self._lock:
+                if self._thread is None:
+                    self._thread = Thread(target=self._run, name="mixpanel-flush", daemon=True)
+                    self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread & send messages still buffered, retrying rejected batches until dropped."""
+        self._closed.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        while self.retries:
+            self.flush()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Count messages queued, sent, requeued & failed by this buffer.
+
+        :returns: Dict[str, int]
+        """
+        with self._lock:
+            return dict(self.counts)
@@ -1,8 +1,10 @@
 """Create Twilio SMS client."""
 
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
 from twilio.rest.api.v2010.account.message import MessageInstance
 
+from clients.transport import pooled_session
 from log import LOGGER
 
 
@@ -14,7 +16,9 @@ class Twilio:
         self.token = token
         self.recipient = recipient
         self.sender = sender
-        self.client = Client(self.sid, self.token)
+        http_client = TwilioHttpClient()
+        pooled_session("twilio", http_client.session)
+        self.client = Client(self.sid, self.token, http_client=http_client)
 
     def send_message(self, message_body: str) -> MessageInstance:
         """
@@ -0,0 +1,143 @@
+"""Queue outbound SMS notifications, collapsing bursts into rate-limited digests."""
+
+import asyncio
+from time import monotonic
+from typing import Callable, List, Optional
+
+from log import LOGGER
+
+
+class TokenBucket:
+    """Token bucket allowing short bursts while enforcing an average rate."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Token bucket constructor.
+
+        :param float rate: Tokens added per second.
+        :param int capacity: Maximum number of tokens held (ie: largest burst).
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = monotonic()
+
+    def _refill(self) -> None:
+        """Add tokens accrued since the bucket was last updated."""
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it."""
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= 1
+
+
+def build_digest(messages: List[str], max_length: int) -> str:
+    """
+    Collapse queued messages into a single SMS body.
+
+    :param List[str] messages: Messages queued within the digest window.
+    :param int max_length: Maximum characters in an SMS body.
+
+    :returns: str
+    """
+    if len(messages) == 1:
+        return messages[0][:max_length]
+    body = f"{len(messages)} notifications:"
+    for index, message in enumerate(messages):
+        line = f"\n- {' '.join(message.split())}"
+        remaining = len(messages) - index
+        if len(body) + len(line) > max_length - len(f"\n(+{remaining} more)"):
+            return f"{body}\n(+{remaining} more)"
+        body += line
+    return body
+
+
+class SMSQueue:
+    """
+    Outbound SMS queue; webhooks enqueue messages & return immediately.
+
+    Messages arriving within `digest_window` seconds of each other are sent as one digest, digests are rate limited
+    by a token bucket, and Twilio calls run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], object],
+        digest_window: float,
+        rate_per_minute: float,
+        burst: int,
+        max_length: int,
+    ):
+        """
+        SMS queue constructor.
+
+        :param Callable[[str], object] send: Blocking function which sends a single SMS body.
+        :param float digest_window: Seconds to wait for further messages before sending a digest.
+        :param float rate_per_minute: Average number of SMS messages sent per minute.
+        :param int burst: Number of SMS messages which may be sent back-to-back.
+        :param int max_length: Maximum characters in an SMS body.
+        """
+        self.send = send
+        self.digest_window = digest_window
+        self.bucket = TokenBucket(rate_per_minute / 60, burst)
+        self.max_length = max_length
+        self.pending: List[str] = []
+        self._queued: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, message: str) -> None:
+        """
+        Queue SMS message to be sent in the background; must be called from the event loop.
+
+        :param str message: Content of SMS message.
+        """
+        self.start()
+        self.pending.append(message)
+        self._queued.set()
+
+    async def _deliver(self, messages: List[str]) -> None:
+        """
+        Send messages as a single SMS in a worker thread.
+
+        :param List[str] messages: Messages to send.
+        """
+        body = build_digest(messages, self.max_length)
+        try:
+            await asyncio.to_thread(self.send, body)
+            LOGGER.info(f"Sent SMS containing {len(messages)} notification(s).")
+        except Exception as e:
+            LOGGER.error(f"Failed to send SMS containing {len(messages)} notification(s): {e}")
+
+    async def _run(self) -> None:
+        """Wait for messages, let a digest window elapse, then send everything queued once a token is available."""
+        while True:
+            await self._queued.wait()
+            await asyncio.sleep(self.digest_window)
+            await self.bucket.acquire()
+            messages, self.pending = self.pending, []
+            self._queued.clear()
+            await self._deliver(messages)
+
+    def start(self) -> None:
+        """Start sending queued messages on the running event loop."""
+        if self._task is None or self._task.done():
+            self._queued = asyncio.Event()
+            if self.pending:
+                self._queued.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the queue, sending any messages still pending as a final digest."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.pending:
+            messages, self.pending = self.pending, []
+            await self._deliver(messages)
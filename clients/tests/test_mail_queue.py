@@ -0,0 +1,66 @@
+"""Test batching & retrying outbound emails."""
+
+import asyncio
+from time import monotonic
+
+from requests import HTTPError, Response
+
+from clients.mail_queue import BatchMailQueue
+
+
+def failure(status_code: int) -> HTTPError:
+    """
+    Error raised by Mailgun responses with `status_code`.
+
+    :param int status_code: HTTP status of failed response.
+
+    :returns: HTTPError
+    """
+    response = Response()
+    response.status_code = status_code
+    return HTTPError(response=response)
+
+
+def test_queue_sends_recipients_in_batches():
+    """Test recipients queued within the batch window are sent together, split by batch size & deduplicated."""
+    sent = []
+
+    async def run():
+        mail_queue = BatchMailQueue(sent.append, batch_window=0.05, batch_size=3, max_retries=0, backoff=0)
+        start = monotonic()
+        for n in range(5):
+            mail_queue.enqueue(f"{n}@example.com", {"name": f"Member {n}"})
+        mail_queue.enqueue("0@example.com", {"name": "Member 0"})
+        assert monotonic() - start < 0.01 and sent == []
+        await asyncio.sleep(0.2)
+        mail_queue.enqueue("5@example.com")
+        await mail_queue.stop()
+
+    asyncio.run(run())
+    assert [len(batch) for batch in sent] == [3, 2, 1]
+    assert sent[0]["0@example.com"] == {"name": "Member 0"}
+    assert sent[2] == {"5@example.com": {}}
+
+
+def test_queue_retries_with_backoff():
+    """Test server errors are retried with growing delays, while rejected batches are dropped."""
+    attempts = []
+
+    def send(recipients):
+        attempts.append(monotonic())
+        if "rejected@example.com" in recipients:
+            raise failure(400)
+        if len(attempts) < 3:
+            raise failure(503)
+
+    async def run():
+        mail_queue = BatchMailQueue(send, batch_window=0, batch_size=1000, max_retries=3, backoff=0.05)
+        mail_queue.enqueue("member@example.com")
+        await asyncio.sleep(0.3)
+        mail_queue.enqueue("rejected@example.com")
+        await mail_queue.stop()
+
+    asyncio.run(run())
+    assert len(attempts) == 4
+    assert attempts[1] - attempts[0] >= 0.05
+    assert attempts[2] - attempts[1] >= 0.1
@@ -0,0 +1,90 @@
+"""Test buffering Mixpanel messages into batches."""
+
+import json
+from threading import Event
+from urllib.parse import parse_qs
+
+import pytest
+from fastapi import FastAPI, Request
+from mixpanel import Mixpanel, MixpanelException
+
+from benchmarks.fakes import LocalServer
+from clients.mixpanel_buffer import MixpanelBuffer, PooledConsumer
+
+
+class RecordingConsumer:
+    """Mixpanel consumer recording batches, rejecting the first `failures` batches for the `groups` endpoint."""
+
+    def __init__(self, failures: int = 0):
+        self.batches = []
+        self.failures = failures
+        self.sent = Event()
+
+    def send(self, endpoint, json_message, api_key=None):
+        if endpoint == "groups" and self.failures:
+            self.failures -= 1
+            raise MixpanelException("rejected")
+        self.batches.append((endpoint, json.loads(json_message)))
+        self.sent.set()
+
+
+def test_buffer_flushes_full_batches_in_background():
+    """Full buffers are flushed by the background thread; stragglers wait for a flush."""
+    consumer = RecordingConsumer()
+    buffer = MixpanelBuffer(batch_size=3, flush_interval=3600, request_timeout=1, consumer=consumer)
+    mp = Mixpanel("token", consumer=buffer)
+    for n in range(3):
+        mp.people_set(f"{n}@example.com", {"$email": f"{n}@example.com"})
+    assert consumer.sent.wait(timeout=5)
+    mp.people_set("3@example.com", {"$email": "3@example.com"})
+    assert [len(batch) for _, batch in consumer.batches] == [3]
+    mp.track("4@example.com", "Signed up")
+    buffer.close()
+    assert sorted((endpoint, len(batch)) for endpoint, batch in consumer.batches[1:]) == [("events", 1), ("people", 1)]
+    assert buffer.stats == {"queued": 5, "sent": 5, "requeued": 0, "failed": 0}
+
+
+def test_buffer_flushes_on_interval():
+    """Messages short of a full batch are sent once `flush_interval` elapses."""
+    consumer = RecordingConsumer()
+    buffer = MixpanelBuffer(batch_size=50, flush_interval=0.01, request_timeout=1, consumer=consumer)
+    buffer.send("events", json.dumps({"event": "Signed up"}))
+    assert consumer.sent.wait(timeout=5)
+    buffer.close()
+    assert consumer.batches == [("events", [{"event": "Signed up"}])]
+
+
+def test_buffer_requeues_rejected_batches():
+    """Rejected batches are retried on later flushes, then dropped as failed after `max_attempts` sends."""
+    consumer = RecordingConsumer(failures=1)
+    buffer = MixpanelBuffer(batch_size=50, flush_interval=3600, request_timeout=1, max_attempts=2, consumer=consumer)
+    buffer.send("groups", json.dumps({"$group_key": "company"}))
+    buffer.flush()
+    assert buffer.stats["requeued"] == 1 and not consumer.batches
+    buffer.flush()
+    assert consumer.batches == [("groups", [{"$group_key": "company"}])]
+
+    consumer.failures = 2
+    buffer.send("groups", json.dumps({"$group_key": "team"}))
+    buffer.close()
+    assert len(consumer.batches) == 1
+    assert buffer.stats == {"queued": 2, "sent": 1, "requeued": 2, "failed": 1}
+
+
+def test_pooled_consumer_posts_batches():
+    """Batches are posted as form data via the pooled session, raising `MixpanelException` on errors."""
+    app = FastAPI()
+
+    @app.post("/track")
+    async def track(request: Request):
+        form = parse_qs((await request.body()).decode())
+        return {"status": 1} if json.loads(form["data"][0]) else {"status": 0, "error": "empty batch"}
+
+    with LocalServer(app) as server:
+        consumer = PooledConsumer(request_timeout=5)
+        consumer.urls["events"] = f"{server.url}/track"
+        consumer.send("events", json.dumps([{"event": "Signed up"}]))
+        with pytest.raises(MixpanelException, match="empty batch"):
+            consumer.send("events", "[]")
+        with pytest.raises(MixpanelException, match="No such endpoint"):
+            consumer.send("unknown", "[]")
@@ -0,0 +1,26 @@
+"""Test lazy client providers."""
+
+import subprocess
+import sys
+
+from clients import get_ghost, get_mailgun
+from config import settings
+
+
+def test_providers_are_cached():
+    """Providers build each client once per process."""
+    assert get_ghost() is get_ghost()
+    assert get_mailgun() is get_mailgun()
+
+
+def test_import_defers_sdks():
+    """Importing the API doesn't import heavy SDKs until a client is first used."""
+    deferred = ["github", "google.cloud.bigquery", "google.cloud.storage", "twilio"]
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, asgi; print([m for m in {deferred} if m in sys.modules])"],
+        cwd=settings.BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,49 @@
+"""Test outbound SMS digests & rate limiting."""
+
+import asyncio
+from time import monotonic
+
+from clients.sms_queue import SMSQueue, TokenBucket, build_digest
+
+
+def test_build_digest():
+    """Test single messages are sent as-is & digests are truncated to fit a single SMS."""
+    assert build_digest(["PR opened"], 1600) == "PR opened"
+    digest = build_digest(["PR opened for `repo`:\n  Fix bug", "Issue opened"], 1600)
+    assert digest == "2 notifications:\n- PR opened for `repo`: Fix bug\n- Issue opened"
+    truncated = build_digest([f"Issue {n} opened" for n in range(100)], 100)
+    assert len(truncated) <= 100
+    assert truncated.endswith("more)")
+
+
+def test_queue_collapses_messages_into_digests():
+    """Test messages queued within the digest window are sent together, after returning immediately."""
+    sent = []
+
+    async def run():
+        sms_queue = SMSQueue(sent.append, digest_window=0.05, rate_per_minute=6000, burst=1, max_length=1600)
+        start = monotonic()
+        for n in range(5):
+            sms_queue.enqueue(f"Issue {n} opened")
+        assert monotonic() - start < 0.01 and sent == []
+        await asyncio.sleep(0.2)
+        sms_queue.enqueue("Issue 5 opened")
+        await sms_queue.stop()
+
+    asyncio.run(run())
+    assert len(sent) == 2
+    assert sent[0].startswith("5 notifications:")
+    assert sent[1] == "Issue 5 opened"
+
+
+def test_token_bucket_limits_rate():
+    """Test acquiring beyond the burst waits for tokens to refill."""
+
+    async def run():
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return monotonic() - start
+
+    assert 0.08 <= asyncio.run(run()) < 0.5
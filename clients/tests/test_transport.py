@@ -0,0 +1,104 @@
+"""Test pooled HTTP transport retries & circuit breaking."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Response
+
+from benchmarks.fakes import LocalServer
+from clients.transport import (
+    CircuitBreaker,
+    CircuitOpenError,
+    close_async_clients,
+    get_async_client,
+    get_breaker,
+    pooled_session,
+    retry_delay,
+)
+from config import settings
+
+
+def create_flaky_service(failures: int) -> FastAPI:
+    """
+    Service responding `503` to its first `failures` calls.
+
+    :param int failures: Number of calls which fail before the service recovers.
+
+    :returns: FastAPI
+    """
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.api_route("/", methods=["GET", "POST"])
+    async def flaky():
+        app.state.calls += 1
+        if app.state.calls <= failures:
+            return Response(status_code=503)
+        return {"calls": app.state.calls}
+
+    return app
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF", 0.01)
+    monkeypatch.setattr(settings, "HTTP_RETRIES", 3)
+
+
+def test_circuit_breaker_opens_and_lets_trial_through(monkeypatch):
+    """Circuit opens after consecutive failures, then lets a single trial call through once reset."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record(False)
+    assert breaker.allow()
+    breaker.record(False)
+    assert not breaker.allow()
+    breaker.reset_timeout = 0
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.opened_at is None and breaker.failures == 0
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF", 0.01)
+    assert retry_delay(0, "3") == 3
+    assert retry_delay(0, "Wed, 21 Oct 2015 07:28:00 GMT") < 0.1
+
+
+def test_session_retries_idempotent_requests(fast_retries):
+    """GET requests failing with `503` are retried; POST requests aren't."""
+    app = create_flaky_service(failures=2)
+    with LocalServer(app) as server:
+        session = pooled_session("test-flaky")
+        assert session.get(server.url).json() == {"calls": 3}
+        app.state.calls = 0
+        assert session.post(server.url).status_code == 503
+        assert app.state.calls == 1
+
+
+def test_session_fails_fast_once_circuit_opens(fast_retries, monkeypatch):
+    """Hosts which keep failing are skipped without being called."""
+    monkeypatch.setattr(settings, "HTTP_RETRIES", 0)
+    app = create_flaky_service(failures=100)
+    with LocalServer(app) as server:
+        breaker = get_breaker(server.url)
+        breaker.failure_threshold = 2
+        session = pooled_session("test-failing")
+        session.get(server.url)
+        session.get(server.url)
+        with pytest.raises(CircuitOpenError):
+            session.get(server.url)
+        assert app.state.calls == 2
+
+
+def test_async_client_retries_idempotent_requests(fast_retries):
+    """Coroutines share a pooled `httpx` client which retries like the blocking session."""
+    app = create_flaky_service(failures=2)
+
+    async def call(url: str):
+        try:
+            client = get_async_client("test-flaky-async")
+            assert get_async_client("test-flaky-async") is client
+            response = await client.get(url)
+            return response.json()
+        finally:
+            await close_async_clients()
+
+    with LocalServer(app) as server:
+        assert asyncio.run(call(server.url)) == {"calls": 3}
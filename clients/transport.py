@@ -0,0 +1,263 @@
+"""Pooled HTTP transport shared by outbound clients.
+
+Sessions keep connections alive in per-host pools, so repeated calls to a service skip DNS lookups & TLS
+handshakes. Calls get a default timeout. Idempotent requests failing with `429`/`5xx` are retried with jittered
+exponential backoff. A per-host circuit breaker fails fast once a host keeps erroring. `get_session()` serves
+blocking clients via `requests`; `get_async_client()` serves coroutines via `httpx`.
+"""
+
+import asyncio
+import random
+from functools import cache
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Dict, FrozenSet, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from requests import Session
+from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
+
+from config import settings
+from metrics import (
+    OUTBOUND_BYTES,
+    OUTBOUND_REQUEST_DURATION,
+    OUTBOUND_REQUESTS,
+    InstrumentedAdapter,
+)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset(Retry.DEFAULT_ALLOWED_METHODS)
+
+
+class CircuitOpenError(RequestException):
+    """Raised instead of calling a host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stop calling a host after consecutive failures, letting a trial call through once `reset_timeout` passes."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        Circuit breaker constructor.
+
+        :param int failure_threshold: Consecutive failures which open the circuit.
+        :param float reset_timeout: Seconds to wait before letting a trial call through an open circuit.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = Lock()
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may be made; a trial call postpones further trials by another `reset_timeout`.
+
+        :returns: bool
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if monotonic() - self.opened_at >= self.reset_timeout:
+                self.opened_at = monotonic()
+                return True
+            return False
+
+    def record(self, succeeded: bool) -> None:
+        """
+        Record outcome of a call, closing the circuit on success & opening it after too many failures.
+
+        :param bool succeeded: Whether the host responded without a server error.
+        """
+        with self._lock:
+            if succeeded:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = Lock()
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """
+    Fetch circuit breaker for the host of a URL, shared by sync & async clients.
+
+    :param str url: URL being called.
+
+    :returns: CircuitBreaker
+    """
+    host = urlsplit(str(url)).netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(
+                host, CircuitBreaker(settings.HTTP_CIRCUIT_FAILURES, settings.HTTP_CIRCUIT_RESET)
+            )
+    return breaker
+
+
+def retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before a retry: exponential backoff plus jitter, or the server's `Retry-After` if longer.
+
+    :param int attempt: Number of attempts made so far, minus one.
+    :param Optional[str] retry_after: Value of `Retry-After` response header.
+
+    :returns: float
+    """
+    delay = settings.HTTP_RETRY_BACKOFF * 2**attempt + random.uniform(0, settings.HTTP_RETRY_BACKOFF)
+    if retry_after and retry_after.isdigit():
+        return max(delay, float(retry_after))
+    return delay
+
+
+class PooledAdapter(InstrumentedAdapter):
+    """Instrumented `requests` adapter with a connection pool, default timeout, retries & circuit breaking."""
+
+    def __init__(self, service: str, retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS):
+        """
+        Pooled adapter constructor.
+
+        :param str service: Name of third-party service (ie: `ghost`).
+        :param FrozenSet[str] retry_methods: HTTP methods which are safe to retry.
+        """
+        super().__init__(
+            service,
+            pool_connections=settings.HTTP_POOL_SIZE,
+            pool_maxsize=settings.HTTP_POOL_SIZE,
+            max_retries=Retry(
+                total=settings.HTTP_RETRIES,
+                backoff_factor=settings.HTTP_RETRY_BACKOFF,
+                backoff_jitter=settings.HTTP_RETRY_BACKOFF,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=retry_methods,
+                raise_on_status=False,
+            ),
+        )
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        breaker = get_breaker(request.url)
+        if not breaker.allow():
+            OUTBOUND_REQUESTS.labels(self.service, "circuit_open").inc()
+            raise CircuitOpenError(f"Circuit open for `{self.service}`; skipped {request.method} {request.url}")
+        try:
+            response = super().send(request, stream=stream, timeout=timeout or settings.HTTP_TIMEOUT, **kwargs)
+        except Exception:
+            breaker.record(False)
+            raise
+        breaker.record(response.status_code < 500)
+        return response
+
+
+def pooled_session(
+    service: str, session: Optional[Session] = None, retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS
+) -> Session:
+    """
+    Mount the pooled transport on a `requests` session, such as one built by a third-party SDK.
+
+    :param str service: Name of third-party service (ie: `ghost`).
+    :param Optional[Session] session: Existing session (ie: a Google `AuthorizedSession`); creates one if unset.
+    :param FrozenSet[str] retry_methods: HTTP methods which are safe to retry.
+
+    :returns: Session
+    """
+    session = session or Session()
+    adapter = PooledAdapter(service, retry_methods=retry_methods)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@cache
+def get_session(service: str) -> Session:
+    """
+    Pooled `requests` session shared by every blocking call to a service.
+
+    :param str service: Name of third-party service (ie: `ghost`).
+
+    :returns: Session
+    """
+    return pooled_session(service)
+
+
+class AsyncPooledTransport(httpx.AsyncBaseTransport):
+    """Instrumented `httpx` transport with a connection pool, retries & circuit breaking."""
+
+    def __init__(self, service: str):
+        """
+        Async pooled transport constructor.
+
+        :param str service: Name of third-party service (ie: `ghost`).
+        """
+        self.service = service
+        self.transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_POOL_SIZE, max_keepalive_connections=settings.HTTP_POOL_SIZE
+            )
+        )
+        self.duration = OUTBOUND_REQUEST_DURATION.labels(service)
+        self.bytes_sent = OUTBOUND_BYTES.labels(service, "sent")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = get_breaker(request.url)
+        if not breaker.allow():
+            OUTBOUND_REQUESTS.labels(self.service, "circuit_open").inc()
+            raise CircuitOpenError(f"Circuit open for `{self.service}`; skipped {request.method} {request.url}")
+        retries = settings.HTTP_RETRIES if request.method in IDEMPOTENT_METHODS else 0
+        for attempt in range(retries + 1):
+            start = perf_counter()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError:
+                self.duration.observe(perf_counter() - start)
+                OUTBOUND_REQUESTS.labels(self.service, "error").inc()
+                if attempt == retries:
+                    breaker.record(False)
+                    raise
+                await asyncio.sleep(retry_delay(attempt))
+                continue
+            self.duration.observe(perf_counter() - start)
+            OUTBOUND_REQUESTS.labels(self.service, response.status_code).inc()
+            self.bytes_sent.inc(len(request.content))
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                await response.aclose()
+                await asyncio.sleep(retry_delay(attempt, response.headers.get("Retry-After")))
+                continue
+            breaker.record(response.status_code < 500)
+            return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+_async_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_async_client(service: str) -> httpx.AsyncClient:
+    """
+    Pooled `httpx` client shared by every coroutine calling a service; closed by `close_async_clients()`.
+
+    :param str service: Name of third-party service (ie: `ghost`).
+
+    :returns: httpx.AsyncClient
+    """
+    client = _async_clients.get(service)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(transport=AsyncPooledTransport(service), timeout=settings.HTTP_TIMEOUT)
+        _async_clients[service] = client
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close connection pools of async clients (ie: on shutdown)."""
+    clients = list(_async_clients.values())
+    _async_clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -43,6 +43,45 @@ class Settings(BaseSettings):
         "*",
     ]
 
+    # Logging
+    LOG_LEVEL: str = getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL_OVERRIDES: dict = {}
+    LOG_SAMPLE_RATES: dict = {}
+
+    # Image alt text backfill
+    ALT_TEXT_BATCH_SIZE: int = 200
+    ALT_TEXT_CONCURRENCY: int = 4
+
+    # Insecure link sweep
+    SECURE_LINKS_BATCH_SIZE: int = 500
+
+    # Background jobs
+    JOBS_MAX_WORKERS: int = 2
+    JOBS_STALE_AFTER: int = 3600
+    JOBS_HEAVY: list = [
+        "posts.metadata",
+        "posts.secure_links",
+        "images.transform",
+        "images.cdn_urls",
+        "authors.metadata",
+        "tags.metadata",
+        "analytics.migrate",
+    ]
+    JOBS_HEAVY_LOCK_TIMEOUT: int = 600
+    JOBS_SCHEDULE: dict = {}
+    JOBS_SCHEDULE_JITTER: int = 60
+
+    # Metrics
+    METRICS_LATENCY_BUCKETS: list = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+    # HTTP
+    HTTP_TIMEOUT: float = 20
+    HTTP_RETRIES: int = 3
+    HTTP_RETRY_BACKOFF: float = 0.5
+    HTTP_POOL_SIZE: int = 10
+    HTTP_CIRCUIT_FAILURES: int = 5
+    HTTP_CIRCUIT_RESET: float = 30
+
     # Database
     SQLALCHEMY_DATABASE_URI: str = getenv("SQLALCHEMY_DATABASE_URI")
     SQLALCHEMY_GHOST_DATABASE_NAME: str = getenv("SQLALCHEMY_GHOST_DATABASE_NAME")
@@ -50,13 +89,20 @@ class Settings(BaseSettings):
     SQLALCHEMY_DATABASE_PEM: str = getenv("SQLALCHEMY_DATABASE_PEM")
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
     SQLALCHEMY_ENGINE_OPTIONS: dict = {"ssl": {"key": SQLALCHEMY_DATABASE_PEM}}
+    DATABASE_CREATE_TABLES: bool = getenv("DATABASE_CREATE_TABLES", "true").lower() == "true"
 
     # Algolia API
     ALGOLIA_SEARCHES_ENDPOINT: str = "https://analytics.algolia.com/2/searches"
     ALGOLIA_APP_ID: str = getenv("ALGOLIA_APP_ID")
     ALGOLIA_API_KEY: str = getenv("ALGOLIA_API_KEY")
-    ALGOLIA_TABLE_WEEKLY: str = "algolia_searches_week"
-    ALGOLIA_TABLE_MONTHLY: str = "algolia_searches_month"
+    ALGOLIA_INDEX_NAME: str = getenv("ALGOLIA_INDEX_NAME", "hackers_posts")
+    ALGOLIA_PAGE_SIZE: int = 1000
+    ALGOLIA_SEARCH_PERIODS: dict = {"week": 7, "month": 30}
+
+    # Search suggestions
+    SEARCH_SUGGESTIONS_LIMIT: int = 10
+    SEARCH_SUGGESTIONS_SNAPSHOT_PATH: str = path.join(BASE_DIR, ".cache", "search_suggestions.json")
+    SEARCH_SUGGESTIONS_RELOAD_INTERVAL: int = 30
 
     # Google Cloud Auth
     GCP_PROJECT_NAME: str = getenv("GCP_PROJECT_NAME")
@@ -67,15 +113,38 @@ class Settings(BaseSettings):
     GCP_BIGQUERY_TABLE: str = getenv("GCP_BIGQUERY_TABLE")
     GCP_BIGQUERY_DATASET: str = getenv("GCP_BIGQUERY_DATASET")
     GCP_BIGQUERY_URI: str = f"bigquery://{GCP_PROJECT_NAME}/{GCP_BIGQUERY_DATASET}"
+    GCP_BIGQUERY_BATCH_SIZE: int = 5000
 
     # Google Cloud storage
     GCP_BUCKET_URL: str = getenv("GCP_BUCKET_URL")
     GCP_BUCKET_NAME: str = getenv("GCP_BUCKET_NAME")
     GCP_BUCKET_FOLDER: list = [f'{dt.year}/{dt.strftime("%m")}']
 
+    # CDN URL canonicalization; legacy URL prefixes -> CDN prefix, and Ghost table columns holding image URLs
+    CDN_URL_REWRITES: dict = {
+        "https://hackersandslackers-cdn.storage.googleapis.com/": "https://cdn.hackersandslackers.com/",
+        "https://storage.googleapis.com/hackersandslackers-cdn/": "https://cdn.hackersandslackers.com/",
+    }
+    CDN_URL_COLUMNS: dict = {
+        "posts": ["feature_image"],
+        "posts_meta": ["og_image", "twitter_image"],
+        "tags": ["feature_image", "og_image", "twitter_image"],
+        "users": ["profile_image", "cover_image"],
+        "settings": ["value"],
+        "integrations": ["icon_image"],
+    }
+
     # Plausible Analytics
     PLAUSIBLE_STATS_ENDPOINT: str = "https://plausible.io/api/v1/stats/breakdown"
     PLAUSIBLE_API_TOKEN: str = getenv("PLAUSIBLE_API_TOKEN")
+    PLAUSIBLE_SITE_ID: str = "hackersandslackers.com"
+    PLAUSIBLE_CACHE_TTL: int = 300
+    PLAUSIBLE_MIN_PAGEVIEWS: int = 4
+    PLAUSIBLE_EXCLUDED_PAGES: list = ["", "/", "about"]
+    PLAUSIBLE_EXCLUDED_PATH_PREFIXES: list = ["/tag/", "/page/", "/author/", "/series/"]
+    PLAUSIBLE_BACKFILL_DAYS: int = 365
+    PLAUSIBLE_DAILY_LIMIT: int = 1000
+    PLAUSIBLE_ROLLING_WINDOWS: list = [7, 30, 90]
 
     # Ghost
     GHOST_API_VERSION: str = "v3.0"
@@ -90,6 +159,8 @@ class Settings(BaseSettings):
     GHOST_API_EXPORT_URL: str = f"{GHOST_BASE_URL}/admin/db/"
 
     GHOST_ADMIN_USER_ID: str = "1"
+    GHOST_SLUG_BATCH_SIZE: int = 50
+    GHOST_SLUG_CACHE_SIZE: int = 2048
 
     # Mailgun
     MAILGUN_EMAIL_SERVER: str = getenv("MAILGUN_EMAIL_SERVER")
@@ -97,9 +168,14 @@ class Settings(BaseSettings):
     MAILGUN_SENDER_API_KEY: str = getenv("MAILGUN_SENDER_API_KEY")
     MAILGUN_FROM_SENDER_EMAIL: str = getenv("MAILGUN_FROM_SENDER_EMAIL", "noreply@hackersandslackers.com")
     MAILGUN_FROM_SENDER_NAME: str = getenv("MAILGUN_FROM_SENDER_NAME", "Hackers and Slackers")
+    MAILGUN_FROM_SENDER: str = f"{MAILGUN_FROM_SENDER_NAME} <{MAILGUN_FROM_SENDER_EMAIL}>"
     MAILGUN_PERSONAL_EMAIL: str = getenv("MAILGUN_PERSONAL_EMAIL")
     MAILGUN_PASSWORD: str = getenv("MAILGUN_PASSWORD")
     MAILGUN_SUBJECT_LINE: str = "To Hack or to Slack; That is the Question."
+    MAILGUN_BATCH_WINDOW: float = 10
+    MAILGUN_BATCH_SIZE: int = 1000
+    MAILGUN_MAX_RETRIES: int = 3
+    MAILGUN_RETRY_BACKOFF: float = 2
 
     MAILGUN_CONF: ConnectionConfig = ConnectionConfig(
         MAIL_USERNAME="api",
@@ -115,16 +191,32 @@ class Settings(BaseSettings):
 
     # Mixpanel
     MIXPANEL_API_TOKEN: str = getenv("MIXPANEL_API_TOKEN")
+    MIXPANEL_BATCH_SIZE: int = 50
+    MIXPANEL_FLUSH_INTERVAL: float = 10
+    MIXPANEL_REQUEST_TIMEOUT: float = 10
+    MIXPANEL_MAX_ATTEMPTS: int = 3
 
     # Twilio
     TWILIO_SENDER_PHONE: str = getenv("TWILIO_SENDER_PHONE")
     TWILIO_RECIPIENT_PHONE: str = getenv("TWILIO_RECIPIENT_PHONE")
     TWILIO_AUTH_TOKEN: str = getenv("TWILIO_AUTH_TOKEN")
     TWILIO_ACCOUNT_SID: str = getenv("TWILIO_ACCOUNT_SID")
+    SMS_DIGEST_WINDOW: float = 30
+    SMS_RATE_PER_MINUTE: float = 2
+    SMS_BURST: int = 3
+    SMS_MAX_LENGTH: int = 1600
+
+    # Donations
+    DONATIONS_PAGE_SIZE: int = 50
+    DONATIONS_MAX_PAGE_SIZE: int = 500
+    DONATIONS_CACHE_TTL: int = 3600
+    DONATIONS_IMPORT_CHUNK_SIZE: int = 500
 
     # Github
     GH_USERNAME: str = getenv("GH_USERNAME")
     GH_API_KEY: str = getenv("GH_API_KEY")
+    GH_WEBHOOK_SECRET: str = getenv("GH_WEBHOOK_SECRET", "")
+    GH_IGNORED_SENDERS: list = ["dependabot-preview[bot]", "dependabot[bot]", "renovate[bot]"]
 
 
 settings = Settings()
@@ -3,16 +3,20 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-from config import Settings, settings
+from config import settings
+from metrics import instrument_engine
 
-from .sql_db import Database
+from .sql_db import Database, check_dialect
 
 # Create SQL Engine
-engine = create_engine(
-    f"{settings.SQLALCHEMY_DATABASE_URI}/{settings.SQLALCHEMY_FEATURES_DATABASE_NAME}",
-    connect_args=settings.SQLALCHEMY_ENGINE_OPTIONS,
-    echo=False,
+engine = instrument_engine(
+    create_engine(
+        f"{settings.SQLALCHEMY_DATABASE_URI}/{settings.SQLALCHEMY_FEATURES_DATABASE_NAME}",
+        connect_args=settings.SQLALCHEMY_ENGINE_OPTIONS,
+        echo=False,
+    )
 )
+check_dialect(engine.dialect.name)
 
 # Create SQL Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -20,6 +24,13 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def create_tables():
+    """Create any missing feature database tables (existing tables are left untouched)."""
+    from database import models  # noqa: F401 (registers models with `Base.metadata`)
+
+    Base.metadata.create_all(bind=engine)
+
+
 # Database session dependency
 def get_db():
     ses = SessionLocal()
@@ -31,14 +42,14 @@ def get_db():
 
 # Ghost database connection
 ghost_db = Database(
-    uri=Settings().SQLALCHEMY_DATABASE_URI,
-    db_name=Settings().SQLALCHEMY_GHOST_DATABASE_NAME,
-    args=Settings().SQLALCHEMY_ENGINE_OPTIONS,
+    uri=settings.SQLALCHEMY_DATABASE_URI,
+    db_name=settings.SQLALCHEMY_GHOST_DATABASE_NAME,
+    args=settings.SQLALCHEMY_ENGINE_OPTIONS,
 )
 
 # Feature database connection
 feature_db = Database(
-    uri=Settings().SQLALCHEMY_DATABASE_URI,
-    db_name=Settings().SQLALCHEMY_FEATURES_DATABASE_NAME,
-    args=Settings().SQLALCHEMY_ENGINE_OPTIONS,
+    uri=settings.SQLALCHEMY_DATABASE_URI,
+    db_name=settings.SQLALCHEMY_FEATURES_DATABASE_NAME,
+    args=settings.SQLALCHEMY_ENGINE_OPTIONS,
 )
@@ -1,60 +1,266 @@
 from datetime import datetime
-from typing import Optional
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from sqlalchemy import and_, distinct, extract, func, or_
 from sqlalchemy.engine.result import Result
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from config import settings
 from database.models import Account, Donation
 from database.schemas import CoffeeDonation
+from database.sql_db import insert_new_rows
 from log import LOGGER
 
+# Donation aggregates keyed by name & arguments; cleared whenever a donation is saved.
+_donation_aggregates: Dict[Tuple, Tuple[float, Any]] = {}
+_donation_aggregates_lock = Lock()
+_donation_generation = 0
 
-def get_donation(db: Session, donation: CoffeeDonation) -> Optional[CoffeeDonation]:
+
+def donation_row(donation: CoffeeDonation) -> dict:
     """
-    Fetch BuyMeACoffee donation by ID.
+    Map BuyMeACoffee donation onto columns of the `donation` table.
 
-    :param Session db: ORM database session.
-    :param NewDonation donation: Donation record to be fetched.
+    :param CoffeeDonation donation: Incoming donation.
 
-    :returns: Optional[NewDonation]
+    :returns: dict
     """
-    existing_donation = db.query(Donation).filter(Donation.coffee_id == donation.coffee_id).first()
-    if existing_donation is None:
-        return donation
-    LOGGER.warning(f"Donation `{existing_donation.id}` from `{existing_donation.email}` already exists; skipping.")
-    return None
+    return {
+        "coffee_id": donation.coffee_id,
+        "email": donation.email,
+        "name": donation.name,
+        "count": donation.count,
+        "message": donation.message,
+        "url": donation.link,
+        "created_at": donation.created_at or datetime.now(),
+    }
 
 
-def create_donation(db: Session, donation: CoffeeDonation) -> Donation:
+def save_donations(db: Session, donations: List[CoffeeDonation]) -> Optional[int]:
     """
-    Create new BuyMeACoffee donation record.
+    Insert BuyMeACoffee donations, skipping donations whose `coffee_id` already exists.
+
+    Saving a donation which already exists (ie: a retried webhook) is a no-op; only donations the `INSERT` itself
+    added are counted as created, so concurrent retries of a donation count it once.
 
     :param Session db: ORM database session.
-    :param NewDonation donation: Donation schema object.
+    :param List[CoffeeDonation] donations: Donations to save.
 
-    :returns: Donation
+    :returns: Optional[int]
     """
     try:
-        db_item = Donation(
-            coffee_id=donation.coffee_id,
-            email=donation.email,
-            name=donation.name,
-            count=donation.count,
-            message=donation.message,
-            link=donation.link,
-            created_at=datetime.now(),
-        )
-        db.add(db_item)
+        if not donations:
+            return 0
+        rows = [donation_row(donation) for donation in donations]
+        created = insert_new_rows(db, Donation.__table__, db.get_bind().dialect.name, ["coffee_id"], rows)
         db.commit()
-        LOGGER.success(f"Successfully received donation: `{donation.count}` coffees from `{donation.name}`.")
-        return db_item
+        if created:
+            invalidate_donation_aggregates()
+        return created
     except IntegrityError as e:
-        LOGGER.error(f"DB IntegrityError while creating donation record: {e}")
+        db.rollback()
+        LOGGER.error(f"DB IntegrityError while saving donation records: {e}")
     except SQLAlchemyError as e:
-        LOGGER.error(f"SQLAlchemyError while creating donation record: {e}")
+        db.rollback()
+        LOGGER.error(f"SQLAlchemyError while saving donation records: {e}")
     except Exception as e:
-        LOGGER.error(f"Unexpected error while creating donation record: {e}")
+        db.rollback()
+        LOGGER.error(f"Unexpected error while saving donation records: {e}")
+
+
+def upsert_donation(db: Session, donation: CoffeeDonation) -> Optional[bool]:
+    """
+    Save BuyMeACoffee donation unless its `coffee_id` already exists, in a single round-trip.
+
+    :param Session db: ORM database session.
+    :param CoffeeDonation donation: Incoming donation.
+
+    :returns: Optional[bool]
+    """
+    created = save_donations(db, [donation])
+    if created is None:
+        return None
+    if created:
+        LOGGER.success(f"Successfully received donation: `{donation.count}` coffees from `{donation.name}`.")
+    else:
+        LOGGER.warning(f"Donation `{donation.coffee_id}` from `{donation.email}` already exists; skipping.")
+    return created == 1
+
+
+def import_donations(db: Session, donations: List[CoffeeDonation], chunk_size: int) -> Dict[str, int]:
+    """
+    Backfill historical BuyMeACoffee donations in chunks, skipping donations which already exist.
+
+    :param Session db: ORM database session.
+    :param List[CoffeeDonation] donations: Donations to import.
+    :param int chunk_size: Number of donations saved per statement.
+
+    :returns: Dict[str, int]
+    """
+    created = 0
+    for i in range(0, len(donations), chunk_size):
+        chunk_created = save_donations(db, donations[i : i + chunk_size])
+        if chunk_created is None:
+            LOGGER.error(f"Stopped importing donations after {i} of {len(donations)}.")
+            break
+        created += chunk_created
+    LOGGER.success(f"Imported {created} of {len(donations)} donations.")
+    return {"received": len(donations), "created": created, "skipped": len(donations) - created}
+
+
+def remove_donation(db: Session, coffee_id: int) -> Optional[int]:
+    """
+    Delete BuyMeACoffee donation by ID.
+
+    :param Session db: ORM database session.
+    :param int coffee_id: BuyMeACoffee ID of donation to delete.
+
+    :returns: Optional[int]
+    """
+    try:
+        deleted = db.query(Donation).filter(Donation.coffee_id == coffee_id).delete(synchronize_session=False)
+        db.commit()
+        if deleted:
+            invalidate_donation_aggregates()
+        return deleted
+    except SQLAlchemyError as e:
+        db.rollback()
+        LOGGER.error(f"SQLAlchemyError while deleting donation `{coffee_id}`: {e}")
+
+
+def get_donations_page(db: Session, limit: int, after: Optional[Tuple[datetime, int]] = None) -> List[Donation]:
+    """
+    Fetch page of donations ordered by `created_at` & `id`, starting after a keyset cursor.
+
+    Fetches one extra row, which signals that another page follows.
+
+    :param Session db: ORM database session.
+    :param int limit: Maximum number of donations per page.
+    :param Optional[Tuple[datetime, int]] after: `created_at` & `id` of the last donation of the previous page.
+
+    :returns: List[Donation]
+    """
+    query = db.query(Donation).order_by(Donation.created_at, Donation.id)
+    if after is not None:
+        created_at, donation_id = after
+        query = query.filter(
+            or_(
+                Donation.created_at > created_at,
+                and_(Donation.created_at == created_at, Donation.id > donation_id),
+            )
+        )
+    return query.limit(limit + 1).all()
+
+
+def cached_donation_aggregate(key: Tuple, compute: Callable[[], Any]) -> Any:
+    """
+    Serve donation aggregate from memory, computing it on first use or after `DONATIONS_CACHE_TTL` seconds.
+
+    Results computed while a donation was being saved are returned but not cached.
+
+    :param Tuple key: Name & arguments of aggregate.
+    :param Callable[[], Any] compute: Computes aggregate from the database.
+
+    :returns: Any
+    """
+    with _donation_aggregates_lock:
+        cached = _donation_aggregates.get(key)
+        generation = _donation_generation
+    if cached is not None and monotonic() - cached[0] < settings.DONATIONS_CACHE_TTL:
+        return cached[1]
+    result = compute()
+    with _donation_aggregates_lock:
+        if generation == _donation_generation:
+            _donation_aggregates[key] = (monotonic(), result)
+    return result
+
+
+def invalidate_donation_aggregates():
+    """Clear cached donation aggregates after donations are saved."""
+    global _donation_generation
+    with _donation_aggregates_lock:
+        _donation_generation += 1
+        _donation_aggregates.clear()
+
+
+def get_donation_totals(db: Session) -> dict:
+    """
+    Count donations, coffees & distinct supporters.
+
+    :param Session db: ORM database session.
+
+    :returns: dict
+    """
+
+    def compute() -> dict:
+        donations, coffees, supporters, first, last = db.query(
+            func.count(Donation.id),
+            func.coalesce(func.sum(Donation.count), 0),
+            func.count(distinct(Donation.email)),
+            func.min(Donation.created_at),
+            func.max(Donation.created_at),
+        ).one()
+        return {
+            "donations": donations,
+            "coffees": coffees,
+            "supporters": supporters,
+            "first_donation_at": first,
+            "last_donation_at": last,
+        }
+
+    return cached_donation_aggregate(("totals",), compute)
+
+
+def get_donations_by_month(db: Session) -> List[dict]:
+    """
+    Count donations & coffees per calendar month, oldest first.
+
+    :param Session db: ORM database session.
+
+    :returns: List[dict]
+    """
+
+    def compute() -> List[dict]:
+        year = extract("year", Donation.created_at)
+        month = extract("month", Donation.created_at)
+        rows = (
+            db.query(year, month, func.count(Donation.id), func.coalesce(func.sum(Donation.count), 0))
+            .filter(Donation.created_at.isnot(None))
+            .group_by(year, month)
+            .order_by(year, month)
+            .all()
+        )
+        return [{"year": int(row[0]), "month": int(row[1]), "donations": row[2], "coffees": row[3]} for row in rows]
+
+    return cached_donation_aggregate(("months",), compute)
+
+
+def get_top_supporters(db: Session, limit: int) -> List[dict]:
+    """
+    Rank supporters by coffees donated.
+
+    :param Session db: ORM database session.
+    :param int limit: Maximum number of supporters to return.
+
+    :returns: List[dict]
+    """
+
+    def compute() -> List[dict]:
+        coffees = func.coalesce(func.sum(Donation.count), 0)
+        rows = (
+            db.query(Donation.email, func.max(Donation.name), func.count(Donation.id), coffees)
+            .filter(Donation.email.isnot(None))
+            .group_by(Donation.email)
+            .order_by(coffees.desc(), func.count(Donation.id).desc(), Donation.email)
+            .limit(limit)
+            .all()
+        )
+        return [{"email": row[0], "name": row[1], "donations": row[2], "coffees": row[3]} for row in rows]
+
+    return cached_donation_aggregate(("supporters", limit), compute)
 
 
 def get_account(db: Session, account_email: str) -> Optional[Result]:
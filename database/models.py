@@ -1,6 +1,6 @@
 """Data models."""
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String, Text
 from sqlalchemy.sql import func
 
 from database import Base
@@ -40,3 +40,89 @@ class Donation(Base):
 
     def __repr__(self):
         return f"<Donation {self.id}, ({self.url}): `{self.message}`>"
+
+
+class PageViewsDaily(Base):
+    """Daily Plausible traffic totals per page."""
+
+    __tablename__ = "page_views_daily"
+
+    date = Column(Date, primary_key=True)
+    page = Column(String(255), primary_key=True)
+    visitors = Column(Integer)
+    visits = Column(Integer)
+    pageviews = Column(Integer)
+    bounce_rate = Column(Float)
+    visit_duration = Column(Float)
+
+    def __repr__(self):
+        return f"<PageViewsDaily {self.date}, {self.page}: {self.pageviews}>"
+
+
+class PageViewsRolling(Base):
+    """Plausible traffic per page aggregated over a rolling window of days."""
+
+    __tablename__ = "page_views_rolling"
+
+    window_days = Column(Integer, primary_key=True)
+    page = Column(String(255), primary_key=True)
+    visitors = Column(Integer)
+    visits = Column(Integer)
+    pageviews = Column(Integer, index=True)
+    visit_duration = Column(Float)
+    updated_at = Column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<PageViewsRolling {self.window_days}d, {self.page}: {self.pageviews}>"
+
+
+class AlgoliaSearch(Base):
+    """Search query submitted to Algolia within a reporting period."""
+
+    __tablename__ = "algolia_searches"
+
+    period = Column(String(16), primary_key=True)
+    search = Column(String(255), primary_key=True)
+    count = Column(Integer, index=True)
+    nb_hits = Column(Integer)
+    updated_at = Column(DateTime, index=True)
+
+    def __repr__(self):
+        return f"<AlgoliaSearch {self.period}, `{self.search}`: {self.count}>"
+
+
+class Job(Base):
+    """Background job & its progress."""
+
+    __tablename__ = "job"
+
+    id = Column(String(36), primary_key=True)
+    name = Column(String(64), index=True)
+    key = Column(String(255), index=True)
+    params = Column(Text)
+    status = Column(String(16), index=True)
+    progress = Column(Integer, default=0)
+    total = Column(Integer, nullable=True)
+    message = Column(String(255), nullable=True)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, index=True)
+
+    def __repr__(self):
+        return f"<Job {self.id}, {self.name}: {self.status}>"
+
+
+class ScheduledRun(Base):
+    """Scheduled run of a recurring job, claimed by the first API worker to reach it."""
+
+    __tablename__ = "scheduled_run"
+
+    name = Column(String(64), primary_key=True)
+    run_at = Column(DateTime, primary_key=True)
+    claimed_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<ScheduledRun {self.name}, {self.run_at}>"
@@ -1,9 +1,17 @@
+-- Published posts with image cards; cards missing `alt` are detected when each mobiledoc is parsed,
+-- since posts can mix cards with & without `alt` (or with an empty `"alt":""`).
+-- Paged by `id` so no cursor is held open while posts are updated between pages.
 SELECT
 	id,
-    mobiledoc
+	slug,
+	updated_at,
+	mobiledoc
 FROM
 	posts
 WHERE
-	mobiledoc LIKE '%["image"%'
-	AND mobiledoc NOT LIKE '%"alt":"%'
-	AND status = 'published';
\ No newline at end of file
+	(mobiledoc LIKE '%["image"%' OR mobiledoc LIKE '%["gallery"%')
+	AND status = 'published'
+	AND id > :last_id
+ORDER BY
+	id
+LIMIT :limit;
@@ -0,0 +1,19 @@
+-- Posts changed since the last sweep whose html or mobiledoc mention `http://`; only link & image URLs are
+-- rewritten once each post is parsed, so text mentions are left intact.
+-- Paged by `id` so no cursor is held open while posts are updated between pages.
+SELECT
+	id,
+	slug,
+	updated_at,
+	html,
+	mobiledoc,
+	plaintext
+FROM
+	posts
+WHERE
+	updated_at >= :since
+	AND (html LIKE '%http://%' OR mobiledoc LIKE '%http://%')
+	AND id > :last_id
+ORDER BY
+	id
+LIMIT :limit;
@@ -1,6 +0,0 @@
-UPDATE
-	posts
-SET
-	feature_image = REPLACE(feature_image, 'https://storage.googleapis.com/hackersandslackers-cdn/', 'https://cdn.hackersandslackers.com/')
-WHERE
-	feature_image LIKE '%%https://storage.googleapis.com/hackersandslackers-cdn/%%';
\ No newline at end of file
@@ -1,6 +0,0 @@
-UPDATE
-    settings
-SET
-    value = REPLACE(value, 'https://storage.googleapis.com/hackersandslackers-cdn/', 'https://cdn.hackersandslackers.com/')
-WHERE
-      value LIKE '%%https://storage.googleapis.com/hackersandslackers-cdn/%%';
\ No newline at end of file
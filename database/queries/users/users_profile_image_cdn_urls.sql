@@ -1,6 +0,0 @@
-UPDATE
-	users
-SET
-	profile_image = REPLACE(profile_image, 'https://hackersandslackers-cdn.storage.googleapis.com/', 'https://cdn.hackersandslackers.com/')
-WHERE
-	profile_image LIKE 'https://hackersandslackers-cdn.storage.googleapis.com/%%';
\ No newline at end of file
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class CoffeeDonation(BaseModel):
@@ -16,6 +16,7 @@ class CoffeeDonation(BaseModel):
     message: Optional[str] = Field(None, example="Great tutorials but this is a test message.")
     link: str = Field(None, example="https://buymeacoffee.com/hackersslackers/c/fake")
     coffee_id: int = Field(None, example=3453543)
+    created_at: Optional[datetime] = Field(None, example="2021-09-02T04:14:50")
     # fmt: on
 
     class Config:
@@ -29,6 +30,83 @@ class CoffeeDonation(BaseModel):
         }
 
 
+class DonationReceipt(BaseModel):
+    """Outcome of saving a `BuyMeACoffee` donation."""
+
+    # fmt: off
+    created: bool = Field(..., example=True)
+    donation: CoffeeDonation
+    # fmt: on
+
+
+class DonationImport(BaseModel):
+    """Outcome of importing historical `BuyMeACoffee` donations."""
+
+    # fmt: off
+    received: int = Field(..., example=120)
+    created: int = Field(..., example=118)
+    skipped: int = Field(..., example=2)
+    # fmt: on
+
+
+class DonationRecord(BaseModel):
+    """Saved `BuyMeACoffee` donation."""
+
+    # fmt: off
+    id: int = Field(..., example=1)
+    coffee_id: Optional[int] = Field(None, example=405127)
+    email: Optional[str] = Field(None, example="fake@example.com")
+    name: Optional[str] = Field(None, example="Fake Todd")
+    count: Optional[int] = Field(None, example=1)
+    message: Optional[str] = Field(None, example="Great tutorials but this is a test message.")
+    url: Optional[str] = Field(None, example="https://buymeacoffee.com/hackersslackers/c/405127")
+    created_at: Optional[datetime] = Field(None, example="2021-09-02T04:14:50")
+    # fmt: on
+
+
+class DonationPage(BaseModel):
+    """Page of donations ordered by `created_at`, with the cursor of the following page."""
+
+    # fmt: off
+    donations: List[DonationRecord]
+    next_cursor: Optional[str] = Field(None, example="2021-09-02T04:14:50_1")
+    # fmt: on
+
+
+class DonationTotals(BaseModel):
+    """Totals across all donations."""
+
+    # fmt: off
+    donations: int = Field(..., example=42)
+    coffees: int = Field(..., example=67)
+    supporters: int = Field(..., example=31)
+    first_donation_at: Optional[datetime] = Field(None, example="2020-03-01T12:00:00")
+    last_donation_at: Optional[datetime] = Field(None, example="2021-09-02T04:14:50")
+    # fmt: on
+
+
+class DonationMonth(BaseModel):
+    """Donations received within a calendar month."""
+
+    # fmt: off
+    year: int = Field(..., example=2021)
+    month: int = Field(..., example=9)
+    donations: int = Field(..., example=4)
+    coffees: int = Field(..., example=7)
+    # fmt: on
+
+
+class DonationSupporter(BaseModel):
+    """Donations received from a single supporter."""
+
+    # fmt: off
+    email: str = Field(..., example="fake@example.com")
+    name: Optional[str] = Field(None, example="Fake Todd")
+    donations: int = Field(..., example=3)
+    coffees: int = Field(..., example=5)
+    # fmt: on
+
+
 class AllCoffeeDonations(BaseModel):
     """All `BuyMeACoffee` donations."""
 
@@ -355,6 +433,104 @@ class PostUpdate(BaseModel):
         # fmt: on
 
 
+class LeanAuthor(BaseModel):
+    """Author fields read by webhook handlers."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    id: str = Field(None, example="1")
+    name: Optional[str] = Field(None, example="Todd Birchard")
+
+
+class LeanPost(BaseModel):
+    """
+    Post fields read by the image webhook.
+
+    Webhook schemas ignore undeclared fields, so validating from raw JSON skips Ghost's remaining payload
+    (ie: `plaintext`, `tags`) without decoding it; timestamps are left as Ghost formats them.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    id: str = Field(None, example="61304d8374047afda1c218ff")
+    title: Optional[str] = Field(None, example="A Brief History of Pandas")
+    slug: Optional[str] = Field(None, example="a-brief-history-of-pandas")
+    feature_image: Optional[str] = Field(None, example="https://cdn.hackersandslackers.com/2021/09/pandas.jpg")
+
+
+class LeanPostContent(LeanPost):
+    """Post fields read when optimizing post metadata, including its `mobiledoc` & `html`."""
+
+    # fmt: off
+    mobiledoc: Optional[str] = Field(None, example='{"version":"0.3.1","atoms":[],"cards":[],"markups":[],"sections":[]}')
+    html: Optional[str] = Field(None, example="<p>Pandas 1.0 came out recently.</p>")
+    custom_excerpt: Optional[str] = Field(None, example="A nuclear test gone wrong, high finance, and some convenient code!")
+    updated_at: Optional[str] = Field(None, example="2021-09-02T04:14:50.000Z")
+    # fmt: on
+
+
+class LeanPostAuthors(LeanPost):
+    """Post fields read when notifying of posts by other authors."""
+
+    authors: List[LeanAuthor] = Field([], example=[{"id": "1", "name": "Todd Birchard"}])
+    primary_author: Optional[LeanAuthor] = Field(None, example={"id": "1", "name": "Todd Birchard"})
+
+
+class LeanPostChange(BaseModel):
+    """Current & previous state of a post; Ghost only includes changed fields in `previous`."""
+
+    current: LeanPost
+    previous: Optional[LeanPost] = None
+
+
+class LeanPostUpdate(BaseModel):
+    """Incoming post update webhook, validating only the fields the image webhook reads."""
+
+    post: LeanPostChange
+
+
+class LeanPostContentChange(BaseModel):
+    """Current & previous state of a post's content."""
+
+    current: LeanPostContent
+    previous: Optional[LeanPostContent] = None
+
+
+class LeanPostContentUpdate(BaseModel):
+    """Incoming post update webhook, validating only the fields read when optimizing post metadata."""
+
+    post: LeanPostContentChange
+
+
+class LeanPostAuthorsChange(BaseModel):
+    """Current & previous state of a post's authors."""
+
+    current: LeanPostAuthors
+    previous: Optional[LeanPostAuthors] = None
+
+
+class LeanPostAuthorsUpdate(BaseModel):
+    """Incoming post update webhook, validating only the fields read when notifying of posts by other authors."""
+
+    post: LeanPostAuthorsChange
+
+
+class LeanTag(BaseModel):
+    """Tag fields read by webhook handlers."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    id: str = Field(None, example="5dc42cb712c9ce0d63f5bf4f")
+    slug: Optional[str] = Field(None, example="python")
+
+
+class LeanTagUpdate(BaseModel):
+    """Incoming tag update webhook, validating only the fields handlers read."""
+
+    current: LeanTag
+    previous: Optional[LeanTag] = None
+
+
 class GhostMember(BaseModel):
     """Ghost Member account."""
 
@@ -1051,6 +1227,54 @@ class GithubPr(BaseModel):
         }
 
 
+class GithubSender(BaseModel):
+    """Account which triggered a Github webhook."""
+
+    login: str = Field(..., example="renovate[bot]")
+
+
+class GithubRepositoryName(BaseModel):
+    """Repository fields read by Github webhook handlers."""
+
+    name: str = Field(..., example="repository")
+    full_name: str = Field(..., example="username/repository")
+
+
+class GithubPrSummary(BaseModel):
+    """Pull request fields read by Github webhook handlers."""
+
+    number: int = Field(..., example=320)
+    title: str = Field(..., example="Update dependency fastapi to v0.112.0")
+    body: Optional[str] = Field(None, example="This PR contains the following updates...")
+    url: str = Field(..., example="https://api.github.com/repos/username/repository/pulls/320")
+
+
+class GithubIssueSummary(BaseModel):
+    """Issue fields read by Github webhook handlers."""
+
+    id: int = Field(..., example=765224453)
+    title: str = Field(..., example="Test issue")
+    url: str = Field(..., example="https://api.github.com/repos/username/repository/issues/12")
+
+
+class GithubPrEvent(BaseModel):
+    """Github `pull_request` webhook; fields handlers don't read are skipped while decoding."""
+
+    action: Optional[str] = Field(None, example="opened")
+    sender: GithubSender
+    pull_request: GithubPrSummary
+    repository: GithubRepositoryName
+
+
+class GithubIssueEvent(BaseModel):
+    """Github `issues` webhook; fields handlers don't read are skipped while decoding."""
+
+    action: Optional[str] = Field(None, example="opened")
+    sender: GithubSender
+    issue: GithubIssueSummary
+    repository: GithubRepositoryName
+
+
 class PostBulkUpdate(BaseModel):
     """Request to bulk update Ghost posts."""
 
@@ -1065,3 +1289,47 @@ class AnalyticsResponse(BaseModel):
     weekly_stats: Dict[str, Any] = Field(None, example={"count": 2, "rows": [{"my-post-1": 2}, {"my-post-2": 3}]})
     monthly_stats: Dict[str, Any] = Field(None, example={"count": 2, "rows": [{"my-post-1": 2}, {"my-post-2": 3}]})
     # fmt: on
+
+
+class PageViews(BaseModel):
+    """Traffic for a single page aggregated over a rolling window."""
+
+    # fmt: off
+    page: str = Field(None, example="/flask-routes/")
+    visitors: Optional[int] = Field(None, example=869)
+    visits: Optional[int] = Field(None, example=901)
+    pageviews: Optional[int] = Field(None, example=2932)
+    visit_duration: Optional[float] = Field(None, example=33.5)
+    # fmt: on
+
+    class Config:
+        from_attributes = True
+
+
+class PageViewsSync(BaseModel):
+    """Result of syncing daily page analytics."""
+
+    # fmt: off
+    days: Dict[str, int] = Field(None, example={"2024-08-01": 412, "2024-08-02": 398})
+    rows: int = Field(None, example=810)
+    windows: Dict[int, int] = Field(None, example={7: 1204, 30: 2841, 90: 4410})
+    # fmt: on
+
+
+class JobStatus(BaseModel):
+    """Status of a background job."""
+
+    # fmt: off
+    id: str = Field(None, example="3f1c2a9e-8d4b-4f7a-9c61-0b5e2d7a4c18")
+    name: str = Field(None, example="images.transform")
+    params: Dict[str, Any] = Field(None, example={"directory": "2024/08"})
+    status: str = Field(None, example="running")
+    progress: int = Field(None, example=1)
+    total: Optional[int] = Field(None, example=3)
+    message: Optional[str] = Field(None, example="Generated retina images")
+    result: Optional[Any] = Field(None, example={"retina": ["2024/08/image@2x.jpg"]})
+    error: Optional[str] = Field(None, example=None)
+    created_at: Optional[str] = Field(None, example="2024-08-01T06:00:00")
+    started_at: Optional[str] = Field(None, example="2024-08-01T06:00:01")
+    finished_at: Optional[str] = Field(None, example=None)
+    # fmt: on
@@ -1,23 +1,206 @@
 """Database client."""
 
-from typing import List, Optional
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from pandas import DataFrame
-from sqlalchemy import MetaData, Table, create_engine, text
-from sqlalchemy.engine import CursorResult
+import pyarrow as pa
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    MetaData,
+    Table,
+    Text,
+    create_engine,
+    inspect,
+    text,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, CursorResult
 from sqlalchemy.engine.result import Result
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
 
 from log import LOGGER
+from metrics import instrument_engine
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 metadata_obj = MetaData()
 
 
+def _arrow_to_sql_type(arrow_type: pa.DataType):
+    """
+    Map Arrow column type to the closest SQLAlchemy column type.
+
+    :param pa.DataType arrow_type: Type of Arrow column.
+
+    :returns: TypeEngine
+    """
+    if pa.types.is_boolean(arrow_type):
+        return Boolean()
+    if pa.types.is_integer(arrow_type):
+        return BigInteger()
+    if pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        return Float()
+    if pa.types.is_timestamp(arrow_type):
+        return DateTime()
+    if pa.types.is_date(arrow_type):
+        return Date()
+    return Text()
+
+
+DIALECT_INSERTS = {"mysql": mysql_insert, "postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def check_dialect(dialect_name: str) -> str:
+    """
+    Ensure SQL dialect supports the conflict-aware inserts used for upserts.
+
+    :param str dialect_name: Name of SQL dialect (mysql, sqlite, postgresql).
+
+    :returns: str
+    """
+    if dialect_name not in DIALECT_INSERTS:
+        raise ValueError(
+            f"Unsupported SQL dialect `{dialect_name}`; expected one of: {', '.join(sorted(DIALECT_INSERTS))}."
+        )
+    return dialect_name
+
+
+def upsert_statement(table: Table, dialect_name: str, key_columns: List[str], update_columns: List[str]):
+    """
+    Build dialect-specific `INSERT` which updates existing rows on key conflicts.
+
+    :param Table table: Table to upsert into.
+    :param str dialect_name: Name of SQL dialect validated by `check_dialect()`.
+    :param List[str] key_columns: Columns of the primary or unique key rows conflict on.
+    :param List[str] update_columns: Columns to overwrite when a row already exists.
+
+    :returns: Insert
+    """
+    stmt = DIALECT_INSERTS[dialect_name](table)
+    if dialect_name == "mysql":
+        return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+    return stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: stmt.excluded[column] for column in update_columns},
+    )
+
+
+def insert_ignore_statement(table: Table, dialect_name: str, key_columns: List[str]):
+    """
+    Build dialect-specific `INSERT` which skips rows conflicting with existing keys.
+
+    MySQL assigns a key column to itself on duplicate keys rather than using `INSERT IGNORE`, which would also
+    downgrade every other error (ie: truncated or `NULL` values) to a warning. As SQLAlchemy's MySQL connections
+    count found rows, skipped rows are included in its row count; use `insert_new_rows()` to count inserted rows.
+
+    :param Table table: Table to insert into.
+    :param str dialect_name: Name of SQL dialect validated by `check_dialect()`.
+    :param List[str] key_columns: Columns of the primary or unique key rows conflict on.
+
+    :returns: Insert
+    """
+    stmt = DIALECT_INSERTS[dialect_name](table)
+    if dialect_name == "mysql":
+        return stmt.on_duplicate_key_update({key_columns[0]: table.c[key_columns[0]]})
+    return stmt.on_conflict_do_nothing(index_elements=key_columns)
+
+
+def insert_new_rows(
+    conn: Union[Connection, Session], table: Table, dialect_name: str, key_columns: List[str], rows: List[dict]
+) -> int:
+    """
+    Insert rows, skipping those conflicting with existing keys, & count rows inserted from the `INSERT` itself.
+
+    SQLite & PostgreSQL insert every row in one statement, returning keys of inserted rows. MySQL can't tell skipped
+    rows apart by row count, so each row is inserted in turn & counted when assigned an auto-increment ID.
+
+    :param Union[Connection, Session] conn: Connection or session with an active transaction.
+    :param Table table: Table with an auto-increment primary key to insert into.
+    :param str dialect_name: Name of SQL dialect validated by `check_dialect()`.
+    :param List[str] key_columns: Columns of the primary or unique key rows conflict on.
+    :param List[dict] rows: Values of rows to insert.
+
+    :returns: int
+    """
+    stmt = insert_ignore_statement(table, dialect_name, key_columns)
+    if dialect_name == "mysql":
+        return sum(bool(conn.execute(stmt, row).lastrowid) for row in rows)
+    return len(conn.execute(stmt.returning(table.c[key_columns[0]]), rows).all())
+
+
+def url_rewrite_statements(
+    quote: Callable[[str], str], table_name: str, columns: List[str], rewrites: Dict[str, str]
+) -> Tuple[str, str, Dict[str, str]]:
+    """
+    Build a query counting rows to rewrite per column & a single multi-column `UPDATE` applying every rewrite.
+
+    Both only match rows where at least one column contains a URL prefix being rewritten; the `UPDATE` leaves
+    columns without matches untouched.
+
+    :param Callable[[str], str] quote: Dialect-specific identifier quoting.
+    :param str table_name: Name of table to rewrite.
+    :param List[str] columns: Columns holding URLs.
+    :param Dict[str, str] rewrites: Map of URL prefixes -> replacements, applied in order.
+
+    :returns: Tuple[str, str, Dict[str, str]]
+    """
+    params = {}
+    for i, (old, new) in enumerate(rewrites.items()):
+        escaped = old.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+        params.update({f"old_{i}": old, f"new_{i}": new, f"like_{i}": f"%{escaped}%"})
+    matches, replacements = {}, {}
+    for column in columns:
+        quoted = quote(column)
+        matches[column] = " OR ".join(f"{quoted} LIKE :like_{i} ESCAPE '!'" for i in range(len(rewrites)))
+        replacement = quoted
+        for i in range(len(rewrites)):
+            replacement = f"REPLACE({replacement}, :old_{i}, :new_{i})"
+        replacements[column] = replacement
+    where = " OR ".join(f"({match})" for match in matches.values())
+    count_query = (
+        "SELECT "
+        + ", ".join(
+            f"SUM(CASE WHEN {matches[column]} THEN 1 ELSE 0 END) AS column_{i}" for i, column in enumerate(columns)
+        )
+        + f" FROM {quote(table_name)} WHERE {where}"
+    )
+    update_query = (
+        f"UPDATE {quote(table_name)} SET "
+        + ", ".join(
+            f"{quote(column)} = CASE WHEN {matches[column]} THEN {replacements[column]} ELSE {quote(column)} END"
+            for column in columns
+        )
+        + f" WHERE {where}"
+    )
+    return count_query, update_query, params
+
+
 class Database:
     """Database client."""
 
     def __init__(self, uri: str, db_name: str, args: dict):
-        self.db = create_engine(f"{uri}/{db_name}", connect_args=args, echo=False)
+        self.db = instrument_engine(create_engine(f"{uri}/{db_name}", connect_args=args, echo=False))
+        check_dialect(self.db.dialect.name)
 
     def _table(self, table_name: str) -> Table:
         """
@@ -27,7 +210,33 @@ class Database:
 
         :returns: Table
         """
-        return Table(table_name, MetaData, autoload=True)
+        return Table(table_name, MetaData(), autoload_with=self.db)
+
+    @staticmethod
+    def _arrow_table(conn: Connection, table_name: str, schema: pa.Schema, replace: bool) -> Table:
+        """
+        Reflect SQL table matching an Arrow schema, creating it if it does not exist.
+
+        :param Connection conn: Open connection with an active transaction.
+        :param str table_name: Name of database table to load into.
+        :param pa.Schema schema: Arrow schema of incoming record batches.
+        :param bool replace: Flag to delete existing rows within the same transaction.
+
+        :returns: Table
+        """
+        if inspect(conn).has_table(table_name):
+            table = Table(table_name, MetaData(), autoload_with=conn)
+            if replace:
+                conn.execute(table.delete())
+            return table
+        table = Table(
+            table_name,
+            MetaData(),
+            *[Column(field.name, _arrow_to_sql_type(field.type)) for field in schema],
+        )
+        table.create(conn)
+        LOGGER.info(f"Created table `{table_name}` from Arrow schema.")
+        return table
 
     def execute_queries(self, queries: dict) -> dict:
         """
@@ -63,6 +272,51 @@ class Database:
         except SQLAlchemyError as e:
             LOGGER.error(f"Failed to execute SQL query {query}: {e}")
 
+    def page_query(
+        self, query: str, batch_size: int = 500, key: str = "id", params: Optional[dict] = None
+    ) -> Iterator[List[dict]]:
+        """
+        Execute keyset-paginated SQL query & yield each page of rows, releasing the connection between pages.
+
+        No cursor is held open while callers process a page, so slow work (or writes to the same table) between
+        pages can't exceed the server's write timeout.
+
+        :param str query: SQL query filtering on `{key} > :last_id`, ordered by `key` & limited to `:limit` rows.
+        :param int batch_size: Maximum number of rows per page.
+        :param str key: Unique column the query is ordered by.
+        :param Optional[dict] params: Values of other bound parameters in query.
+
+        :returns: Iterator[List[dict]]
+        """
+        last_id = ""
+        while True:
+            with self.db.connect() as conn:
+                result = conn.execute(text(query), {**(params or {}), "last_id": last_id, "limit": batch_size})
+                rows = [dict(row) for row in result.mappings()]
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][key]
+
+    def execute_batch(self, query: str, rows: List[dict]) -> Optional[int]:
+        """
+        Execute parameterized SQL statement once per row in a single transaction.
+
+        :param str query: SQL statement with bound parameters (ie: `:id`).
+        :param List[dict] rows: Parameter values for each execution.
+
+        :returns: Optional[int]
+        """
+        try:
+            if not rows:
+                return 0
+            with self.db.begin() as conn:
+                return conn.execute(text(query), rows).rowcount
+        except SQLAlchemyError as e:
+            LOGGER.error(f"SQLAlchemyError while executing batch of {len(rows)} statements: {e}")
+
     def execute_query_from_file(self, sql_file: str) -> Optional[CursorResult]:
         """
         Execute single SQL query.
@@ -104,7 +358,120 @@ class Database:
         except Exception as e:
             LOGGER.error(f"Unexpected error while inserting records into table `{table_name}`: {e}")
 
-    def insert_dataframe(self, df: DataFrame, table_name: str, action="append") -> DataFrame:
+    def upsert_records(
+        self,
+        rows: List[dict],
+        table: Table,
+        key_columns: List[str],
+        update_columns: List[str],
+    ) -> Optional[int]:
+        """
+        Insert rows into SQL table, updating rows which already exist.
+
+        :param List[dict] rows: List of dictionaries to upsert where keys are columns.
+        :param Table table: Table to upsert into.
+        :param List[str] key_columns: Columns of the primary or unique key rows conflict on.
+        :param List[str] update_columns: Columns to overwrite when a row already exists.
+
+        :returns: Optional[int]
+        """
+        try:
+            if not rows:
+                return 0
+            stmt = upsert_statement(table, self.db.dialect.name, key_columns, update_columns)
+            with self.db.begin() as conn:
+                conn.execute(stmt, rows)
+            return len(rows)
+        except SQLAlchemyError as e:
+            LOGGER.error(f"SQLAlchemyError while upserting records into table `{table.name}`: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected error while upserting records into table `{table.name}`: {e}")
+
+    def rewrite_urls(
+        self, table_name: str, columns: List[str], rewrites: Dict[str, str], dry_run=False
+    ) -> Optional[Dict[str, int]]:
+        """
+        Rewrite URL prefixes across several columns of a table with a single `UPDATE`.
+
+        :param str table_name: Name of table to rewrite.
+        :param List[str] columns: Columns holding URLs.
+        :param Dict[str, str] rewrites: Map of URL prefixes -> replacements, applied in order.
+        :param bool dry_run: Flag to only count rows which would be rewritten.
+
+        :returns: Optional[Dict[str, int]]
+        """
+        try:
+            if not columns or not rewrites:
+                return {}
+            count_query, update_query, params = url_rewrite_statements(
+                self.db.dialect.identifier_preparer.quote, table_name, columns, rewrites
+            )
+            with self.db.begin() as conn:
+                row = conn.execute(text(count_query), params).one()
+                counts = {column: int(row[i] or 0) for i, column in enumerate(columns)}
+                if any(counts.values()) and not dry_run:
+                    conn.execute(text(update_query), params)
+            LOGGER.info(f"{'Found' if dry_run else 'Rewrote'} URLs in `{table_name}`: {counts}")
+            return counts
+        except SQLAlchemyError as e:
+            LOGGER.error(f"SQLAlchemyError while rewriting URLs in table `{table_name}`: {e}")
+
+    def insert_arrow_batches(
+        self,
+        batches: Iterable[pa.RecordBatch],
+        table_name: str,
+        replace=False,
+        chunk_size=5000,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Stream Arrow record batches into SQL table via bulk inserts.
+
+        Batches are consumed lazily, so only one batch is held in memory at a time. When `replace` is set,
+        existing rows are deleted in the same transaction as the insert so readers never see an empty table; an
+        empty result still clears the table.
+
+        :param Iterable[pa.RecordBatch] batches: Arrow record batches to insert.
+        :param str table_name: Name of database table to insert into.
+        :param bool replace: Flag to replace existing rows.
+        :param int chunk_size: Maximum number of rows per bulk `INSERT`.
+
+        :returns: Optional[Dict[str, Any]]
+        """
+        metrics = {"table": table_name, "rows": 0, "batches": []}
+        try:
+            with self.db.begin() as conn:
+                table = None
+                fetch_start = perf_counter()
+                for batch_number, batch in enumerate(batches):
+                    load_start = perf_counter()
+                    if table is None:
+                        table = self._arrow_table(conn, table_name, batch.schema, replace)
+                    for offset in range(0, batch.num_rows, chunk_size):
+                        conn.execute(table.insert(), batch.slice(offset, chunk_size).to_pylist())
+                    load_end = perf_counter()
+                    batch_metrics = {
+                        "batch": batch_number,
+                        "rows": batch.num_rows,
+                        "fetch_ms": round((load_start - fetch_start) * 1000, 2),
+                        "load_ms": round((load_end - load_start) * 1000, 2),
+                    }
+                    metrics["rows"] += batch.num_rows
+                    metrics["batches"].append(batch_metrics)
+                    LOGGER.info(
+                        f"Loaded batch {batch_number} of {batch.num_rows} rows into `{table_name}` "
+                        f"(fetch {batch_metrics['fetch_ms']}ms, load {batch_metrics['load_ms']}ms)."
+                    )
+                    fetch_start = perf_counter()
+                if table is None and replace and inspect(conn).has_table(table_name):
+                    conn.execute(Table(table_name, MetaData(), autoload_with=conn).delete())
+            LOGGER.success(f"Loaded {metrics['rows']} rows into `{table_name}` in {len(metrics['batches'])} batches.")
+            return metrics
+        except SQLAlchemyError as e:
+            LOGGER.error(f"SQLAlchemyError while loading Arrow batches into table `{table_name}`: {e}")
+        except Exception as e:
+            LOGGER.error(f"Unexpected error while loading Arrow batches into table `{table_name}`: {e}")
+
+    def insert_dataframe(self, df: "DataFrame", table_name: str, action="append") -> "DataFrame":
         """
         Insert Pandas DataFrame into SQL table.
 
@@ -0,0 +1,125 @@
+"""Test bulk loading Arrow record batches into SQL tables."""
+
+import pyarrow as pa
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table
+from sqlalchemy.dialects import mysql
+
+from database.sql_db import Database, check_dialect, insert_ignore_statement
+
+
+def test_insert_arrow_batches():
+    """Stream multiple Arrow batches into a new table, replace its rows on a second load & clear it on an empty one."""
+    db = Database(uri="sqlite://", db_name="", args={})
+    batches = [
+        pa.RecordBatch.from_pydict({"slug": ["flask-routes", "pandas-history"], "views": [20, 10]}),
+        pa.RecordBatch.from_pydict({"slug": ["welcome"], "views": [5]}),
+    ]
+    metrics = db.insert_arrow_batches(iter(batches), "weekly_stats", replace=True, chunk_size=1)
+    assert metrics["rows"] == 3
+    assert len(metrics["batches"]) == 2
+    assert metrics["batches"][0]["rows"] == 2
+
+    replacement = [pa.RecordBatch.from_pydict({"slug": ["flask-routes"], "views": [30]})]
+    metrics = db.insert_arrow_batches(iter(replacement), "weekly_stats", replace=True)
+    with db.db.connect() as conn:
+        rows = conn.exec_driver_sql("SELECT slug, views FROM weekly_stats").all()
+    assert metrics["rows"] == 1
+    assert rows == [("flask-routes", 30)]
+
+    metrics = db.insert_arrow_batches(iter([]), "weekly_stats", replace=True)
+    with db.db.connect() as conn:
+        rows = conn.exec_driver_sql("SELECT slug, views FROM weekly_stats").all()
+    assert metrics["rows"] == 0
+    assert rows == []
+
+
+def test_unsupported_dialect():
+    """Dialects without conflict-aware inserts are rejected up-front rather than when a statement is built."""
+    assert check_dialect("sqlite") == "sqlite"
+    with pytest.raises(ValueError, match="Unsupported SQL dialect `mssql`"):
+        check_dialect("mssql")
+
+
+def test_insert_ignore_statement_mysql():
+    """MySQL skips duplicate keys without `INSERT IGNORE`, so errors other than key conflicts still raise."""
+    table = Table("donation", MetaData(), Column("id", Integer, primary_key=True), Column("coffee_id", Integer))
+    sql = str(insert_ignore_statement(table, "mysql", ["coffee_id"]).compile(dialect=mysql.dialect()))
+    assert "IGNORE" not in sql
+    assert sql.endswith("ON DUPLICATE KEY UPDATE coffee_id = donation.coffee_id")
+
+
+def test_upsert_records():
+    """Upsert rows keyed on a composite primary key, updating existing rows in place."""
+    db = Database(uri="sqlite://", db_name="", args={})
+    table = Table(
+        "algolia_searches",
+        MetaData(),
+        Column("period", String(16), primary_key=True),
+        Column("search", String(255), primary_key=True),
+        Column("count", Integer),
+    )
+    table.create(db.db)
+    db.upsert_records(
+        [{"period": "week", "search": "flask", "count": 3}, {"period": "week", "search": "pandas", "count": 2}],
+        table,
+        key_columns=["period", "search"],
+        update_columns=["count"],
+    )
+    saved = db.upsert_records(
+        [{"period": "week", "search": "flask", "count": 5}, {"period": "month", "search": "flask", "count": 9}],
+        table,
+        key_columns=["period", "search"],
+        update_columns=["count"],
+    )
+    with db.db.connect() as conn:
+        rows = conn.execute(table.select().order_by(table.c.period, table.c.search)).all()
+    assert saved == 2
+    assert rows == [("month", "flask", 9), ("week", "flask", 5), ("week", "pandas", 2)]
+
+
+def test_page_query():
+    """Page through rows by key, writing to the table between pages without a cursor held open."""
+    db = Database(uri="sqlite://", db_name="", args={})
+    with db.db.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE posts (id TEXT PRIMARY KEY, status TEXT)")
+        conn.exec_driver_sql(
+            "INSERT INTO posts VALUES ('a1', 'published'), ('b2', 'draft'), ('c3', 'published'), "
+            "('d4', 'published'), ('e5', 'published')"
+        )
+    query = "SELECT id FROM posts WHERE status = :status AND id > :last_id ORDER BY id LIMIT :limit"
+    pages = []
+    for rows in db.page_query(query, batch_size=2, params={"status": "published"}):
+        pages.append([row["id"] for row in rows])
+        db.execute_batch("UPDATE posts SET status = 'updated' WHERE id = :id", rows)
+    assert pages == [["a1", "c3"], ["d4", "e5"]]
+
+
+def test_rewrite_urls():
+    """Rewrite several URL prefixes across columns in one pass, counting changed rows per column."""
+    db = Database(uri="sqlite://", db_name="", args={})
+    with db.db.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE tags (id INTEGER PRIMARY KEY, feature_image TEXT, og_image TEXT)")
+        conn.exec_driver_sql(
+            "INSERT INTO tags VALUES "
+            "(1, 'https://old-cdn.example.com/a.png', 'https://storage.example.com/old_cdn/b.png'), "
+            "(2, 'https://cdn.example.com/c.png', NULL), "
+            "(3, NULL, 'https://storage.example.com/oldXcdn/d.png')"
+        )
+    rewrites = {
+        "https://old-cdn.example.com/": "https://cdn.example.com/",
+        "https://storage.example.com/old_cdn/": "https://cdn.example.com/",
+    }
+    assert db.rewrite_urls("tags", ["feature_image", "og_image"], rewrites, dry_run=True) == {
+        "feature_image": 1,
+        "og_image": 1,
+    }
+    assert db.rewrite_urls("tags", ["feature_image", "og_image"], rewrites) == {"feature_image": 1, "og_image": 1}
+    with db.db.connect() as conn:
+        rows = conn.exec_driver_sql("SELECT feature_image, og_image FROM tags ORDER BY id").all()
+    assert rows == [
+        ("https://cdn.example.com/a.png", "https://cdn.example.com/b.png"),
+        ("https://cdn.example.com/c.png", None),
+        (None, "https://storage.example.com/oldXcdn/d.png"),
+    ]
+    assert db.rewrite_urls("tags", ["feature_image", "og_image"], rewrites) == {"feature_image": 0, "og_image": 0}
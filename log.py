@@ -1,14 +1,116 @@
 """Custom logger."""
 
-import json
 from os import path
+from random import random
 from sys import stdout
+from typing import Dict, Tuple
 
+import orjson
 from loguru import logger
 
 from config import settings
 
 
+def dumps(log: dict) -> str:
+    """
+    Serialize log record with `orjson`.
+
+    :param dict log: Subset of log record to serialize.
+
+    :returns: str
+    """
+    return orjson.dumps(log, default=str).decode()
+
+
+_timestamp_cache = [(None, "")]
+
+
+def format_timestamp(time) -> str:
+    """
+    Format record timestamp, reusing the previous result for records logged within the same second.
+
+    :param datetime time: Time of log record.
+
+    :returns: str
+    """
+    second = int(time.timestamp())
+    cached_second, formatted = _timestamp_cache[0]
+    if cached_second != second:
+        formatted = time.strftime("%m/%d/%Y, %H:%M:%S")
+        _timestamp_cache[0] = (second, formatted)
+    return formatted
+
+
+class LogFilter:
+    """Per-module level overrides & sampling, applied to every sink."""
+
+    def __init__(self, level: str, overrides: Dict[str, str], sample_rates: Dict[str, float]):
+        """
+        Log filter constructor.
+
+        :param str level: Minimum level of records logged by modules without an override.
+        :param Dict[str, str] overrides: Minimum level per module prefix (ie: `{"app.analytics": "WARNING"}`).
+        :param Dict[str, float] sample_rates: Fraction of records below WARNING kept per module prefix.
+        """
+        self.level_no = logger.level(level).no
+        self.overrides = {module: logger.level(override).no for module, override in overrides.items()}
+        self.sample_rates = sample_rates
+        self.warning_no = logger.level("WARNING").no
+        self._resolved: Dict[str, Tuple[int, float]] = {}
+
+    @property
+    def min_level_no(self) -> int:
+        """Lowest level any module may log at; records below this are skipped before being formatted."""
+        return min([self.level_no, *self.overrides.values()])
+
+    @staticmethod
+    def _match(module: str, prefixes) -> str:
+        """
+        Find the most specific prefix matching a module name.
+
+        :param str module: Dotted name of module which emitted the record.
+        :param prefixes: Candidate module prefixes.
+
+        :returns: str
+        """
+        matches = [prefix for prefix in prefixes if module == prefix or module.startswith(f"{prefix}.")]
+        return max(matches, key=len, default=None)
+
+    def _resolve(self, module: str) -> Tuple[int, float]:
+        """
+        Resolve & cache minimum level and sample rate for a module.
+
+        :param str module: Dotted name of module which emitted the record.
+
+        :returns: Tuple[int, float]
+        """
+        level_prefix = self._match(module, self.overrides)
+        rate_prefix = self._match(module, self.sample_rates)
+        resolved = (
+            self.overrides[level_prefix] if level_prefix is not None else self.level_no,
+            float(self.sample_rates[rate_prefix]) if rate_prefix is not None else 1.0,
+        )
+        self._resolved[module] = resolved
+        return resolved
+
+    def __call__(self, record: dict) -> bool:
+        """
+        Decide whether a record is emitted.
+
+        :param dict record: Log record with metadata.
+
+        :returns: bool
+        """
+        module = record["name"] or ""
+        level_no, sample_rate = self._resolved.get(module) or self._resolve(module)
+        record_level_no = record["level"].no
+        if record_level_no < level_no:
+            return False
+        if sample_rate < 1 and record_level_no < self.warning_no:
+            return random() < sample_rate
+        return True
+
+
 def json_formatter(record: dict) -> str:
     """
     Pass raw log to be serialized.
@@ -27,7 +129,7 @@ def json_formatter(record: dict) -> str:
         :returns: str
         """
         subset = {
-            "time": log["time"].strftime("%m/%d/%Y, %H:%M:%S"),
+            "time": format_timestamp(log["time"]),
             "message": log["message"],
             "level": log["level"].name,
             "function": log.get("function"),
@@ -35,7 +137,7 @@ def json_formatter(record: dict) -> str:
         }
         if log.get("exception", None):
             subset.update({"exception": log["exception"]})
-        return json.dumps(subset)
+        return dumps(subset)
 
     record["extra"]["serialized"] = serialize(record)
     return "{extra[serialized]},\n"
@@ -68,15 +170,21 @@ def create_logger() -> logger:
     """
     Configure custom logger.
 
+    Sinks are queue-backed (`enqueue=True`) so writes happen on a dedicated thread rather than in request handlers.
+
     :returns: logger
     """
     logger.remove()
+    log_filter = LogFilter(settings.LOG_LEVEL, settings.LOG_LEVEL_OVERRIDES, settings.LOG_SAMPLE_RATES)
+    level = log_filter.min_level_no
     logger.add(
         stdout,
         colorize=True,
         catch=True,
-        level="TRACE",
+        level=level,
+        filter=log_filter,
         format=log_formatter,
+        enqueue=True,
     )
     if settings.ENVIRONMENT == "production" and path.isdir("/var/log/api"):
         # Datadog JSON logs
@@ -84,18 +192,22 @@ def create_logger() -> logger:
             "/var/log/api/info.json",
             format=json_formatter,
             rotation="200 MB",
-            level="TRACE",
+            level=level,
+            filter=log_filter,
             compression="zip",
+            enqueue=True,
         )
         # Readable logs
         logger.add(
             "/var/log/api/info.log",
             colorize=True,
             catch=True,
-            level="TRACE",
+            level=level,
+            filter=log_filter,
             format=log_formatter,
             rotation="200 MB",
             compression="zip",
+            enqueue=True,
         )
     else:
         logger.add(
@@ -106,6 +218,7 @@ def create_logger() -> logger:
             rotation="200 MB",
             compression="zip",
             level="ERROR",
+            enqueue=True,
         )
     return logger
 
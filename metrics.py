@@ -0,0 +1,177 @@
+"""Prometheus metrics for API routes & outbound calls to third-party services.
+
+When `PROMETHEUS_MULTIPROC_DIR` is set (ie: by `make run`), every worker process writes samples to its own files in
+that directory & `/metrics/` sums them across workers, so scrapes see totals for the whole service rather than
+whichever worker answered. The directory must be emptied before the server starts.
+"""
+
+from os import environ
+from time import perf_counter
+from typing import Optional
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from requests import Session
+from requests.adapters import HTTPAdapter
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import settings
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latency of API requests by route template.",
+    ("method", "route", "status"),
+    buckets=settings.METRICS_LATENCY_BUCKETS,
+)
+OUTBOUND_REQUESTS = Counter(
+    "outbound_requests_total",
+    "Calls made to third-party services, by response status (`error` when no response was received).",
+    ("service", "status"),
+)
+OUTBOUND_REQUEST_DURATION = Histogram(
+    "outbound_request_duration_seconds",
+    "Latency of calls made to third-party services.",
+    ("service",),
+    buckets=settings.METRICS_LATENCY_BUCKETS,
+)
+OUTBOUND_BYTES = Counter(
+    "outbound_bytes_total",
+    "Bytes sent to & received from third-party services.",
+    ("service", "direction"),
+)
+OUTBOUND_MESSAGES = Counter(
+    "outbound_messages_total",
+    "Messages buffered for third-party services, by outcome (`queued`, `sent` or `failed`).",
+    ("service", "status"),
+)
+
+
+def render_metrics() -> bytes:
+    """
+    Render metrics in Prometheus text exposition format, summed across worker processes in multiprocess mode.
+
+    :returns: bytes
+    """
+    multiproc_dir = environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not multiproc_dir:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=multiproc_dir)
+    return generate_latest(registry)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by method, route template & response status."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], route_path, status).observe(perf_counter() - start)
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """`requests` transport adapter recording call counts, latency, status codes & bytes for a service."""
+
+    def __init__(self, service: str, **kwargs):
+        """
+        Instrumented adapter constructor.
+
+        :param str service: Name of third-party service (ie: `ghost`).
+        """
+        super().__init__(**kwargs)
+        self.service = service
+        self.duration = OUTBOUND_REQUEST_DURATION.labels(service)
+        self.bytes_sent = OUTBOUND_BYTES.labels(service, "sent")
+        self.bytes_received = OUTBOUND_BYTES.labels(service, "received")
+
+    def send(self, request, stream=False, **kwargs):
+        start = perf_counter()
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+            if not stream:
+                received = len(response.content)
+            else:
+                received = int(response.headers.get("Content-Length") or 0)
+        except Exception:
+            self.duration.observe(perf_counter() - start)
+            OUTBOUND_REQUESTS.labels(self.service, "error").inc()
+            raise
+        self.duration.observe(perf_counter() - start)
+        OUTBOUND_REQUESTS.labels(self.service, response.status_code).inc()
+        if request.body:
+            self.bytes_sent.inc(len(request.body))
+        self.bytes_received.inc(received)
+        return response
+
+
+def instrument_session(service: str, session: Optional[Session] = None, **adapter_kwargs) -> Session:
+    """
+    Mount an instrumented adapter on a `requests` session.
+
+    :param str service: Name of third-party service (ie: `ghost`).
+    :param Optional[Session] session: Existing session to instrument (ie: a Google `AuthorizedSession`).
+
+    :returns: Session
+    """
+    session = session or Session()
+    adapter = InstrumentedAdapter(service, **adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """
+    Record query counts & latency for a SQLAlchemy engine, labelled by dialect (ie: `mysql`).
+
+    :param Engine engine: Engine to instrument.
+
+    :returns: Engine
+    """
+    service = engine.dialect.name
+    duration = OUTBOUND_REQUEST_DURATION.labels(service)
+    succeeded = OUTBOUND_REQUESTS.labels(service, "ok")
+    failed = OUTBOUND_REQUESTS.labels(service, "error")
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration.observe(perf_counter() - conn.info["query_start"].pop())
+        succeeded.inc()
+
+    def handle_error(exception_context):
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            duration.observe(perf_counter() - starts.pop())
+        failed.inc()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+    return engine
@@ -1,9 +1,11 @@
 """Integration tests for API client."""
 
 import pprint
+from time import monotonic, sleep
 
 from fastapi.testclient import TestClient
 from github import Github
+from httpx import Response
 
 from app import create_app
 from config import settings
@@ -14,6 +16,27 @@ client = TestClient(create_app())
 pp = pprint.PrettyPrinter(indent=4)
 
 
+def wait_for_job(response: Response, timeout: float = 600) -> dict:
+    """
+    Poll background job queued by a request until it finishes.
+
+    :param Response response: Response of request which queued the job.
+    :param float timeout: Seconds to wait for the job to finish.
+
+    :returns: dict
+    """
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert job_id
+    deadline = monotonic() + timeout
+    while monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}/").json()
+        if job["status"] not in ("queued", "running"):
+            return job
+        sleep(1)
+    raise TimeoutError(f"Job `{job_id}` did not finish within {timeout} seconds.")
+
+
 def test_api_docs():
     """API docs health check."""
     response = client.get("/")
@@ -70,9 +93,10 @@ def test_github_issue(github_issue_user: dict, gh: Github):
 
 def test_batch_update_metadata():
     """Test updating metadata for all posts."""
-    response = client.get("/posts/")
-    assert response.status_code == 200
-    # TODO: Add `update` assertions, or remove this test.
+    job = wait_for_job(client.get("/posts/"))
+    assert job["name"] == "posts.metadata"
+    assert job["status"] == "succeeded"
+    assert type(job["result"]) == dict
 
 
 def assign_img_alt_attr():
@@ -83,9 +107,10 @@ def assign_img_alt_attr():
 
 def test_import_site_analytics():
     """Fetch site analytics."""
-    response = client.get("/analytics/")
-    assert response.status_code == 200
-    assert type(response.json()) == dict
+    job = wait_for_job(client.get("/analytics/"))
+    assert job["name"] == "analytics.migrate"
+    assert job["status"] == "succeeded"
+    assert type(job["result"]) == dict
 
 
 """def test_new_ghost_member():
@@ -112,5 +137,6 @@ def test_accept_donation(donation: NewDonation):
 
 def test_authors_bulk_update_metadata():
     """Fetch all author info."""
-    response = client.get("/authors/")
-    assert response.status_code >= 200
+    job = wait_for_job(client.get("/authors/"))
+    assert job["name"] == "authors.metadata"
+    assert job["status"] == "succeeded"
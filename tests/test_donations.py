@@ -0,0 +1,122 @@
+"""Test paginating & aggregating the donation ledger."""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.donations import router
+from config import settings
+from database import Base, get_db
+from database.crud import invalidate_donation_aggregates, upsert_donation
+from database.models import Donation
+from database.schemas import CoffeeDonation
+
+
+@pytest.fixture
+def donation_db(tmp_path):
+    """
+    Donation ledger backed by a temporary SQLite database.
+
+    :returns: sessionmaker
+    """
+    engine = create_engine(f"sqlite:///{tmp_path}/features.db")
+    Base.metadata.create_all(bind=engine, tables=[Donation.__table__])
+    invalidate_donation_aggregates()
+    yield sessionmaker(bind=engine)
+    invalidate_donation_aggregates()
+
+
+def donation_client(donation_db) -> TestClient:
+    """
+    Serve donation routes backed by the temporary ledger.
+
+    :param sessionmaker donation_db: Sessions of the temporary ledger.
+
+    :returns: TestClient
+    """
+    app = FastAPI()
+    app.include_router(router)
+
+    def get_test_db():
+        with donation_db() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_test_db
+    return TestClient(app)
+
+
+def test_donation_pages_and_aggregates(donation_db):
+    """Pages follow `created_at` & `id` order; aggregates are cached until a donation is saved."""
+    with donation_db() as db:
+        db.add_all(
+            [
+                Donation(coffee_id=1, email="a@example.com", name="A", count=1, created_at=datetime(2021, 1, 5)),
+                Donation(coffee_id=2, email="b@example.com", name="B", count=5, created_at=datetime(2021, 1, 5)),
+                Donation(coffee_id=3, email="a@example.com", name="A", count=2, created_at=datetime(2021, 2, 1)),
+            ]
+        )
+        db.commit()
+    client = donation_client(donation_db)
+
+    first = client.get("/donation/", params={"limit": 2}).json()
+    assert [donation["coffee_id"] for donation in first["donations"]] == [1, 2]
+    second = client.get("/donation/", params={"limit": 2, "after": first["next_cursor"]}).json()
+    assert [donation["coffee_id"] for donation in second["donations"]] == [3]
+    assert second["next_cursor"] is None
+    assert client.get("/donation/", params={"after": "yesterday"}).status_code == 422
+
+    totals = client.get("/donation/totals/").json()
+    assert (totals["donations"], totals["coffees"], totals["supporters"]) == (3, 8, 2)
+    assert client.get("/donation/months/").json() == [
+        {"year": 2021, "month": 1, "donations": 2, "coffees": 6},
+        {"year": 2021, "month": 2, "donations": 1, "coffees": 2},
+    ]
+    supporters = client.get("/donation/supporters/", params={"limit": 1}).json()
+    assert supporters == [{"email": "b@example.com", "name": "B", "donations": 1, "coffees": 5}]
+
+    with donation_db() as db:
+        db.add(Donation(coffee_id=4, email="c@example.com", count=1, created_at=datetime(2021, 3, 1)))
+        db.commit()
+    assert client.get("/donation/totals/").json()["donations"] == 3
+    with donation_db() as db:
+        upsert_donation(db, CoffeeDonation(coffee_id=5, email="c@example.com", name="C", count=3, link="https://c"))
+    assert client.get("/donation/totals/").json()["donations"] == 5
+
+
+def test_upsert_donation_reports_created_once(donation_db):
+    """A donation saved twice is created by the first `INSERT` only, without reading existing donations first."""
+    donation = CoffeeDonation(coffee_id=7, email="d@example.com", name="D", count=1, link="https://c/7")
+    with donation_db() as db:
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+        assert upsert_donation(db, donation) is True
+        assert upsert_donation(db, donation) is False
+    assert len(statements) == 2 and all(statement.startswith("INSERT") for statement in statements)
+    with donation_db() as db:
+        assert db.query(Donation).filter(Donation.coffee_id == 7).count() == 1
+
+
+def test_accept_import_and_delete_donations(donation_db, monkeypatch):
+    """Retried & re-imported donations are skipped; deleting removes the donation by ID."""
+    monkeypatch.setattr(settings, "DONATIONS_IMPORT_CHUNK_SIZE", 4)
+    client = donation_client(donation_db)
+    donation = {"coffee_id": 10, "email": "a@example.com", "name": "A", "count": 2, "link": "https://c/10"}
+    assert client.post("/donation/", json=donation).json()["created"] is True
+    assert client.post("/donation/", json=donation).json()["created"] is False
+    assert client.post("/donation/", json={"email": "a@example.com"}).status_code == 422
+
+    history = [
+        {"coffee_id": i, "email": f"{i}@example.com", "count": 1, "created_at": f"2020-0{i % 9 + 1}-01T00:00:00"}
+        for i in range(1, 12)
+    ]
+    imported = client.post("/donation/import/", json=history).json()
+    assert imported == {"received": 11, "created": 10, "skipped": 1}
+    assert client.get("/donation/totals/").json()["donations"] == 11
+
+    assert client.request("DELETE", "/donation/", json=donation).status_code == 200
+    assert client.request("DELETE", "/donation/", json=donation).status_code == 404
+    assert client.get("/donation/totals/").json()["donations"] == 10
@@ -0,0 +1,93 @@
+"""Test filtering & verifying Github webhooks before decoding them."""
+
+import hashlib
+import hmac
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.github import router
+from clients import get_sms_queue
+from config import settings
+
+
+class RecordingQueue:
+    """SMS queue recording enqueued messages."""
+
+    def __init__(self):
+        self.messages = []
+
+    def enqueue(self, message: str):
+        self.messages.append(message)
+
+
+def github_client(queue: RecordingQueue) -> TestClient:
+    """
+    Serve Github webhooks with SMS messages recorded by `queue`.
+
+    :param RecordingQueue queue: Records enqueued SMS messages.
+
+    :returns: TestClient
+    """
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_sms_queue] = lambda: queue
+    return TestClient(app)
+
+
+def pr_event(sender: str) -> bytes:
+    """
+    Github `pull_request` webhook with fields the endpoint doesn't read.
+
+    :param str sender: Github username which opened the PR.
+
+    :returns: bytes
+    """
+    return json.dumps(
+        {
+            "action": "opened",
+            "sender": {"login": sender, "id": 1, "site_admin": False},
+            "pull_request": {
+                "number": 7,
+                "title": "Update dependency fastapi",
+                "body": None,
+                "url": "https://api.github.com/repos/user/repo/pulls/7",
+                "head": {"sha": "0" * 40, "repo": {"full_name": "user/repo"}},
+            },
+            "repository": {"name": "repo", "full_name": "user/repo", "topics": ["python"]},
+        }
+    ).encode()
+
+
+def test_github_pr_filters_events_and_senders(monkeypatch):
+    """Other event types are ignored without reading the body; bot senders skip SMS notifications."""
+    monkeypatch.setattr(settings, "GH_WEBHOOK_SECRET", "")
+    queue = RecordingQueue()
+    client = github_client(queue)
+    ping = client.post("/github/pr/", content=b"{not json", headers={"X-GitHub-Event": "ping"})
+    assert ping.status_code == 200
+    assert ping.json()["pr"]["status"] == "ignored"
+    bot = client.post("/github/pr/", content=pr_event("renovate[bot]"), headers={"X-GitHub-Event": "pull_request"})
+    assert bot.json()["pr"]["status"] == "ignored"
+    assert bot.json()["pr"]["id"] == 7
+    assert bot.json()["pr"]["trigger"]["repo"] == "user/repo"
+    contributor = client.post("/github/pr/", content=pr_event("contributor"))
+    assert contributor.json()["pr"]["status"] == "queued"
+    assert len(queue.messages) == 1
+    malformed = client.post("/github/pr/", content=b'{"sender": {}}', headers={"X-GitHub-Event": "pull_request"})
+    assert malformed.status_code == 422
+
+
+def test_github_pr_verifies_signature(monkeypatch):
+    """Requests are rejected unless signed with `GH_WEBHOOK_SECRET`."""
+    monkeypatch.setattr(settings, "GH_WEBHOOK_SECRET", "secret")
+    queue = RecordingQueue()
+    client = github_client(queue)
+    body = pr_event("contributor")
+    signature = f"sha256={hmac.new(b'secret', body, hashlib.sha256).hexdigest()}"
+    forged = client.post("/github/pr/", content=body, headers={"X-Hub-Signature-256": "sha256=0"})
+    assert forged.status_code == 401
+    signed = client.post("/github/pr/", content=body, headers={"X-Hub-Signature-256": signature})
+    assert signed.status_code == 200
+    assert len(queue.messages) == 1
@@ -0,0 +1,35 @@
+"""Test per-module log levels & sampling."""
+
+from types import SimpleNamespace
+
+from log import LogFilter, logger
+
+
+def record(module: str, level: str) -> dict:
+    """
+    Build minimal log record.
+
+    :param str module: Dotted name of module which emitted the record.
+    :param str level: Name of log level.
+
+    :returns: dict
+    """
+    return {"name": module, "level": SimpleNamespace(no=logger.level(level).no)}
+
+
+def test_level_overrides_match_most_specific_module():
+    """Overrides apply to a module & its submodules, with the longest prefix winning."""
+    log_filter = LogFilter("INFO", {"app": "WARNING", "app.posts": "DEBUG"}, {})
+    assert log_filter(record("app.analytics", "INFO")) is False
+    assert log_filter(record("app.posts.update", "DEBUG")) is True
+    assert log_filter(record("app_other", "INFO")) is True
+    assert log_filter(record("clients.ghost", "DEBUG")) is False
+    assert log_filter.min_level_no == logger.level("DEBUG").no
+
+
+def test_sampling_never_drops_warnings():
+    """Sampled modules drop informational records but always keep warnings & errors."""
+    log_filter = LogFilter("TRACE", {}, {"app.analytics": 0})
+    assert log_filter(record("app.analytics.plausible", "INFO")) is False
+    assert log_filter(record("app.analytics.plausible", "ERROR")) is True
+    assert log_filter(record("app.posts", "INFO")) is True
@@ -0,0 +1,53 @@
+"""Test Prometheus metrics for API routes & outbound calls."""
+
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.fakes import LocalServer, create_fake_ghost
+from config import settings
+from metrics import MetricsMiddleware, instrument_session, render_metrics
+
+
+def test_middleware_labels_route_template():
+    """Requests are labelled by route template rather than raw path, so label cardinality stays bounded."""
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+    rendered = render_metrics().decode()
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"} 2.0' in rendered
+    assert 'http_request_duration_seconds_count{method="GET",route="unmatched",status="404"} 1.0' in rendered
+
+
+def test_instrumented_session_records_outbound_calls():
+    """Outbound calls are counted by service & status code, with bytes received."""
+    with LocalServer(create_fake_ghost(posts=1, content_api_key="test")) as server:
+        session = instrument_session("test-ghost")
+        session.get(f"{server.url}/ghost/api/content/posts/", params={"key": "test"}, timeout=5)
+        session.get(f"{server.url}/ghost/api/content/posts/", timeout=5)
+    rendered = render_metrics().decode()
+    assert 'outbound_requests_total{service="test-ghost",status="200"} 1.0' in rendered
+    assert 'outbound_request_duration_seconds_count{service="test-ghost"} 2.0' in rendered
+    assert 'outbound_bytes_total{direction="received",service="test-ghost"}' in rendered
+
+
+def test_metrics_are_summed_across_workers(tmp_path, monkeypatch):
+    """In multiprocess mode, samples recorded by each worker process are summed into a single total."""
+    worker = "from metrics import OUTBOUND_REQUESTS; OUTBOUND_REQUESTS.labels('test-workers', 200).inc()"
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], check=True, cwd=settings.BASE_DIR, env=env)
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    rendered = render_metrics().decode()
+    assert 'outbound_requests_total{service="test-workers",status="200"} 2.0' in rendered
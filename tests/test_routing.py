@@ -0,0 +1,46 @@
+"""Test parsing webhook payloads into lean schemas."""
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.routing import WebhookRoute
+from database.schemas import LeanPostAuthorsUpdate
+
+
+def test_webhook_route_validates_lean_payload():
+    """Only fields handlers read are parsed; the rest of Ghost's payload is ignored, & invalid bodies return a 422."""
+    router = APIRouter(route_class=WebhookRoute)
+
+    @router.post("/posts/")
+    async def update_post(post_update: LeanPostAuthorsUpdate):
+        post = post_update.post.current
+        return {"slug": post.slug, "author": post.primary_author.name, "fields": sorted(post.model_dump())}
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    payload = {
+        "post": {
+            "current": {
+                "id": "1",
+                "slug": "welcome",
+                "plaintext": "Hello “world”",
+                "primary_author": {"id": "1", "name": "Todd", "roles": [{"unexpected": "shape"}]},
+                "tags": [{"slug": "python", "created_at": "not a date"}],
+            },
+            "previous": {"updated_at": "2021-09-02T04:14:50.000Z"},
+        }
+    }
+    response = client.post("/posts/", json=payload)
+    assert response.status_code == 200
+    assert response.json() == {
+        "slug": "welcome",
+        "author": "Todd",
+        "fields": ["authors", "feature_image", "id", "primary_author", "slug", "title"],
+    }
+    invalid = client.post("/posts/", json={"post": {"current": {"authors": "Todd"}}})
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["loc"] == ["body", "post", "current", "authors"]
+    malformed = client.post("/posts/", content=b'{"post": ', headers={"Content-Type": "application/json"})
+    assert malformed.status_code == 422
+    assert malformed.json()["detail"][0]["type"] == "json_invalid"